@@ -21,6 +21,7 @@ class AutocompleteForm(forms.Form):
 class SearchForm(forms.Form):
     q = forms.CharField(strip=True)
     correct = forms.BooleanField(required=False, initial=True)
+    page = forms.CharField(required=False)
 
     def clean_q(self):
         return make_safe(self.cleaned_data["q"])
@@ -31,3 +32,9 @@ class SearchForm(forms.Form):
         if self.data["correct"] == "0":
             self.cleaned_data["correct"] = False
         return self.cleaned_data["correct"]
+
+    def clean_page(self):
+        try:
+            return max(int(self.cleaned_data["page"]), 1)
+        except ValueError:
+            return 1
@@ -1,5 +1,6 @@
 # flake8: noqa F401
 from ask_cfpb.models.answer_page import AnswerPage
+from ask_cfpb.models.autocomplete import AutocompleteIndex
 from ask_cfpb.models.django import (
     ENGLISH_PARENT_SLUG,
     SPANISH_PARENT_SLUG,
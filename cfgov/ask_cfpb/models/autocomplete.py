@@ -0,0 +1,155 @@
+import heapq
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.db import connection
+
+from ask_cfpb.models.answer_page import AnswerPage
+from core import cache as core_cache
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION_KEY = "ask-autocomplete-version"
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def get_words(text):
+    """Split text into lowercase, ASCII-folded words
+
+    This mirrors the analysis that the autocomplete field's ngram_tokenizer
+    applies before it builds its edge ngrams.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return WORD_RE.findall(text)
+
+
+def get_cache_version():
+    return core_cache.get_cache_version(CACHE_VERSION_KEY)
+
+
+class AutocompleteIndex:
+    """In-process index of Ask CFPB questions by word prefix
+
+    Every prefix of every word in the live answer questions, from min_chars
+    up to max_chars long, is mapped to the top max_results questions that
+    contain it. Single-word autocomplete terms of up to max_chars can be
+    answered from this without querying OpenSearch; lookup() returns None
+    for anything else.
+
+    Indexes are built one per language and shared by the process. Publishing
+    or unpublishing an answer page starts a new cache version, and indexes
+    built for an older version are rebuilt in a background thread. Requests
+    keep using the old index until the new one is ready, so no request has
+    to wait for a build.
+    """
+
+    min_chars = 2
+    max_chars = 6
+    max_results = 20
+
+    _indexes = {}
+    _building = set()
+    _lock = threading.Lock()
+
+    def __init__(self, questions, version=None):
+        """Build the index from an iterable of (question, url) pairs"""
+        self.version = version
+        candidates = defaultdict(list)
+
+        for question, url in questions:
+            result = {"question": question, "url": url}
+            prefixes = Counter(
+                word[:length]
+                for word in get_words(question)
+                for length in range(
+                    self.min_chars, min(len(word), self.max_chars) + 1
+                )
+            )
+
+            # Prefer questions with more matching words, then shorter ones,
+            # roughly as OpenSearch's relevance scoring would.
+            for prefix, count in prefixes.items():
+                candidates[prefix].append(
+                    (-count, len(question), question, url, result)
+                )
+
+        self.prefixes = {
+            prefix: [
+                match[-1]
+                for match in heapq.nsmallest(self.max_results, matches)
+            ]
+            for prefix, matches in candidates.items()
+        }
+
+    @classmethod
+    def build(cls, language, version=None):
+        pages = (
+            AnswerPage.objects.live()
+            .filter(language=language, redirect_to_page=None)
+            .exclude(question="")
+            .defer_streamfields()
+        )
+        return cls(((page.question, page.url) for page in pages), version)
+
+    @classmethod
+    def for_language(cls, language):
+        """Return the index for a language, or None if it isn't built yet
+
+        If the index is missing or out of date, a new one is built in the
+        background, and the current one (if any) is returned meanwhile.
+        """
+        version = get_cache_version()
+        index = cls._indexes.get(language)
+        if index is None or index.version != version:
+            cls.rebuild_in_background(language, version)
+        return index
+
+    @classmethod
+    def rebuild_in_background(cls, language, version):
+        with cls._lock:
+            if language in cls._building:
+                return
+            cls._building.add(language)
+
+        def rebuild_in_thread():
+            try:
+                cls.rebuild(language, version)
+            finally:
+                # Don't leave this thread's database connection open.
+                connection.close()
+
+        threading.Thread(target=rebuild_in_thread, daemon=True).start()
+
+    @classmethod
+    def rebuild(cls, language, version):
+        try:
+            cls._indexes[language] = cls.build(language, version)
+        except Exception:
+            logger.exception("Failed to build %s autocomplete index", language)
+        finally:
+            with cls._lock:
+                cls._building.discard(language)
+
+    @classmethod
+    def invalidate(cls):
+        """Have every process rebuild its indexes in the background"""
+        core_cache.invalidate_cache_version(CACHE_VERSION_KEY)
+
+    def lookup(self, term):
+        """Return autocomplete results for a term, if the index covers it"""
+        words = get_words(term)
+
+        # A term without any words of at least min_chars matches nothing.
+        if not any(len(word) >= self.min_chars for word in words):
+            return []
+
+        if len(words) != 1 or len(words[0]) > self.max_chars:
+            return None
+
+        return list(self.prefixes.get(words[0], []))
@@ -1,7 +1,7 @@
 import re
 from collections import OrderedDict
 
-from django.core.paginator import InvalidPage, Paginator
+from django.core.paginator import InvalidPage, Page, Paginator
 from django.db import models
 from django.http import Http404
 from django.template.response import TemplateResponse
@@ -391,6 +391,13 @@ class PortalSearchPage(
 class AnswerResultsPage(CFGOVPage):
     answers = []
 
+    # If set, answers only holds the current page of results, out of this
+    # many in total.
+    answers_count = None
+    answers_page_number = 1
+
+    answers_per_page = 25
+
     edit_handler = TabbedInterface(
         [
             ObjectList(CFGOVPage.content_panels, heading="Content"),
@@ -403,13 +410,22 @@ class AnswerResultsPage(CFGOVPage):
     def get_context(self, request, **kwargs):
         context = super(AnswerResultsPage, self).get_context(request, **kwargs)
         context.update(**kwargs)
-        paginator = Paginator(self.answers, 25)
-        page_number = validate_page_number(request, paginator)
-        results = paginator.page(page_number)
+        if self.answers_count is None:
+            paginator = Paginator(self.answers, self.answers_per_page)
+            page_number = validate_page_number(request, paginator)
+            results = paginator.page(page_number)
+        else:
+            # Paginate a range standing in for all of the answers, so that
+            # the paginator knows the total count without having them all.
+            paginator = Paginator(
+                range(self.answers_count), self.answers_per_page
+            )
+            page_number = self.answers_page_number
+            results = Page(self.answers, page_number, paginator)
         context["current_page"] = page_number
         context["paginator"] = paginator
         context["results"] = results
-        context["results_count"] = len(self.answers)
+        context["results_count"] = paginator.count
         context["breadcrumb_items"] = get_ask_breadcrumbs(
             language=self.language
         )
@@ -1,6 +1,7 @@
 from opensearchpy.exceptions import RequestError
 
 from ask_cfpb.documents import AnswerPageDocument
+from search.elasticsearch_helpers import SearchPaginator
 from search.models import AUTOCOMPLETE_MAX_CHARS
 
 
@@ -29,12 +30,28 @@ def make_safe(term):
 
 
 class AnswerPageSearch:
-    def __init__(self, search_term, language="en", base_query=None):
+    """Search answer pages, optionally one page of results at a time.
+
+    If size is given, search() and suggest() only retrieve the requested
+    page of results, along with the total result count, in a single
+    request. Otherwise every result is retrieved.
+
+    Like SearchPaginator, results beyond the OpenSearch result window are
+    never requested; pages past it are empty.
+    """
+
+    def __init__(
+        self, search_term, language="en", base_query=None, page=1, size=None
+    ):
         self.language = language
         self.search_term = make_safe(search_term).strip()
         self.base_query = base_query
+        self.page = page
+        self.size = size
         self.results = []
+        self.total = 0
         self.suggestion = None
+        self.suggest_response = None
 
     def autocomplete(self):
         try:
@@ -55,6 +72,28 @@ class AnswerPageSearch:
             results = []
         return results
 
+    def fetch(self, search):
+        """Execute a search, setting its results and total result count"""
+        max_result_window = SearchPaginator.max_result_window
+        if self.size is None:
+            self.total = search.count()
+            stop = min(self.total, max_result_window)
+            response = search[0:stop].execute()
+            self.results = response[0:stop]
+        else:
+            start = (self.page - 1) * self.size
+            stop = start + self.size
+            if stop > max_result_window:
+                # Only ask for the total, so that callers can fall back to
+                # a page that can be retrieved.
+                start = stop = 0
+
+            search = search[start:stop]
+            response = search.extra(track_total_hits=True).execute()
+            self.results = response[0 : stop - start]
+            self.total = response.hits.total.value
+        return response
+
     def search(self):
         if not self.base_query:
             search = AnswerPageDocument.search().filter(
@@ -66,22 +105,32 @@ class AnswerPageSearch:
             search = search.query(
                 "match", text={"query": self.search_term, "operator": "AND"}
             )
-        total_results = search.count()
-        search = search[0:total_results]
-        self.results = search.execute()[0:total_results]
+            # Ask for a spelling suggestion along with the results, so that
+            # suggest() doesn't need to request one if nothing matches.
+            search = search.suggest(
+                "suggestion", self.search_term, term={"field": "text"}
+            )
+        response = self.fetch(search)
+        if self.search_term != "":
+            self.suggest_response = response
         return {
             "search_term": self.search_term,
             "suggestion": self.suggestion,
             "results": self.results,
+            "total": self.total,
         }
 
     def suggest(self):
-        s = (
-            AnswerPageDocument.search()
-            .filter("term", language=self.language)
-            .suggest("suggestion", self.search_term, term={"field": "text"})
-        )
-        response = s.execute()
+        response = self.suggest_response
+        if response is None:
+            s = (
+                AnswerPageDocument.search()
+                .filter("term", language=self.language)
+                .suggest(
+                    "suggestion", self.search_term, term={"field": "text"}
+                )
+            )
+            response = s.execute()
         try:
             self.suggestion = response.suggest.suggestion[0].options[0].text
         except IndexError:
@@ -90,17 +139,17 @@ class AnswerPageSearch:
                 "search_term": self.search_term,
                 "suggestion": None,
                 "results": self.results,
+                "total": self.total,
             }
 
         search = self.base_query or AnswerPageDocument.search()
         suggest_results = search.query("match", text=self.suggestion).filter(
             "term", language=self.language
         )
-        total = suggest_results.count()
-        suggest_results = suggest_results[0:total]
-        self.results = suggest_results.execute()[0:total]
+        self.fetch(suggest_results)
         return {
             "search_term": self.suggestion,
             "suggestion": self.search_term,
             "results": self.results,
+            "total": self.total,
         }
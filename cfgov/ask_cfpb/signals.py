@@ -0,0 +1,12 @@
+from wagtail.core.signals import page_published, page_unpublished
+
+from ask_cfpb.models import AnswerPage, AutocompleteIndex
+
+
+def invalidate_autocomplete_index(sender, **kwargs):
+    AutocompleteIndex.invalidate()
+
+
+def register_signal_handlers():
+    page_published.connect(invalidate_autocomplete_index, sender=AnswerPage)
+    page_unpublished.connect(invalidate_autocomplete_index, sender=AnswerPage)
@@ -0,0 +1,161 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ask_cfpb.models import AnswerPage, AutocompleteIndex
+from ask_cfpb.models.autocomplete import get_cache_version, get_words
+
+
+class AutocompleteIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = AutocompleteIndex(
+            [
+                ("What is a mortgage?", "/mortgage/"),
+                (
+                    "How do I pay my mortgage and my mortgage insurance?",
+                    "/pay/",
+                ),
+                ("¿Qué es una hipoteca?", "/hipoteca/"),
+            ]
+        )
+
+    def test_get_words(self):
+        self.assertEqual(
+            get_words("¿Qué es una HIPOTECA?"),
+            ["que", "es", "una", "hipoteca"],
+        )
+
+    def test_lookup_prefix(self):
+        self.assertEqual(
+            self.index.lookup("mort"),
+            [
+                {
+                    "question": (
+                        "How do I pay my mortgage and my mortgage insurance?"
+                    ),
+                    "url": "/pay/",
+                },
+                {"question": "What is a mortgage?", "url": "/mortgage/"},
+            ],
+        )
+
+    def test_lookup_folds_case_and_accents(self):
+        self.assertEqual(
+            self.index.lookup("QUÉ"),
+            [{"question": "¿Qué es una hipoteca?", "url": "/hipoteca/"}],
+        )
+
+    def test_lookup_no_matches(self):
+        self.assertEqual(self.index.lookup("zzz"), [])
+
+    def test_lookup_too_short_matches_nothing(self):
+        self.assertEqual(self.index.lookup("a"), [])
+        self.assertEqual(self.index.lookup("?"), [])
+
+    def test_lookup_not_covered(self):
+        self.assertIsNone(self.index.lookup("mortgages"))
+        self.assertIsNone(self.index.lookup("pay mortgage"))
+
+    def test_lookup_limits_results(self):
+        index = AutocompleteIndex(
+            (f"Question {i}", f"/{i}/")
+            for i in range(AutocompleteIndex.max_results + 5)
+        )
+        self.assertEqual(
+            len(index.lookup("ques")), AutocompleteIndex.max_results
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+)
+class AutocompleteIndexBuildTests(TestCase):
+    def setUp(self):
+        from v1.models import HomePage
+
+        self.root_page = HomePage.objects.get(slug="cfgov")
+        self.answer_page = AnswerPage(
+            title="Money 101",
+            question="What is money?",
+            slug="test-answer-page",
+            language="en",
+            live=True,
+        )
+        self.root_page.add_child(instance=self.answer_page)
+        self.addCleanup(AutocompleteIndex._indexes.clear)
+        AutocompleteIndex._indexes.clear()
+        self.addCleanup(cache.clear)
+        cache.clear()
+
+    def test_build(self):
+        self.assertEqual(
+            AutocompleteIndex.build("en").lookup("mon"),
+            [{"question": "What is money?", "url": self.answer_page.url}],
+        )
+        self.assertEqual(AutocompleteIndex.build("es").lookup("mon"), [])
+
+    def test_build_ignores_draft_pages(self):
+        self.answer_page.unpublish()
+        self.assertEqual(AutocompleteIndex.build("en").lookup("mon"), [])
+
+    def test_missing_index_is_built_in_background(self):
+        with mock.patch.object(
+            AutocompleteIndex, "rebuild_in_background"
+        ) as rebuild_in_background:
+            self.assertIsNone(AutocompleteIndex.for_language("en"))
+
+        rebuild_in_background.assert_called_once_with(
+            "en", get_cache_version()
+        )
+
+    def test_for_language_reuses_index(self):
+        AutocompleteIndex.rebuild("en", get_cache_version())
+        index = AutocompleteIndex._indexes["en"]
+
+        with mock.patch.object(
+            AutocompleteIndex, "rebuild_in_background"
+        ) as rebuild_in_background:
+            self.assertIs(AutocompleteIndex.for_language("en"), index)
+
+        rebuild_in_background.assert_not_called()
+
+    def test_publishing_answer_page_rebuilds_index_in_background(self):
+        AutocompleteIndex.rebuild("en", get_cache_version())
+        index = AutocompleteIndex._indexes["en"]
+        self.answer_page.save_revision().publish()
+
+        # The old index is used until the new one is ready.
+        with mock.patch.object(
+            AutocompleteIndex, "rebuild_in_background"
+        ) as rebuild_in_background:
+            self.assertIs(AutocompleteIndex.for_language("en"), index)
+
+        rebuild_in_background.assert_called_once_with(
+            "en", get_cache_version()
+        )
+
+    @mock.patch("threading.Thread")
+    def test_only_one_rebuild_at_a_time(self, mock_thread):
+        self.addCleanup(AutocompleteIndex._building.clear)
+        AutocompleteIndex.rebuild_in_background("en", 1)
+        AutocompleteIndex.rebuild_in_background("en", 1)
+        mock_thread.assert_called_once()
+
+    def test_failed_rebuild_keeps_index(self):
+        AutocompleteIndex.rebuild("en", 1)
+        index = AutocompleteIndex._indexes["en"]
+
+        with mock.patch.object(
+            AutocompleteIndex, "build", side_effect=DatabaseError
+        ):
+            with self.assertLogs("ask_cfpb.models.autocomplete", "ERROR"):
+                AutocompleteIndex.rebuild("en", 2)
+
+        self.assertIs(AutocompleteIndex._indexes["en"], index)
+        self.assertNotIn("en", AutocompleteIndex._building)
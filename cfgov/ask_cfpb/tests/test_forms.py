@@ -28,3 +28,18 @@ class SearchFormTestCase(TestCase):
         form = SearchForm(data={"q": "payday", "correct": "0"})
         self.assertTrue(form.is_valid())
         self.assertFalse(form.cleaned_data["correct"])
+
+    def test_clean_page(self):
+        for page, expected in (
+            (None, 1),
+            ("", 1),
+            ("nope", 1),
+            ("-2", 1),
+            ("3", 3),
+        ):
+            data = {"q": "payday"}
+            if page is not None:
+                data["page"] = page
+            form = SearchForm(data=data)
+            self.assertTrue(form.is_valid())
+            self.assertEqual(form.cleaned_data["page"], expected)
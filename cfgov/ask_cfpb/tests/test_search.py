@@ -127,6 +127,49 @@ class TestAnswerPageSearch(ElasticsearchTestsMixin, TestCase):
             result = AnswerPageSearch(search_term="money").suggest()
             self.assertIsNone(result["suggestion"])
 
+    def test_AnswerPage_search_one_page(self):
+        for i in range(3):
+            self.ROOT_PAGE.add_child(
+                instance=AnswerPage(
+                    title=f"Money {i}",
+                    question=f"What is money {i}?",
+                    answer_content="Money makes the world go round.",
+                    slug=f"test-answer-page-{i}",
+                    live=True,
+                )
+            )
+        self.rebuild_elasticsearch_index(
+            AnswerPageDocument.Index.name, stdout=StringIO()
+        )
+        search = AnswerPageSearch(search_term="money", page=2, size=2)
+        response = search.search()
+        self.assertEqual(len(response["results"]), 1)
+        self.assertEqual(response["total"], 3)
+
+    def test_AnswerPage_search_beyond_result_window(self):
+        with mock.patch(
+            "ask_cfpb.documents.AnswerPageDocument.search"
+        ) as mock_search:
+            search = AnswerPageSearch(search_term="", page=10000, size=25)
+            search.search()
+
+            # Only the total is requested, without any results.
+            mock_filter = mock_search.return_value.filter.return_value
+            mock_filter.__getitem__.assert_called_once_with(slice(0, 0))
+
+    def test_AnswerPage_suggest_reuses_search_response(self):
+        with mock.patch(
+            "ask_cfpb.documents.AnswerPageDocument.search"
+        ) as mock_search:
+            search = AnswerPageSearch(search_term="monye", size=25)
+            search.search()
+            search.suggest()
+
+            # The suggestion was requested along with the search results.
+            mock_filter = mock_search.return_value.filter.return_value
+            mock_filter.suggest.assert_not_called()
+            self.assertEqual(mock_search.call_count, 2)
+
     @mock.patch("ask_cfpb.forms.AutocompleteForm")
     def test_ask_search_autocomplete_honors_max_chars(self, mock_query):
         valid_term_1 = "Here is an ask_cfpb query that is exactly,"
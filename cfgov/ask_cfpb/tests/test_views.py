@@ -1,3 +1,5 @@
+import json
+from types import SimpleNamespace
 from unittest import mock
 
 from django.apps import apps
@@ -14,8 +16,9 @@ from ask_cfpb.models import (
     ENGLISH_PARENT_SLUG,
     SPANISH_PARENT_SLUG,
     AnswerPage,
+    AutocompleteIndex,
 )
-from ask_cfpb.views import annotate_links
+from ask_cfpb.views import annotate_links, ask_search
 from v1.util.migrations import get_or_create_page
 
 
@@ -176,3 +179,126 @@ class AnswerViewTestCase(TestCase):
         with self.assertRaises(RuntimeError) as context:
             annotate_links("answer")
         self.assertIn("no default wagtail site", str(context.exception))
+
+
+@mock.patch("ask_cfpb.views.AnswerPageSearch")
+class AskSearchTestCase(TestCase):
+    result = SimpleNamespace(
+        autocomplete="What is money?", url="/money/", text="", preview=""
+    )
+    no_results = {
+        "search_term": "monye",
+        "suggestion": None,
+        "results": [],
+        "total": 0,
+    }
+
+    def setUp(self):
+        patched = mock.patch("ask_cfpb.views.get_object_or_404")
+        patched.start().return_value.answers_per_page = 10
+        self.addCleanup(patched.stop)
+
+    def get_json(self, **params):
+        request = RequestFactory().get("/ask-cfpb/search/json/", params)
+        return json.loads(ask_search(request, as_json="json").content)
+
+    def test_later_page_of_suggested_results(self, mock_search):
+        search = mock_search.return_value
+        search.search.return_value = self.no_results
+        search.suggest.return_value = {
+            "search_term": "money",
+            "suggestion": "monye",
+            "results": [self.result],
+            "total": 15,
+        }
+
+        payload = self.get_json(q="monye", page=2)
+
+        mock_search.assert_called_once_with(
+            "monye", language="en", page=2, size=10
+        )
+        search.suggest.assert_called_once_with()
+        self.assertEqual(payload["page"], 2)
+        self.assertEqual(len(payload["results"]), 1)
+
+    def test_out_of_range_page_of_suggested_results(self, mock_search):
+        search = mock_search.return_value
+        search.search.return_value = self.no_results
+        search.suggest.side_effect = [
+            {
+                "search_term": "money",
+                "suggestion": "monye",
+                "results": [],
+                "total": 15,
+            },
+            {
+                "search_term": "money",
+                "suggestion": "monye",
+                "results": [self.result],
+                "total": 15,
+            },
+        ]
+
+        payload = self.get_json(q="monye", page=5)
+
+        self.assertEqual(search.suggest.call_count, 2)
+        self.assertEqual(search.page, 1)
+        self.assertEqual(payload["page"], 1)
+        self.assertEqual(len(payload["results"]), 1)
+
+    def test_out_of_range_page_of_results(self, mock_search):
+        search = mock_search.return_value
+        search.search.side_effect = [
+            {"search_term": "money", "results": [], "total": 15},
+            {"search_term": "money", "results": [self.result], "total": 15},
+        ]
+
+        payload = self.get_json(q="money", page=5)
+
+        self.assertEqual(search.search.call_count, 2)
+        search.suggest.assert_not_called()
+        self.assertEqual(payload["page"], 1)
+
+
+class AskAutocompleteTestCase(TestCase):
+    def setUp(self):
+        self.addCleanup(AutocompleteIndex._indexes.clear)
+        AutocompleteIndex._indexes.clear()
+
+        patched = mock.patch.object(AutocompleteIndex, "rebuild_in_background")
+        self.rebuild_in_background = patched.start()
+        self.addCleanup(patched.stop)
+
+    @mock.patch("ask_cfpb.views.AnswerPageSearch")
+    def test_short_term_uses_index(self, mock_search):
+        AutocompleteIndex._indexes["en"] = AutocompleteIndex(
+            [("What is money?", "/money/")]
+        )
+        response = self.client.get(
+            "/ask-cfpb/api/autocomplete/", {"term": "mone"}
+        )
+
+        self.assertEqual(
+            response.json(), [{"question": "What is money?", "url": "/money/"}]
+        )
+        mock_search.assert_not_called()
+
+    @mock.patch("ask_cfpb.views.AnswerPageSearch")
+    def test_long_term_queries_search(self, mock_search):
+        mock_search.return_value.autocomplete.return_value = []
+        AutocompleteIndex._indexes["en"] = AutocompleteIndex([])
+        self.client.get(
+            "/ask-cfpb/api/autocomplete/", {"term": "what is money"}
+        )
+
+        mock_search.assert_called_once_with(
+            search_term="what is money", language="en"
+        )
+
+    @mock.patch("ask_cfpb.views.AnswerPageSearch")
+    def test_queries_search_until_index_is_built(self, mock_search):
+        mock_search.return_value.autocomplete.return_value = []
+        self.client.get("/ask-cfpb/api/autocomplete/", {"term": "mone"})
+
+        mock_search.assert_called_once_with(search_term="mone", language="en")
+        self.rebuild_in_background.assert_called_once()
@@ -13,7 +13,12 @@ from wagtailsharing.views import ServeView
 from bs4 import BeautifulSoup as bs
 
 from ask_cfpb.forms import AutocompleteForm, SearchForm, legacy_facet_validator
-from ask_cfpb.models import AnswerPage, AnswerPageSearch, AnswerResultsPage
+from ask_cfpb.models import (
+    AnswerPage,
+    AnswerPageSearch,
+    AnswerResultsPage,
+    AutocompleteIndex,
+)
 
 
 def annotate_links(answer_text):
@@ -98,24 +103,41 @@ def ask_search(request, language="en", as_json=False):
         return results_page.serve(request)
 
     search_term = search_form.cleaned_data["q"]
-    page = AnswerPageSearch(search_term, language=language)
+    page_number = search_form.cleaned_data["page"]
+    page = AnswerPageSearch(
+        search_term,
+        language=language,
+        page=page_number,
+        size=results_page.answers_per_page,
+    )
     response = page.search()
 
     # Check if we want to use the suggestion or not
     suggest = search_form.cleaned_data["correct"]
 
-    # Provide a suggestion only when no results are found
-    if not response.get("results") and suggest:
+    # Provide a suggestion only when no results are found. Pagination links
+    # repeat the original search term, so later pages of the suggested
+    # results are requested in the same way.
+    if not response.get("total") and suggest:
+        search = page.suggest
         response = page.suggest()
         suggestion = response.get("suggestion")
     else:
+        search = page.search
         suggestion = search_term
 
+    # Fall back to the first page if the requested page is out of range.
+    if page_number > 1 and response.get("total") and not response["results"]:
+        page.page = page_number = 1
+        response = search()
+
     if as_json:
         payload = {
             "query": search_term,
             "result_query": search_term.strip(),
             "suggestion": suggestion.strip(),
+            "page": page_number,
+            "total": response.get("total"),
             "results": [
                 {
                     "question": result.autocomplete,
@@ -136,6 +158,8 @@ def ask_search(request, language="en", as_json=False):
         (result.url, result.autocomplete, result.preview)
         for result in response["results"]
     ]
+    results_page.answers_count = response["total"]
+    results_page.answers_page_number = page_number
     return results_page.serve(request)
 
 
@@ -146,6 +170,14 @@ def ask_autocomplete(request, language="en"):
         return JsonResponse([], safe=False)
 
     term = autocomplete_form.cleaned_data["term"]
+
+    # Short terms can be answered without querying OpenSearch, once the
+    # index has been built.
+    index = AutocompleteIndex.for_language(language)
+    results = index.lookup(term) if index is not None else None
+    if results is not None:
+        return JsonResponse(results, safe=False)
+
     try:
         results = AnswerPageSearch(
             search_term=term, language=language
@@ -346,9 +346,17 @@ else:
         }
     }
 
-OPENSEARCH_DSL_SIGNAL_PROCESSOR = (
-    "search.elasticsearch_helpers.WagtailSignalProcessor"
-)
+# Wagtail page changes are normally indexed while they are being published.
+# Set SEARCH_INDEX_QUEUE_ENABLED to queue them instead, to be indexed in bulk
+# by the process_search_index_queue management command.
+if os.environ.get("SEARCH_INDEX_QUEUE_ENABLED") == "True":
+    OPENSEARCH_DSL_SIGNAL_PROCESSOR = (
+        "search.elasticsearch_helpers.QueuedWagtailSignalProcessor"
+    )
+else:
+    OPENSEARCH_DSL_SIGNAL_PROCESSOR = (
+        "search.elasticsearch_helpers.WagtailSignalProcessor"
+    )
 
 # S3 Configuration
 # https://django-storages.readthedocs.io/en/latest/backends/amazon-S3.html#settings
@@ -591,6 +599,9 @@ FLAGS = {
     "PATH_MATCHES_FOR_QUALTRICS": [],
     # Whether robots.txt should block all robots, except for Search.gov.
     "ROBOTS_TXT_SEARCH_GOV_ONLY": [("environment is", "beta")],
+    # When enabled, cache the link-parsed content of Wagtail pages served to
+    # anonymous users, so that unchanged pages skip link parsing.
+    "PARSE_LINKS_CACHE": [],
 }
 
 # We want the ability to serve the latest drafts of some pages on beta
@@ -718,16 +729,37 @@ if DEPLOY_ENVIRONMENT and DEPLOY_ENVIRONMENT != "beta":
     SECURE_CONTENT_TYPE_NOSNIFF = True  # 26
 
 # Cache Settings
+# The default and post preview caches keep a bounded in-memory cache in each
+# process in front of the shared database cache. See core.cache.TieredCache.
+# Expired entries are removed by the cull_caches management command.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "BACKEND": "core.cache.TieredCache",
         "LOCATION": "cfgov_default_cache",
-        "TIMEOUT": None,
+        "TIMEOUT": 60 * 60 * 24,
+        "OPTIONS": {
+            "SHARED_BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCAL_MAX_ENTRIES": 1000,
+            "LOCAL_MAX_ENTRY_SIZE": 64 * 1024,
+            "LOCAL_TIMEOUT": 60,
+        },
     },
     "post_preview": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "BACKEND": "core.cache.TieredCache",
         "LOCATION": "post_preview_cache",
-        "TIMEOUT": None,
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {
+            "SHARED_BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCAL_MAX_ENTRIES": 1000,
+            "LOCAL_MAX_ENTRY_SIZE": 64 * 1024,
+            "LOCAL_TIMEOUT": 60,
+        },
+    },
+    # Rewritten page content; see core.middleware.ParseLinksMiddleware.
+    "parse_links": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "parse_links_cache",
+        "TIMEOUT": 60 * 60 * 24,
     },
 }
 
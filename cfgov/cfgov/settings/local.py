@@ -95,6 +95,7 @@ MIDDLEWARE += CSP_MIDDLEWARE
 for _cache_name, _cache_envvar in (
     ("default", "ENABLE_DEFAULT_CACHE"),
     ("post_preview", "ENABLE_POST_PREVIEW_CACHE"),
+    ("parse_links", "ENABLE_PARSE_LINKS_CACHE"),
 ):
     if not os.getenv(_cache_envvar):
         CACHES[_cache_name] = {
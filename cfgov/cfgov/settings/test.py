@@ -27,7 +27,7 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
         "TIMEOUT": 0,
     }
-    for k in ("default", "post_preview")
+    for k in ("default", "post_preview", "parse_links")
 }
 
 ALLOW_ADMIN_URL = True
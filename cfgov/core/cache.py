@@ -0,0 +1,314 @@
+"""Tiered cache backend.
+
+TieredCache keeps a small, bounded, per-process LRU cache in front of a
+shared cache backend (by default, Django's DatabaseCache). Repeated lookups of
+the same key in a process are served from memory, without a database round
+trip.
+
+Deleting or clearing keys records a new invalidation stamp in the shared
+cache. Each process checks that stamp at most every STAMP_CHECK_INTERVAL
+seconds and drops its local entries when it has changed, so that deletes made
+by any process propagate to all of them. Local entries also never outlive
+LOCAL_TIMEOUT seconds, which bounds how long a value overwritten by another
+process may be served.
+
+The local tier holds at most LOCAL_MAX_ENTRIES values, and values that pickle
+to more than LOCAL_MAX_ENTRY_SIZE bytes are only stored in the shared cache,
+so that a few large values can't use up each process's memory.
+
+Example configuration:
+
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache.TieredCache",
+            "LOCATION": "cfgov_default_cache",
+            "TIMEOUT": 60 * 60 * 24,
+            "OPTIONS": {
+                "SHARED_BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCAL_MAX_ENTRIES": 1000,
+                "LOCAL_MAX_ENTRY_SIZE": 64 * 1024,
+                "LOCAL_TIMEOUT": 60,
+            },
+        },
+    }
+
+LOCATION, TIMEOUT, KEY_PREFIX, VERSION, and any other OPTIONS are passed
+through to the shared backend.
+"""
+import pickle
+import time
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+from django.core.cache import cache as default_cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections, router
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+STAMP_KEY = "tiered-cache-invalidation-stamp"
+
+TIERED_OPTIONS = (
+    "SHARED_BACKEND",
+    "LOCAL_MAX_ENTRIES",
+    "LOCAL_MAX_ENTRY_SIZE",
+    "LOCAL_TIMEOUT",
+    "STAMP_CHECK_INTERVAL",
+)
+
+# Per-process local cache state, keyed by cache location so that it is shared
+# between the per-thread instances Django creates for each cache.
+_local_caches = {}
+_locks = {}
+
+
+class LocalCacheState:
+    def __init__(self):
+        # Maps keys to (pickled value, expiry time), most recently used last.
+        self.entries = OrderedDict()
+        self.stamp = None
+        self.stamp_checked_at = None
+        # Hit and miss counts.
+        self.stats = defaultdict(int)
+
+
+class TieredCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+
+        self.local_max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self.local_max_entry_size = int(
+            options.get("LOCAL_MAX_ENTRY_SIZE", 64 * 1024)
+        )
+        self.local_timeout = float(options.get("LOCAL_TIMEOUT", 60))
+        self.stamp_check_interval = float(
+            options.get("STAMP_CHECK_INTERVAL", 5)
+        )
+
+        shared_params = dict(params)
+        shared_params["OPTIONS"] = {
+            k: v for k, v in options.items() if k not in TIERED_OPTIONS
+        }
+        shared_backend = options.get(
+            "SHARED_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        )
+        self.shared = import_string(shared_backend)(location, shared_params)
+
+        self._local = _local_caches.setdefault(location, LocalCacheState())
+        self._lock = _locks.setdefault(location, Lock())
+
+    def get_stats(self):
+        """Return hit and miss counts for this process."""
+        with self._lock:
+            stats = dict(self._local.stats)
+
+        stats.setdefault("local_hits", 0)
+        stats.setdefault("shared_hits", 0)
+        stats.setdefault("misses", 0)
+        stats["local_entries"] = len(self._local.entries)
+        return stats
+
+    def _check_stamp(self, now):
+        local = self._local
+        if (
+            local.stamp_checked_at is not None
+            and now - local.stamp_checked_at < self.stamp_check_interval
+        ):
+            return
+
+        stamp = self.shared.get(STAMP_KEY)
+        with self._lock:
+            if stamp != local.stamp:
+                local.entries.clear()
+                local.stamp = stamp
+            local.stamp_checked_at = now
+
+    def _bump_stamp(self):
+        stamp = time.time_ns()
+        self.shared.set(STAMP_KEY, stamp, None)
+        with self._lock:
+            self._local.stamp = stamp
+            self._local.stamp_checked_at = time.monotonic()
+
+    def _get_local(self, key, now):
+        with self._lock:
+            entry = self._local.entries.get(key)
+            if entry is None:
+                return None
+
+            if entry[1] <= now:
+                del self._local.entries[key]
+                return None
+
+            self._local.entries.move_to_end(key)
+            self._local.stats["local_hits"] += 1
+            return entry[0]
+
+    def _set_local(self, key, value, timeout, now):
+        timeout = self.get_backend_timeout(timeout)
+        expires = now + self.local_timeout
+        if timeout is not None:
+            # get_backend_timeout returns an absolute wall clock time.
+            expires = min(expires, now + timeout - time.time())
+
+        if expires <= now:
+            self._delete_local(key)
+            return
+
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        if len(pickled) > self.local_max_entry_size:
+            self._delete_local(key)
+            return
+
+        with self._lock:
+            entries = self._local.entries
+            entries[key] = (pickled, expires)
+            entries.move_to_end(key)
+            while len(entries) > self.local_max_entries:
+                entries.popitem(last=False)
+
+    def _delete_local(self, key):
+        with self._lock:
+            self._local.entries.pop(key, None)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+        now = time.monotonic()
+        self._check_stamp(now)
+
+        pickled = self._get_local(local_key, now)
+        if pickled is not None:
+            return pickle.loads(pickled)
+
+        # Use a sentinel so that cached None values are distinguishable.
+        missing = object()
+        value = self.shared.get(key, missing, version=version)
+        if value is missing:
+            with self._lock:
+                self._local.stats["misses"] += 1
+            return default
+
+        with self._lock:
+            self._local.stats["shared_hits"] += 1
+
+        # The shared backend doesn't tell us its remaining timeout, so rely
+        # on LOCAL_TIMEOUT to expire this entry.
+        self._set_local(local_key, value, None, now)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+        self.shared.set(key, value, timeout, version=version)
+        self._set_local(local_key, value, timeout, time.monotonic())
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version=version)
+        self.validate_key(local_key)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._set_local(local_key, value, timeout, time.monotonic())
+        else:
+            self._delete_local(local_key)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._delete_local(self.make_key(key, version=version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._delete_local(self.make_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_key(key, version=version)
+        now = time.monotonic()
+        self._check_stamp(now)
+
+        with self._lock:
+            entry = self._local.entries.get(local_key)
+            if entry is not None and entry[1] > now:
+                return True
+
+        return self.shared.has_key(key, version=version)
+
+    def delete(self, key, version=None):
+        self._delete_local(self.make_key(key, version=version))
+        deleted = self.shared.delete(key, version=version)
+        self._bump_stamp()
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._delete_local(self.make_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+        self._bump_stamp()
+
+    def clear(self):
+        with self._lock:
+            self._local.entries.clear()
+        self.shared.clear()
+        self._bump_stamp()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def cull(self):
+        """Remove expired entries from both tiers.
+
+        Returns the number of expired entries removed from the shared cache,
+        if it is a DatabaseCache, or otherwise 0.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = self._local.entries
+            for key in [
+                k for k, (_, expires) in entries.items() if expires <= now
+            ]:
+                del entries[key]
+
+        if not isinstance(self.shared, DatabaseCache):
+            return 0
+
+        db = router.db_for_write(self.shared.cache_model_class)
+        connection = connections[db]
+        table = connection.ops.quote_name(self.shared._table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM %s WHERE expires < %%s" % table,
+                [connection.ops.adapt_datetimefield_value(timezone.now())],
+            )
+            return cursor.rowcount
+
+
+def get_cache_version(key, cache=default_cache):
+    """Return the version stored under key, starting a new one if needed.
+
+    Cached values that are stored along with this version can be invalidated
+    everywhere at once by calling invalidate_cache_version. Using the time as
+    the version means that a new version never collides with an old one, even
+    if the version key itself was evicted.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        # If another process started a version first, use theirs.
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def invalidate_cache_version(key, cache=default_cache):
+    """Start a new version for key the next time it is requested.
+
+    Deleting the version, rather than setting a new one, means that processes
+    that cache the key in a TieredCache local tier see the change promptly.
+    """
+    cache.delete(key)
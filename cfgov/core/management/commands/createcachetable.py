@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import BaseDatabaseCache
+from django.core.management.commands import createcachetable
+
+from core.cache import TieredCache
+
+
+class Command(createcachetable.Command):
+    """Also create the tables used by database-backed tiered caches."""
+
+    def handle(self, *tablenames, **options):
+        super().handle(*tablenames, **options)
+
+        if tablenames:
+            return
+
+        for alias in settings.CACHES:
+            cache = caches[alias]
+            if isinstance(cache, TieredCache) and isinstance(
+                cache.shared, BaseDatabaseCache
+            ):
+                self.create_table(
+                    options["database"],
+                    cache.shared._table,
+                    options["dry_run"],
+                )
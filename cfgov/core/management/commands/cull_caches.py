@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Remove expired entries from caches that support culling"
+
+    def handle(self, *args, **options):
+        for alias in settings.CACHES:
+            cache = caches[alias]
+            if not hasattr(cache, "cull"):
+                continue
+
+            culled = cache.cull()
+            self.stdout.write(f"Culled {culled} expired entries from {alias}")
@@ -1,6 +1,8 @@
+import hashlib
 import re
 
 from django.conf import settings
+from django.core.cache import caches
 from django.middleware.csrf import CsrfViewMiddleware
 from django.shortcuts import redirect
 from django.utils import translation
@@ -8,7 +10,34 @@ from django.utils.encoding import force_str
 
 from wagtail.core.rich_text import expand_db_html
 
-from core.utils import add_link_markup, get_body_html, get_link_tags
+from flags.state import flag_enabled
+
+from core.cache import get_cache_version, invalidate_cache_version
+from core.utils import A_TAG_RE, BODY_TAG_RE, get_link_markup
+
+
+# Match the start of any <a> tag.
+HTML_LINK_RE = re.compile(r"<a[\s>]", re.IGNORECASE)
+
+
+PARSE_LINKS_CACHE_VERSION_KEY = "parse_links_version"
+
+
+def get_parse_links_cache_key(page_id, language, path):
+    """Return the parse_links cache key for a page served at a given path."""
+    path_hash = hashlib.sha256(path.encode("utf-8")).hexdigest()
+    return f"parse_links_{page_id}_{language}_{path_hash}"
+
+
+def invalidate_all_parse_links_cache():
+    """Invalidate the cached content of every page.
+
+    Cached content is only reused if it was stored under the current
+    version, so deleting the version is enough.
+    """
+    invalidate_cache_version(
+        PARSE_LINKS_CACHE_VERSION_KEY, caches["parse_links"]
+    )
 
 
 class DownstreamCacheControlMiddleware:
@@ -39,20 +68,57 @@ def parse_links(html, request_path=None, encoding=None):
     expanded_html = expand_db_html(html_as_text)
 
     # Parse links only in the <body> of the HTML
-    body_html = get_body_html(expanded_html)
-    if body_html is None:
+    body_match = BODY_TAG_RE.search(expanded_html)
+    if body_match is None:
         return expanded_html
 
-    link_tags = get_link_tags(body_html)
-    for tag in link_tags:
-        tag_with_markup = add_link_markup(tag, request_path)
+    body_start, body_end = body_match.span()
+
+    # Rewrite the body in a single pass, copying the text between links as-is
+    # and substituting each link that needs additional markup.
+    parts = []
+    replacements = {}
+    position = body_start
+    for link_match in A_TAG_RE.finditer(expanded_html, body_start, body_end):
+        tag = link_match.group(0)
+        tag_with_markup = get_link_markup(tag, request_path)
         if tag_with_markup:
-            expanded_html = expanded_html.replace(tag, tag_with_markup)
+            replacements[tag] = tag_with_markup
+            parts.append(expanded_html[position : link_match.start()])
+            parts.append(tag_with_markup)
+            position = link_match.end()
+
+    if not replacements:
+        return expanded_html
+
+    parts.append(expanded_html[position:body_end])
 
-    return expanded_html
+    # Links are only parsed in the body, but identical links elsewhere in the
+    # document have historically been rewritten as well.
+    before_body = expanded_html[:body_start]
+    after_body = expanded_html[body_end:]
+    if HTML_LINK_RE.search(before_body) or HTML_LINK_RE.search(after_body):
+        for tag, tag_with_markup in replacements.items():
+            before_body = before_body.replace(tag, tag_with_markup)
+            after_body = after_body.replace(tag, tag_with_markup)
+
+    return before_body + "".join(parts) + after_body
 
 
 class ParseLinksMiddleware:
+    """Add markup to the links in HTML responses.
+
+    If the PARSE_LINKS_CACHE flag is enabled, the rewritten content of
+    anonymous requests for Wagtail pages is cached in the "parse_links"
+    cache. Pages opt in through request.parse_links_cache, which is set to a
+    tuple of the cache key and the page's live revision ID before the page is
+    served. Cached content is only reused if the page revision and the
+    rendered response content are unchanged, and if the cache hasn't been
+    invalidated since. Rich text links to pages and documents are only
+    turned into URLs here, so the response content can be unchanged while
+    the URLs it links to have moved; see invalidate_all_parse_links_cache.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
@@ -61,11 +127,63 @@ class ParseLinksMiddleware:
         if self.should_parse_links(
             request.path, response.get("Content-Type", "")
         ):
-            response.content = parse_links(
-                response.content, request.path, encoding=response.charset
-            )
+            if self.should_cache_parsed_links(request, response):
+                response.content = self.parse_links_with_cache(
+                    request, response
+                )
+            else:
+                response.content = parse_links(
+                    response.content, request.path, encoding=response.charset
+                )
         return response
 
+    @staticmethod
+    def should_cache_parsed_links(request, response):
+        if getattr(request, "parse_links_cache", None) is None:
+            return False
+
+        if (
+            request.method != "GET"
+            or request.GET
+            or response.status_code != 200
+            or "CSRF_COOKIE_USED" in request.META
+        ):
+            return False
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return False
+
+        return flag_enabled("PARSE_LINKS_CACHE", request=request)
+
+    @staticmethod
+    def parse_links_with_cache(request, response):
+        cache_key, revision_id = request.parse_links_cache
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        cache = caches["parse_links"]
+
+        cached_values = cache.get_many(
+            [cache_key, PARSE_LINKS_CACHE_VERSION_KEY]
+        )
+
+        version = cached_values.get(PARSE_LINKS_CACHE_VERSION_KEY)
+        if version is None:
+            version = get_cache_version(PARSE_LINKS_CACHE_VERSION_KEY, cache)
+
+        cached = cached_values.get(cache_key)
+        if cached is not None and cached[:3] == (
+            version,
+            revision_id,
+            content_hash,
+        ):
+            return cached[3]
+
+        content = parse_links(
+            response.content, request.path, encoding=response.charset
+        )
+        cache.set(cache_key, (version, revision_id, content_hash, content))
+        return content
+
     @classmethod
     def should_parse_links(cls, request_path, response_content_type):
         """Determine if links should be parsed for a given request/response.
@@ -0,0 +1,199 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.cache import (
+    LocalCacheState,
+    TieredCache,
+    get_cache_version,
+    invalidate_cache_version,
+)
+
+
+def make_cache(location="test-tiered-cache", **options):
+    options.setdefault(
+        "SHARED_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+    )
+    options.setdefault("STAMP_CHECK_INTERVAL", 0)
+    cache = TieredCache(location, {"OPTIONS": options})
+
+    # Give each cache its own local tier, as if it were in its own process.
+    cache._local = LocalCacheState()
+    return cache
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = make_cache()
+        self.cache.clear()
+        self.other_process_cache = make_cache()
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(self.cache.get("key", "default"), "default")
+        self.assertEqual(self.cache.get_stats()["misses"], 2)
+
+    def test_set_populates_both_tiers(self):
+        cache = make_cache(STAMP_CHECK_INTERVAL=60)
+        # Check the invalidation stamp, which is then not checked again.
+        cache.get("other")
+
+        cache.set("key", "value")
+        self.assertEqual(cache.shared.get("key"), "value")
+
+        with mock.patch.object(cache.shared, "get") as shared_get:
+            self.assertEqual(cache.get("key"), "value")
+            shared_get.assert_not_called()
+
+    def test_shared_hits_populate_local_tier(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.other_process_cache.get("key"), "value")
+        self.assertEqual(self.other_process_cache.get("key"), "value")
+
+        stats = self.other_process_cache.get_stats()
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertGreaterEqual(stats["local_hits"], 1)
+
+    def test_none_values_are_cached(self):
+        self.cache.set("key", None)
+        self.assertTrue(self.other_process_cache.has_key("key"))
+        self.assertIsNone(self.other_process_cache.get("key", "default"))
+
+    def test_delete_propagates_to_other_processes(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.other_process_cache.get("key"), "value")
+
+        self.cache.delete("key")
+        self.assertIsNone(self.other_process_cache.get("key"))
+
+    def test_delete_is_seen_after_stamp_check_interval(self):
+        other_process_cache = make_cache(STAMP_CHECK_INTERVAL=60)
+
+        self.cache.set("key", "value")
+        self.assertEqual(other_process_cache.get("key"), "value")
+        self.cache.delete("key")
+
+        # The stale value is served until the stamp is checked again.
+        self.assertEqual(other_process_cache.get("key"), "value")
+        other_process_cache._local.stamp_checked_at -= 60
+        self.assertIsNone(other_process_cache.get("key"))
+
+    def test_add(self):
+        self.assertTrue(self.cache.add("key", "value"))
+        self.assertFalse(self.cache.add("key", "other"))
+        self.assertEqual(self.cache.get("key"), "value")
+
+    def test_set_respects_timeout(self):
+        self.cache.set("key", "value", 0)
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_local_entries_expire(self):
+        cache = make_cache(LOCAL_TIMEOUT=0)
+        cache.set("key", "value")
+        cache.shared.set("key", "changed")
+        self.assertEqual(cache.get("key"), "changed")
+
+    def test_local_tier_is_bounded(self):
+        cache = make_cache(LOCAL_MAX_ENTRIES=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+
+        self.assertEqual(
+            list(cache._local.entries),
+            [cache.make_key("b"), cache.make_key("c")],
+        )
+        self.assertEqual(cache.get("a"), "a")
+
+    def test_large_values_are_not_stored_locally(self):
+        cache = make_cache(LOCAL_MAX_ENTRY_SIZE=100)
+        # Check the invalidation stamp, so that it doesn't clear entries later.
+        cache.get("other")
+
+        cache.set("small", "x")
+        cache.set("large", "x" * 100)
+
+        self.assertEqual(list(cache._local.entries), [cache.make_key("small")])
+        self.assertEqual(cache.get("large"), "x" * 100)
+        self.assertEqual(list(cache._local.entries), [cache.make_key("small")])
+
+    def test_local_values_are_copies(self):
+        self.cache.set("key", {"a": 1})
+        self.cache.get("key")["a"] = 2
+        self.assertEqual(self.cache.get("key"), {"a": 1})
+
+    def test_incr(self):
+        self.cache.set("key", 1)
+        self.assertEqual(self.cache.incr("key"), 2)
+        self.assertEqual(self.cache.get("key"), 2)
+
+    def test_clear(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.other_process_cache.get("key"), "value")
+        self.cache.clear()
+        self.assertIsNone(self.other_process_cache.get("key"))
+
+
+class CacheVersionTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = make_cache()
+        self.cache.clear()
+
+    def test_version_is_reused(self):
+        version = get_cache_version("version", self.cache)
+        self.assertEqual(get_cache_version("version", self.cache), version)
+
+    def test_version_started_by_another_process_is_used(self):
+        def add_after_other_process(key, value, timeout):
+            self.cache.set(key, 123)
+            return False
+
+        with mock.patch.object(
+            self.cache, "add", side_effect=add_after_other_process
+        ):
+            self.assertEqual(get_cache_version("version", self.cache), 123)
+
+    def test_invalidate_starts_new_version_in_other_processes(self):
+        other_process_cache = make_cache()
+        version = get_cache_version("version", self.cache)
+        self.assertEqual(
+            get_cache_version("version", other_process_cache), version
+        )
+
+        invalidate_cache_version("version", self.cache)
+        self.assertNotEqual(
+            get_cache_version("version", other_process_cache), version
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "core.cache.TieredCache",
+            "LOCATION": "test_tiered_cache",
+            "OPTIONS": {"STAMP_CHECK_INTERVAL": 0},
+        },
+    }
+)
+class TieredDatabaseCacheTests(TestCase):
+    def setUp(self):
+        call_command("createcachetable", stdout=StringIO())
+        self.cache = caches["default"]
+
+    def test_get_and_set(self):
+        self.cache.set("key", "value")
+        self.assertEqual(self.cache.shared.get("key"), "value")
+        self.assertEqual(self.cache.get("key"), "value")
+
+    def test_cull_caches(self):
+        self.cache.set("expired", "value", -1)
+        self.cache.set("unexpired", "value")
+
+        stdout = StringIO()
+        call_command("cull_caches", stdout=stdout)
+        self.assertIn(
+            "Culled 1 expired entries from default", stdout.getvalue()
+        )
+        self.assertEqual(self.cache.get("unexpired"), "value")
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
+import os.path
 from unittest import mock
 
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import caches
 from django.http import HttpResponse
 from django.test import (
     RequestFactory,
@@ -17,8 +20,11 @@ from core.middleware import (
     ParseLinksMiddleware,
     PathBasedCsrfViewMiddleware,
     SelfHealingMiddleware,
+    get_parse_links_cache_key,
+    invalidate_all_parse_links_cache,
     parse_links,
 )
+from core.utils import add_link_markup, clear_link_markup_cache
 from v1.models import CFGOVPage
 from v1.tests.wagtail_pages.helpers import publish_page
 
@@ -47,6 +53,109 @@ class TestParseLinksMiddleware(TestCase):
         mock_parse_links.assert_not_called()
 
 
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+        "parse_links": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+    FLAGS={"PARSE_LINKS_CACHE": [("boolean", True)]},
+)
+class TestParseLinksMiddlewareCache(TestCase):
+    html = '<body><a href="https://example.com">link</a></body>'
+
+    def setUp(self):
+        caches["parse_links"].clear()
+        self.cache_key = get_parse_links_cache_key(123, "en", "/page/")
+
+    def make_request(self, path="/page/", revision_id=1, user=None):
+        request = RequestFactory().get(path)
+        request.user = user or AnonymousUser()
+        request.parse_links_cache = (self.cache_key, revision_id)
+        return request
+
+    def get_response(self, request, html=None):
+        middleware = ParseLinksMiddleware(
+            lambda request: HttpResponse(html or self.html)
+        )
+
+        with mock.patch(
+            "core.middleware.parse_links", wraps=parse_links
+        ) as parse_links_mock:
+            response = middleware(request)
+
+        return response, parse_links_mock.call_count
+
+    def test_repeat_request_skips_parse_links(self):
+        first, first_calls = self.get_response(self.make_request())
+        second, second_calls = self.get_response(self.make_request())
+        self.assertEqual(first_calls, 1)
+        self.assertEqual(second_calls, 0)
+        self.assertIn(b"/external-site/", second.content)
+        self.assertEqual(first.content, second.content)
+
+    def test_new_revision_parses_links(self):
+        self.get_response(self.make_request(revision_id=1))
+        _, calls = self.get_response(self.make_request(revision_id=2))
+        self.assertEqual(calls, 1)
+
+    def test_invalidated_cache_parses_links(self):
+        self.get_response(self.make_request())
+        invalidate_all_parse_links_cache()
+        _, calls = self.get_response(self.make_request())
+        self.assertEqual(calls, 1)
+
+    def test_changed_content_parses_links(self):
+        self.get_response(self.make_request())
+        response, calls = self.get_response(
+            self.make_request(), html="<body><a href='/x.pdf'>x</a></body>"
+        )
+        self.assertEqual(calls, 1)
+        self.assertIn(b"cf-icon-svg", response.content)
+
+    def test_authenticated_requests_are_not_cached(self):
+        user = User(username="user")
+        self.get_response(self.make_request(user=user))
+        _, calls = self.get_response(self.make_request(user=user))
+        self.assertEqual(calls, 1)
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    def test_query_string_requests_are_not_cached(self):
+        self.get_response(self.make_request(path="/page/?q=1"))
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    def test_requests_without_page_are_not_cached(self):
+        request = self.make_request()
+        del request.parse_links_cache
+        self.get_response(request)
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    @override_settings(FLAGS={"PARSE_LINKS_CACHE": [("boolean", False)]})
+    def test_not_cached_if_flag_disabled(self):
+        self.get_response(self.make_request())
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    def test_wagtail_page_is_cached(self):
+        page = CFGOVPage(title="foo bar", slug="foo-bar")
+        publish_page(page)
+
+        with mock.patch(
+            "core.middleware.parse_links", wraps=parse_links
+        ) as parse_links_mock:
+            self.client.get("/foo-bar/")
+            self.client.get("/foo-bar/")
+
+        parse_links_mock.assert_called_once()
+        self.assertIsNotNone(
+            caches["parse_links"].get(
+                get_parse_links_cache_key(page.pk, "en", "/foo-bar/")
+            )
+        )
+
+
 class TestShouldParseLinks(TestCase):
     def test_should_not_parse_links_if_non_html(self):
         self.assertFalse(
@@ -292,6 +401,57 @@ class TestParseLinks(TestCase):
         self.assertIn('href="#anchor"', output)
 
 
+class TestParseLinksCorpus(SimpleTestCase):
+    corpus_dir = os.path.join(os.path.dirname(__file__), "parse_links_corpus")
+
+    # Each corpus page and the request path it is served from. Expected
+    # output was generated by the original BeautifulSoup-per-link rewriter.
+    corpus = {
+        "article": "/example-article/",
+        "edge_cases": "/edge-cases/",
+        "outside_body": "/example-article/",
+    }
+
+    def setUp(self):
+        clear_link_markup_cache()
+
+    def read_corpus_file(self, filename):
+        with open(os.path.join(self.corpus_dir, filename)) as f:
+            return f.read()
+
+    def test_output_matches_golden_corpus(self):
+        for name, request_path in self.corpus.items():
+            html = self.read_corpus_file(name + ".html")
+            expected = self.read_corpus_file(name + ".expected.html")
+
+            # Run twice to check output from the markup cache as well.
+            for _ in range(2):
+                with self.subTest(name=name):
+                    self.assertEqual(parse_links(html, request_path), expected)
+
+    def test_large_page_parses_each_distinct_link_once(self):
+        links = "".join(
+            f'<p><a href="/internal/{i}/">Internal {i}</a> and '
+            f'<a href="https://example.com/{i % 10}/">external</a> and '
+            f'<a href="/files/{i % 5}.pdf">a file</a></p>'
+            for i in range(500)
+        )
+        html = f"<html><body>{links}</body></html>"
+
+        with mock.patch(
+            "core.utils.add_link_markup", wraps=add_link_markup
+        ) as add_link_markup_mock:
+            output = parse_links(html, "/page/")
+            self.assertEqual(add_link_markup_mock.call_count, 15)
+
+            self.assertEqual(parse_links(html, "/page/"), output)
+            self.assertEqual(add_link_markup_mock.call_count, 15)
+
+        self.assertEqual(output.count("/external-site/?ext_url="), 500)
+        self.assertEqual(output.count('<span class="a-link_text">'), 1000)
+        self.assertEqual(output.count('<a href="/internal/'), 500)
+
+
 class DeactivateTranslationsMiddlewareTests(SimpleTestCase):
     def test_deactivates_translations(self):
         translation.activate("en-us")
@@ -9,6 +9,7 @@ from core.utils import (
     format_file_size,
     get_body_html,
     get_link_tags,
+    is_unmodified_link,
     signed_redirect,
 )
 
@@ -286,3 +287,32 @@ class LinkUtilsTests(SimpleTestCase):
         expected_tag = BeautifulSoup(expected_html, "html.parser")
 
         self.assertEqual(add_link_markup(tag, path), str(expected_tag))
+
+    def test_is_unmodified_link_plain_internal_links(self):
+        path = "/about-us/blog/"
+        for tag in [
+            '<a href="/something/">text</a>',
+            "<A HREF='/something/'>text</A>",
+            '<a class="a-link" href=/something/>text <em>here</em></a>',
+            '<a href="/about-us/blog/other/#anchor">text</a>',
+        ]:
+            with self.subTest(tag=tag):
+                self.assertTrue(is_unmodified_link(tag, path))
+                self.assertIsNone(add_link_markup(tag, path))
+
+    def test_is_unmodified_link_needs_parsing(self):
+        path = "/about-us/blog/"
+        for tag in [
+            '<a href="https://example.com">text</a>',
+            '<a href="/about-us/blog/#anchor">text</a>',
+            '<a href="/ask-cfpb/what-is-a-mortgage-en-100/">text</a>',
+            '<a href="/file.pdf">text</a>',
+            '<a href="/search/?q=1&amp;page=2">text</a>',
+            '<a data-href="/x/" href="/something/">text</a>',
+            '<a href="/something/"><img src="/x.png"></a>',
+            '<a href="/something/">text <svg></svg></a>',
+            '<a title="a > b" href="/something/">text</a>',
+            "<a>text</a>",
+        ]:
+            with self.subTest(tag=tag):
+                self.assertFalse(is_unmodified_link(tag, path))
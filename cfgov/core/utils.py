@@ -1,8 +1,11 @@
 import re
+from functools import lru_cache
 from urllib.parse import parse_qs, urlencode, urlparse
 
 from django.conf import settings
+from django.core.signals import setting_changed
 from django.core.signing import Signer
+from django.dispatch import receiver
 from django.template.defaultfilters import slugify
 from django.urls import reverse
 
@@ -64,6 +67,19 @@ ICONLESS_LINK_CHILD_ELEMENTS = [
     "h6",
 ]
 
+# Match the href of an <a> tag, as long as it appears in its opening tag.
+A_TAG_HREF_RE = re.compile(
+    r"^<a\s(?:[^>]*?\s)?href\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))",
+    re.IGNORECASE,
+)
+
+# Match any element whose presence might cause add_link_markup to modify an
+# otherwise unremarkable link.
+LINK_MARKUP_CHILD_RE = re.compile(r"<(?:svg|img|div|h[1-6])\b", re.IGNORECASE)
+
+# Maximum number of rewritten <a> tags to remember between requests.
+LINK_MARKUP_CACHE_SIZE = 4096
+
 
 def should_interstitial(url: str) -> bool:
     match = LINK_PATTERN.match(url)
@@ -127,6 +143,70 @@ def get_link_tags(html):
     return A_TAG_RE.findall(html)
 
 
+def get_link_markup(tag, request_path):
+    """Return the result of add_link_markup for a tag, avoiding reparsing.
+
+    Most links on a page are plain internal links that add_link_markup leaves
+    alone; those are recognized without building a BeautifulSoup tree. The
+    markup for any other tag is remembered, keyed by the tag text and, for
+    tags that could be in-page anchors, the request path.
+    """
+    if is_unmodified_link(tag, request_path):
+        return None
+
+    if "#" not in tag:
+        request_path = None
+
+    return _cached_link_markup(tag, request_path)
+
+
+@lru_cache(maxsize=LINK_MARKUP_CACHE_SIZE)
+def _cached_link_markup(tag, request_path):
+    return add_link_markup(tag, request_path)
+
+
+@receiver(setting_changed)
+def clear_link_markup_cache(**kwargs):
+    # Link markup depends on settings like SECRET_KEY (used to sign external
+    # redirects) and ALLOWED_LINKS_WITHOUT_INTERSTITIAL.
+    _cached_link_markup.cache_clear()
+
+
+def is_unmodified_link(tag, request_path):
+    """Return True if add_link_markup is known to leave a tag unmodified.
+
+    This only recognizes simple tags, with a single plainly written href and
+    no nested links or children that affect icons. A return value of False
+    means that the tag needs to be parsed to know for sure.
+    """
+    lowered = tag.lower()
+    if lowered.count("href") != 1 or lowered.count("<a") != 1:
+        return False
+
+    if LINK_MARKUP_CHILD_RE.search(tag):
+        return False
+
+    match = A_TAG_HREF_RE.match(tag)
+    if match is None:
+        return False
+
+    href = next(group for group in match.groups() if group is not None)
+
+    # Character references would be decoded by the HTML parser.
+    if "&" in href:
+        return False
+
+    if request_path is not None and href.startswith(request_path + "#"):
+        return False
+
+    return not (
+        ASK_CFPB_LINKS.match(href)
+        or href.startswith("/external-site/?")
+        or NON_CFPB_LINKS.match(href)
+        or DOWNLOAD_LINKS.search(href)
+    )
+
+
 def add_link_markup(tag, request_path):
     """Add necessary markup to the given link and return if modified.
 
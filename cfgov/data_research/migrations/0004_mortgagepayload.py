@@ -0,0 +1,21 @@
+# Generated by Django 3.2.13 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_research', '0003_delete_conferenceregistration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MortgagePayload',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('payload', models.TextField()),
+            ],
+        ),
+    ]
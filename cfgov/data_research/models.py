@@ -62,6 +62,21 @@ class MortgageMetaData(models.Model):
         verbose_name_plural = "Mortgage metadata"
 
 
+class MortgagePayload(models.Model):
+    """
+    A ready-to-serve JSON payload for a mortgage performance API request.
+
+    These are regenerated whenever mortgage data is processed, so that the
+    API doesn't need to build them from data records on every request.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    payload = models.TextField()
+
+    def __str__(self):
+        return self.key
+
+
 # mortgage geo models
 
 
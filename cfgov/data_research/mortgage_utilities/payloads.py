@@ -0,0 +1,190 @@
+from rest_framework.renderers import JSONRenderer
+
+from data_research.models import (
+    County,
+    CountyMortgageData,
+    MetroArea,
+    MortgageMetaData,
+    MortgagePayload,
+    MSAMortgageData,
+    NationalMortgageData,
+    NonMSAMortgageData,
+    State,
+    StateMortgageData,
+)
+
+
+DAYS_LATE_RANGE = ["30-89", "90"]
+MAP_GEOS = ["national", "states", "counties", "metros"]
+
+
+def time_series_key(days_late, fips):
+    return "time-series/{}/{}".format(days_late, fips)
+
+
+def map_data_key(days_late, geo, date):
+    return "map-data/{}/{}/{}".format(days_late, geo, date.strftime("%Y-%m"))
+
+
+def get_reference_lists():
+    return {
+        meta.name: meta.json_value
+        for meta in MortgageMetaData.objects.filter(
+            name__in=["allowlist", "msa_fips", "non_msa_fips"]
+        )
+    }
+
+
+def national_time_series(days_late):
+    """Return national time-series data for a delinquency range."""
+    records = NationalMortgageData.objects.all()
+    return {
+        "meta": {"name": "United States", "fips_type": "national"},
+        "data": [record.time_series(days_late) for record in records],
+    }
+
+
+def geo_time_series(days_late, fips, reference_lists=None):
+    """
+    Return a FIPS-based slice of base data as a time series.
+
+    If the FIPS code can't be displayed, an explanatory message is returned
+    instead.
+    """
+    if reference_lists is None:
+        reference_lists = get_reference_lists()
+    if fips not in reference_lists["allowlist"]:
+        return "FIPS code not found or not valid."
+    if len(fips) == 2:
+        state = State.objects.get(fips=fips)
+        records = StateMortgageData.objects.filter(fips=fips)
+        return {
+            "meta": {
+                "fips": fips,
+                "name": state.name,
+                "fips_type": "state",
+            },
+            "data": [record.time_series(days_late) for record in records],
+        }
+    if "non" in fips:
+        records = NonMSAMortgageData.objects.filter(fips=fips)
+        return {
+            "meta": {
+                "fips": fips,
+                "name": "Non-metro area of {}".format(
+                    records.first().state.name
+                ),
+                "fips_type": "non_msa",
+            },
+            "data": [record.time_series(days_late) for record in records],
+        }
+
+    if fips in reference_lists["msa_fips"]:
+        metro_area = MetroArea.objects.get(fips=fips, valid=True)
+        records = MSAMortgageData.objects.filter(fips=fips)
+        return {
+            "meta": {
+                "fips": fips,
+                "name": metro_area.name,
+                "fips_type": "msa",
+            },
+            "data": [record.time_series(days_late) for record in records],
+        }
+    else:  # must be a county request
+        try:
+            county = County.objects.get(fips=fips, valid=True)
+        except County.DoesNotExist:
+            return "County is below display threshold."
+        records = CountyMortgageData.objects.filter(fips=fips)
+        name = "{}, {}".format(county.name, county.state.abbr)
+        return {
+            "meta": {"fips": fips, "name": name, "fips_type": "county"},
+            "data": [record.time_series(days_late) for record in records],
+        }
+
+
+def map_data(days_late, geo, date):
+    """Return geo-based map data for a delinquency range and date."""
+    geo_dict = {
+        "states": {
+            "queryset": StateMortgageData.objects.select_related("state"),
+            "fips_type": "state",
+            "geo_obj": "state",
+        },
+        "counties": {
+            "queryset": CountyMortgageData.objects.filter(
+                county__valid=True
+            ).select_related("county__state"),
+            "fips_type": "county",
+            "geo_obj": "county",
+        },
+        "metros": {
+            "queryset": MSAMortgageData.objects.select_related("msa"),
+            "fips_type": "msa",
+            "geo_obj": "msa",
+        },
+    }
+    nat_records = NationalMortgageData.objects.get(date=date)
+    nat_data_series = nat_records.time_series(days_late)
+    if geo == "national":
+        payload = {
+            "meta": {
+                "fips_type": "nation",
+                "date": "{}".format(date),
+            },
+            "data": {},
+        }
+        nat_data_series.update({"name": "United States"})
+        del nat_data_series["date"]
+        payload["data"].update(nat_data_series)
+    else:
+        records = geo_dict[geo]["queryset"].filter(date=date)
+        payload = {
+            "meta": {
+                "fips_type": geo_dict[geo]["fips_type"],
+                "date": "{}".format(date),
+                "national_average": nat_data_series["value"],
+            },
+            "data": {},
+        }
+        for record in records:
+            data_series = record.time_series(days_late)
+            geo_parent = getattr(record, geo_dict[geo]["geo_obj"])
+            if geo == "counties":
+                name = "{}, {}".format(geo_parent.name, geo_parent.state.abbr)
+            else:
+                name = geo_parent.name
+            data_series.update({"name": name})
+            del data_series["date"]
+            payload["data"].update({record.fips: data_series})
+        if geo == "metros":
+            for metro in MetroArea.objects.filter(valid=False):
+                payload["data"][metro.fips]["value"] = None
+            non_msa_records = NonMSAMortgageData.objects.filter(
+                date=date
+            ).select_related("state")
+            for record in non_msa_records:
+                non_data_series = record.time_series(days_late)
+                if record.state.non_msa_valid is False:
+                    non_data_series["value"] = None
+                non_name = "Non-metro area of {}".format(record.state.name)
+                non_data_series.update({"name": non_name})
+                del non_data_series["date"]
+                payload["data"].update({record.fips: non_data_series})
+    return payload
+
+
+def render_payload(key, data):
+    """Render data as it would be served by the API, for storage."""
+    return MortgagePayload(
+        key=key, payload=JSONRenderer().render(data).decode("utf-8")
+    )
+
+
+def get_stored_payload(key):
+    """Return a stored API payload, or None if there isn't one."""
+    return (
+        MortgagePayload.objects.filter(key=key)
+        .values_list("payload", flat=True)
+        .first()
+    )
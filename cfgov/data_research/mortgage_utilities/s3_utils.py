@@ -1,6 +1,5 @@
 import csv
 import datetime
-from io import StringIO
 
 from django.conf import settings
 
@@ -20,10 +19,11 @@ S3_SOURCE_FILE = "latest_county_delinquency.csv"
 
 
 def read_in_s3_csv(url):
-    response = requests.get(url)
-    f = StringIO(response.content.decode("utf-8"))
-    reader = csv.DictReader(f)
-    return reader
+    """Return a csv.DictReader that streams the rows of a remote CSV."""
+    response = requests.get(url, stream=True)
+    response.raise_for_status()
+    response.encoding = "utf-8"
+    return csv.DictReader(response.iter_lines(decode_unicode=True))
 
 
 def bake_csv_to_s3(slug, csv_file_obj, sub_bucket=None):
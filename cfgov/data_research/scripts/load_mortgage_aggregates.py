@@ -2,6 +2,8 @@ import datetime
 import logging
 import os
 
+from django.db.models import Sum
+
 from dateutil import parser
 
 from data_research.models import (
@@ -15,11 +17,15 @@ from data_research.models import (
     StateMortgageData,
     validate_counties,
 )
+from data_research.scripts import store_mortgage_payloads
 
 
 logger = logging.getLogger(__name__)
 script = os.path.basename(__file__)
 
+COUNT_FIELDS = ["total", "current", "thirty", "sixty", "ninety", "other"]
+BATCH_SIZE = 1000
+
 
 def update_sampling_dates():
     """
@@ -68,43 +74,125 @@ def merge_the_dades():
     logger.info("\nDade and Miami-Dade values merged.")
 
 
-def load_msa_values(date):
-    for metro in MetroArea.objects.all():
-        msa_obj, cr = MSAMortgageData.objects.get_or_create(
-            date=date, msa=metro, fips=metro.fips
-        )
-        msa_obj.aggregate_data()
-
+def get_county_values(dates):
+    """
+    Load the values of every county record for the given dates.
 
-def load_state_values(date):
-    for state in State.objects.all():
-        record, cr = StateMortgageData.objects.get_or_create(
-            date=date, state=state, fips=state.fips
+    Returns a dict mapping (fips, date) to a list of COUNT_FIELDS values,
+    so that every aggregate can be summed from one query.
+    """
+    records = (
+        CountyMortgageData.objects.filter(date__in=dates)
+        .order_by()
+        .values_list("fips", "date", *COUNT_FIELDS)
+    )
+    return {(fips, date): values for fips, date, *values in records}
+
+
+def sum_county_values(county_values, county_list, date):
+    """Sum the values of a list of counties for a date."""
+    sums = [0] * len(COUNT_FIELDS)
+    for fips in county_list:
+        values = county_values.get((fips, date))
+        if values:
+            sums = [total + (value or 0) for total, value in zip(sums, values)]
+    return dict(zip(COUNT_FIELDS, sums))
+
+
+def replace_records(cls, dates, records):
+    cls.objects.filter(date__in=dates).delete()
+    cls.objects.bulk_create(records, batch_size=BATCH_SIZE)
+
+
+def load_msa_values(dates, county_values=None):
+    if county_values is None:
+        county_values = get_county_values(dates)
+    records = [
+        MSAMortgageData(
+            date=date,
+            msa=metro,
+            fips=metro.fips,
+            **(
+                sum_county_values(county_values, metro.counties, date)
+                if metro.counties
+                else {}
+            ),
         )
-        record.aggregate_data()
-
-
-def load_non_msa_state_values(date):
-    for state in State.objects.all():
-        record, cr = NonMSAMortgageData.objects.get_or_create(
-            date=date, state=state, fips="{}-non".format(state.fips)
+        for metro in MetroArea.objects.all()
+        for date in dates
+    ]
+    replace_records(MSAMortgageData, dates, records)
+
+
+def load_state_values(dates, county_values=None):
+    if county_values is None:
+        county_values = get_county_values(dates)
+    records = [
+        StateMortgageData(
+            date=date,
+            state=state,
+            fips=state.fips,
+            **(
+                sum_county_values(county_values, state.counties, date)
+                if state.counties
+                else {}
+            ),
         )
-        record.aggregate_data()
-
-
-def load_national_values(date):
-    record, cr = NationalMortgageData.objects.get_or_create(
-        date=date, fips="-----"
-    )
-    record.aggregate_data()
+        for state in State.objects.all()
+        for date in dates
+    ]
+    replace_records(StateMortgageData, dates, records)
+
+
+def load_non_msa_state_values(dates, county_values=None):
+    if county_values is None:
+        county_values = get_county_values(dates)
+    records = [
+        NonMSAMortgageData(
+            date=date,
+            state=state,
+            fips="{}-non".format(state.fips),
+            **sum_county_values(
+                county_values, state.non_msa_counties or [], date
+            ),
+        )
+        for state in State.objects.all()
+        for date in dates
+    ]
+    replace_records(NonMSAMortgageData, dates, records)
+
+
+def load_national_values(dates):
+    """Sum state records into national records, with one grouped query."""
+    state_sums = {
+        row.pop("date"): row
+        for row in StateMortgageData.objects.filter(date__in=dates)
+        .order_by()
+        .values("date")
+        .annotate(**{field: Sum(field) for field in COUNT_FIELDS})
+    }
+    records = [
+        NationalMortgageData(
+            date=date,
+            fips="-----",
+            **state_sums.get(date, dict.fromkeys(COUNT_FIELDS, 0)),
+        )
+        for date in dates
+    ]
+    replace_records(NationalMortgageData, dates, records)
 
 
-def run():
+def run(store_payloads=True):
     """
     This script should be run following a refresh of county mortgage data.
 
     The script wipes national, state and metro-based aggregate records,
     creates new ones for every date in range, and then updates metadata.
+    Aggregates for all dates are summed from a single load of the county
+    records and written in bulk.
+
+    Stored API payloads are then regenerated from the new aggregates,
+    unless store_payloads is False.
     """
     starter = datetime.datetime.now()
     aggregate_classes = [
@@ -118,14 +206,18 @@ def run():
     update_sampling_dates()
     merge_the_dades()
     validate_counties()
-    dates = MortgageMetaData.objects.get(name="sampling_dates").json_value
-    for date_string in dates:
-        date = parser.parse(date_string).date()
-        logger.info("Aggregating data for {}".format(date))
-        load_msa_values(date)
-        load_state_values(date)
-        load_non_msa_state_values(date)
-        load_national_values(date)
+    dates = [
+        parser.parse(date_string).date()
+        for date_string in MortgageMetaData.objects.get(
+            name="sampling_dates"
+        ).json_value
+    ]
+    logger.info("Aggregating data for {} dates".format(len(dates)))
+    county_values = get_county_values(dates)
+    load_msa_values(dates, county_values)
+    load_state_values(dates, county_values)
+    load_non_msa_state_values(dates, county_values)
+    load_national_values(dates)
     logger.info("Validating MSAs and non-MSAs")
     for metro in MetroArea.objects.all():
         metro.validate()
@@ -136,3 +228,5 @@ def run():
             script, (datetime.datetime.now() - starter)
         )
     )
+    if store_payloads:
+        store_mortgage_payloads.run()
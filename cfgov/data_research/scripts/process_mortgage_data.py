@@ -3,7 +3,11 @@ import datetime
 import logging
 import os
 import sys
+from functools import lru_cache
 from io import StringIO
+from itertools import islice
+
+from django.db import transaction
 
 from dateutil import parser
 
@@ -21,12 +25,14 @@ from data_research.mortgage_utilities.s3_utils import (
 from data_research.scripts import (
     export_public_csvs,
     load_mortgage_aggregates,
+    store_mortgage_payloads,
     update_county_msa_meta,
 )
 
 
 DATAFILE = StringIO()
 SCRIPT_NAME = os.path.basename(__file__).split(".")[0]
+BATCH_SIZE = 10000
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +57,53 @@ def dump_as_csv(rows_out, dump_slug):
             writer.writerow(row)
 
 
+@lru_cache(maxsize=None)
+def parse_sampling_date(date_string):
+    """
+    Parse a source date such as 01/01/08, falling back to dateutil.
+
+    Source files repeat the same few hundred dates, so results are cached.
+    """
+    try:
+        return datetime.datetime.strptime(date_string, "%m/%d/%y").date()
+    except ValueError:
+        return parser.parse(date_string).date()
+
+
+def generate_records(raw_data, starting_date, through_date):
+    """Yield a CountyMortgageData record for each usable source row."""
+    county_ids = dict(County.objects.values_list("fips", "pk"))
+    valid_fips = {}
+    pk = 1
+    for row in raw_data:
+        sampling_date = parse_sampling_date(row.get("date"))
+        if sampling_date < starting_date or sampling_date > through_date:
+            continue
+        raw_fips = row.get("fips")
+        if raw_fips not in valid_fips:
+            valid_fips[raw_fips] = validate_fips(raw_fips)
+        fips = valid_fips[raw_fips]
+        if not fips:
+            continue
+        if fips not in county_ids:
+            raise County.DoesNotExist(
+                "No county found with FIPS {}".format(fips)
+            )
+        yield CountyMortgageData(
+            pk=pk,
+            fips=fips,
+            date=sampling_date,
+            total=row.get("open"),
+            current=row.get("current"),
+            thirty=row.get("thirty"),
+            sixty=row.get("sixty"),
+            ninety=row.get("ninety"),
+            other=row.get("other"),
+            county_id=county_ids[fips],
+        )
+        pk += 1
+
+
 def process_source(starting_date, through_date, dump_slug=None):
     """
     Re-generate aggregated data from the latest source CSV posted to S3.
@@ -67,65 +120,55 @@ def process_source(starting_date, through_date, dump_slug=None):
     date,fips,open,current,thirty,sixty,ninety,other
     01/01/08,1001,268,260,4,1,0,3
 
+    The source is streamed and loaded in batches, inside a transaction so
+    that the old county data is served until the new data is complete.
     """
     starter = datetime.datetime.now()
     counter = 0
-    pk = 1
-    new_objects = []
-    # truncate table
-    CountyMortgageData.objects.all().delete()
     source_url = "{}/{}".format(S3_SOURCE_BUCKET, S3_SOURCE_FILE)
     raw_data = read_in_s3_csv(source_url)
-    for row in raw_data:
-        sampling_date = parser.parse(row.get("date")).date()
-        if sampling_date >= starting_date and sampling_date <= through_date:
-            valid_fips = validate_fips(row.get("fips"))
-            if valid_fips:
-                county = County.objects.get(fips=valid_fips)
-                new_objects.append(
-                    CountyMortgageData(
-                        pk=pk,
-                        fips=valid_fips,
-                        date=sampling_date,
-                        total=row.get("open"),
-                        current=row.get("current"),
-                        thirty=row.get("thirty"),
-                        sixty=row.get("sixty"),
-                        ninety=row.get("ninety"),
-                        other=row.get("other"),
-                        county=county,
-                    )
-                )
-                pk += 1
-                counter += 1
-                if counter % 10000 == 0:  # pragma: no cover
-                    sys.stdout.write(".")
-                    sys.stdout.flush()
-                if counter % 100000 == 0:  # pragma: no cover
-                    logger.info("\n{}".format(counter))
-    CountyMortgageData.objects.bulk_create(new_objects)
+    records = generate_records(raw_data, starting_date, through_date)
+    with transaction.atomic():
+        # truncate table
+        CountyMortgageData.objects.all().delete()
+        while True:
+            batch = list(islice(records, BATCH_SIZE))
+            if not batch:
+                break
+            CountyMortgageData.objects.bulk_create(batch)
+            counter += len(batch)
+            if counter % 10000 == 0:  # pragma: no cover
+                sys.stdout.write(".")
+                sys.stdout.flush()
+            if counter % 100000 == 0:  # pragma: no cover
+                logger.info("\n{}".format(counter))
     logger.info(
         "\n{} took {} "
         "to create {} countymortgage records".format(
-            SCRIPT_NAME, (datetime.datetime.now() - starter), len(new_objects)
+            SCRIPT_NAME, (datetime.datetime.now() - starter), counter
         )
     )
     if dump_slug:
+        rows = (
+            CountyMortgageData.objects.order_by("pk")
+            .values_list(
+                "pk",
+                "fips",
+                "date",
+                "total",
+                "current",
+                "thirty",
+                "sixty",
+                "ninety",
+                "other",
+                "county_id",
+            )
+            .iterator()
+        )
         dump_as_csv(
             (
-                (
-                    obj.pk,
-                    obj.fips,
-                    "{}".format(obj.date),
-                    obj.total,
-                    obj.current,
-                    obj.thirty,
-                    obj.sixty,
-                    obj.ninety,
-                    obj.other,
-                    obj.county.pk,
-                )
-                for obj in new_objects
+                (pk, fips, "{}".format(date), *values)
+                for pk, fips, date, *values in rows
             ),
             dump_slug,
         )
@@ -149,8 +192,11 @@ def run(*args):
         if len(args) > 1:
             dump_slug = args[1]
         process_source(starting_date, through_date, dump_slug=dump_slug)
-        load_mortgage_aggregates.run()
-        update_county_msa_meta.run()
+        # Payloads depend on both the aggregates and the FIPS metadata, so
+        # store them once both have been updated.
+        load_mortgage_aggregates.run(store_payloads=False)
+        update_county_msa_meta.run(store_payloads=False)
+        store_mortgage_payloads.run()
         export_public_csvs.run()
     else:
         logger.info(
@@ -0,0 +1,84 @@
+import datetime
+import logging
+import os
+from itertools import islice
+
+from django.db import transaction
+
+from dateutil import parser
+
+from data_research.models import (
+    MortgageMetaData,
+    MortgagePayload,
+    NationalMortgageData,
+)
+from data_research.mortgage_utilities.payloads import (
+    DAYS_LATE_RANGE,
+    MAP_GEOS,
+    geo_time_series,
+    get_reference_lists,
+    map_data,
+    map_data_key,
+    national_time_series,
+    render_payload,
+    time_series_key,
+)
+
+
+logger = logging.getLogger(__name__)
+script = os.path.basename(__file__)
+
+BATCH_SIZE = 100
+
+
+def generate_payloads():
+    reference_lists = get_reference_lists()
+    dates = [
+        parser.parse(date_string).date()
+        for date_string in MortgageMetaData.objects.get(
+            name="sampling_dates"
+        ).json_value
+    ]
+    for days_late in DAYS_LATE_RANGE:
+        yield render_payload(
+            time_series_key(days_late, "national"),
+            national_time_series(days_late),
+        )
+        for fips in reference_lists["allowlist"]:
+            data = geo_time_series(days_late, fips, reference_lists)
+            # Requests for FIPS codes that can't be displayed get a message.
+            if isinstance(data, dict):
+                yield render_payload(time_series_key(days_late, fips), data)
+        for date in dates:
+            for geo in MAP_GEOS:
+                try:
+                    data = map_data(days_late, geo, date)
+                except NationalMortgageData.DoesNotExist:
+                    continue
+                yield render_payload(map_data_key(days_late, geo, date), data)
+
+
+def run():
+    """
+    Store ready-to-serve payloads for the mortgage performance API.
+
+    This script should be run after mortgage aggregates and metadata have
+    been updated. It replaces all previously stored payloads.
+    """
+    starter = datetime.datetime.now()
+    payloads = generate_payloads()
+    count = 0
+    with transaction.atomic():
+        MortgagePayload.objects.all().delete()
+        # Map payloads can be large, so only hold a batch at a time.
+        while True:
+            batch = list(islice(payloads, BATCH_SIZE))
+            if not batch:
+                break
+            MortgagePayload.objects.bulk_create(batch)
+            count += len(batch)
+    logger.info(
+        "{} took {} to store {} payloads.".format(
+            script, (datetime.datetime.now() - starter), count
+        )
+    )
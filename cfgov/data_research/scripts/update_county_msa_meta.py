@@ -6,6 +6,7 @@ from data_research.mortgage_utilities.fips_meta import (
     NON_STATES,
     load_fips_meta,
 )
+from data_research.scripts import store_mortgage_payloads
 
 
 logger = logging.getLogger(__name__)
@@ -188,8 +189,16 @@ def update_state_to_geo_meta(geo):
         logger.info("Saved non_msa_fips")
 
 
-def run():
+def run(store_payloads=True):
+    """
+    Update FIPS metadata, then regenerate stored API payloads from it.
+
+    Pass store_payloads=False to skip regenerating payloads, for example if
+    they will be regenerated by a later step.
+    """
     update_allowlist()
     load_fips_meta()
     for geo in ["msa", "county"]:
         update_state_to_geo_meta(geo)
+    if store_payloads:
+        store_mortgage_payloads.run()
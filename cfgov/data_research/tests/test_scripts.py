@@ -6,6 +6,8 @@ from io import StringIO
 from unittest import mock
 
 import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from dateutil import parser
 from model_bakery import baker
@@ -47,6 +49,7 @@ from data_research.scripts.load_mortgage_aggregates import (
 from data_research.scripts.load_mortgage_performance_csv import load_values
 from data_research.scripts.process_mortgage_data import (
     dump_as_csv,
+    parse_sampling_date,
     process_source,
 )
 from data_research.scripts.process_mortgage_data import (
@@ -173,6 +176,36 @@ class SourceToTableTest(django.test.TestCase):
         self.assertEqual(mock_read.call_count, 1)
         self.assertEqual(mock_dump.call_count, 1)
 
+    @mock.patch(
+        "data_research.scripts.process_mortgage_data." "read_in_s3_csv"
+    )
+    def test_process_source_failure_keeps_existing_data(self, mock_read):
+        mock_read.return_value = iter(
+            [
+                {
+                    "date": "01/01/10",
+                    "fips": "99999",
+                    "open": "268",
+                    "current": "260",
+                    "thirty": "4",
+                    "sixty": "1",
+                    "ninety": "0",
+                    "other": "3",
+                }
+            ]
+        )
+        with self.assertRaises(County.DoesNotExist):
+            process_source(self.start_date, self.through_date)
+        self.assertEqual(CountyMortgageData.objects.count(), 1)
+
+    def test_parse_sampling_date(self):
+        self.assertEqual(
+            parse_sampling_date("01/02/10"), datetime.date(2010, 1, 2)
+        )
+        self.assertEqual(
+            parse_sampling_date("2010-01-02"), datetime.date(2010, 1, 2)
+        )
+
     @mock.patch(
         "data_research.scripts.process_mortgage_data." "process_source"
     )
@@ -188,12 +221,17 @@ class SourceToTableTest(django.test.TestCase):
         "data_research.scripts.process_mortgage_data."
         "update_county_msa_meta.run"
     )
+    @mock.patch(
+        "data_research.scripts.process_mortgage_data."
+        "store_mortgage_payloads.run"
+    )
     @mock.patch(
         "data_research.scripts.process_mortgage_data." "export_public_csvs.run"
     )
     def test_run_command(
         self,
         mock_export,
+        mock_store_payloads,
         mock_meta_update,
         mock_aggregates,
         mock_update_constants,
@@ -201,8 +239,9 @@ class SourceToTableTest(django.test.TestCase):
     ):
         run_process_mortgage_data("2018-06-01", "mock_slug")
         self.assertEqual(mock_export.call_count, 1)
-        self.assertEqual(mock_meta_update.call_count, 1)
-        self.assertEqual(mock_aggregates.call_count, 1)
+        self.assertEqual(mock_store_payloads.call_count, 1)
+        mock_meta_update.assert_called_once_with(store_payloads=False)
+        mock_aggregates.assert_called_once_with(store_payloads=False)
         self.assertEqual(mock_update_constants.call_count, 1)
         self.assertEqual(mock_process.call_count, 1)
 
@@ -618,23 +657,23 @@ class DataLoadTest(django.test.TestCase):
 
     def test_load_msa_values(self):
         self.assertEqual(MSAMortgageData.objects.count(), 1)
-        load_msa_values("2009-12-01")
+        load_msa_values([datetime.date(2009, 12, 1)])
         self.assertEqual(MSAMortgageData.objects.count(), 2)
 
     def test_load_non_msa_state_values(self):
         self.assertEqual(State.objects.count(), 1)
         self.assertEqual(NonMSAMortgageData.objects.count(), 1)
-        load_non_msa_state_values("2009-01-01")
+        load_non_msa_state_values([datetime.date(2009, 1, 1)])
         self.assertEqual(NonMSAMortgageData.objects.count(), 2)
 
     def test_load_state_values(self):
-        load_state_values("2008-01-01")
+        load_state_values([datetime.date(2008, 1, 1)])
         self.assertEqual(StateMortgageData.objects.count(), 2)
 
     def test_load_national_values(self):
-        load_national_values("2016-09-01")
+        load_national_values([datetime.date(2016, 9, 1)])
         self.assertEqual(NationalMortgageData.objects.count(), 1)
-        load_national_values("2016-09-01")
+        load_national_values([datetime.date(2016, 9, 1)])
         self.assertEqual(NationalMortgageData.objects.count(), 1)
 
     @mock.patch(
@@ -686,18 +725,96 @@ class DataLoadTest(django.test.TestCase):
     @mock.patch(
         "data_research.scripts." "load_mortgage_aggregates.validate_counties"
     )
-    def test_run_aggregates(self, mock_validate_counties, mock_update_dates):
+    @mock.patch(
+        "data_research.scripts."
+        "load_mortgage_aggregates.store_mortgage_payloads.run"
+    )
+    def test_run_aggregates(
+        self, mock_store_payloads, mock_validate_counties, mock_update_dates
+    ):
         dates = MortgageMetaData.objects.get(name="sampling_dates")
         dates.json_value = ["2016-01-01"]
         dates.save()
         run_aggregates()
         self.assertEqual(mock_validate_counties.call_count, 1)
         self.assertEqual(mock_update_dates.call_count, 1)
+        self.assertEqual(mock_store_payloads.call_count, 1)
         self.assertEqual(NationalMortgageData.objects.count(), 1)
         self.assertEqual(StateMortgageData.objects.count(), 1)
         self.assertEqual(MSAMortgageData.objects.count(), 1)
         self.assertEqual(NonMSAMortgageData.objects.count(), 1)
 
+    def test_load_values_sums_counties(self):
+        date = datetime.date(2016, 1, 1)
+        sarasota = baker.make(
+            County,
+            fips="12115",
+            name="Sarasota County",
+            state=State.objects.get(fips="12"),
+            valid=True,
+        )
+        for county in County.objects.all():
+            CountyMortgageData.objects.filter(fips=county.fips).delete()
+            baker.make(
+                CountyMortgageData,
+                date=date,
+                fips=county.fips,
+                county=county,
+                total=100,
+                current=50,
+                thirty=20,
+                sixty=10,
+                ninety=15,
+                other=5,
+            )
+        MetroArea.objects.update(counties=["12081", sarasota.fips])
+        State.objects.update(
+            counties=["12081", sarasota.fips], non_msa_counties=["12115"]
+        )
+
+        load_msa_values([date])
+        load_state_values([date])
+        load_non_msa_state_values([date])
+        load_national_values([date])
+
+        expected = {
+            "total": 200,
+            "current": 100,
+            "thirty": 40,
+            "sixty": 20,
+            "ninety": 30,
+            "other": 10,
+        }
+        for cls in [MSAMortgageData, StateMortgageData, NationalMortgageData]:
+            record = cls.objects.get(date=date)
+            for field, value in expected.items():
+                self.assertEqual(getattr(record, field), value)
+        self.assertEqual(NonMSAMortgageData.objects.get(date=date).total, 100)
+
+    @mock.patch(
+        "data_research.scripts."
+        "load_mortgage_aggregates.update_sampling_dates"
+    )
+    @mock.patch(
+        "data_research.scripts." "load_mortgage_aggregates.validate_counties"
+    )
+    def test_run_aggregates_queries_do_not_scale_with_dates(self, *mocks):
+        # Benchmark: per-record aggregation used to make several queries for
+        # every aggregate at every date.
+        dates = MortgageMetaData.objects.get(name="sampling_dates")
+
+        def count_queries(date_strings):
+            dates.json_value = date_strings
+            dates.save()
+            with CaptureQueriesContext(connection) as queries:
+                run_aggregates(store_payloads=False)
+            return len(queries)
+
+        self.assertEqual(
+            count_queries(["2016-01-01"]),
+            count_queries(["2015-11-01", "2015-12-01", "2016-01-01"]),
+        )
+
 
 class UpdateSamplingDatesTest(django.test.TestCase):
     fixtures = ["mortgage_constants.json", "mortgage_metadata.json"]
@@ -878,6 +995,23 @@ class UpdateStateMsaDropdownTests(django.test.TestCase):
         "data_research.scripts."
         "update_county_msa_meta.update_state_to_geo_meta"
     )
-    def test_run_rebuild(self, mock_update):
+    @mock.patch(
+        "data_research.scripts."
+        "update_county_msa_meta.store_mortgage_payloads.run"
+    )
+    def test_run_rebuild(self, mock_store_payloads, mock_update):
         run_update()
         self.assertEqual(mock_update.call_count, 2)
+        self.assertEqual(mock_store_payloads.call_count, 1)
+
+    @mock.patch(
+        "data_research.scripts."
+        "update_county_msa_meta.update_state_to_geo_meta"
+    )
+    @mock.patch(
+        "data_research.scripts."
+        "update_county_msa_meta.store_mortgage_payloads.run"
+    )
+    def test_run_rebuild_without_payloads(self, mock_store_payloads, _):
+        run_update(store_payloads=False)
+        mock_store_payloads.assert_not_called()
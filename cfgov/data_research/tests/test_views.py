@@ -11,12 +11,15 @@ from data_research.models import (
     County,
     CountyMortgageData,
     MetroArea,
+    MortgageMetaData,
+    MortgagePayload,
     MSAMortgageData,
     NationalMortgageData,
     NonMSAMortgageData,
     State,
     StateMortgageData,
 )
+from data_research.scripts import store_mortgage_payloads
 from data_research.views import validate_year_month
 
 
@@ -502,3 +505,61 @@ class TimeseriesViewTests(django.test.TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "County is below display threshold")
+
+    def test_stored_payloads_match_computed_responses(self):
+        allowlist = MortgageMetaData.objects.get(name="allowlist")
+        allowlist.json_value = ["12", "12-non", "35840", "12081"]
+        allowlist.save()
+
+        urls = []
+        for days_late in ["30-89", "90"]:
+            urls.append(
+                reverse(
+                    "data_research_api_mortgage_timeseries_national",
+                    kwargs={"days_late": days_late},
+                )
+            )
+            for fips in allowlist.json_value:
+                urls.append(
+                    reverse(
+                        "data_research_api_mortgage_timeseries",
+                        kwargs={"fips": fips, "days_late": days_late},
+                    )
+                )
+            for geo in ["national", "states", "counties", "metros"]:
+                urls.append(
+                    reverse(
+                        "data_research_api_mortgage_mapdata",
+                        kwargs={
+                            "geo": geo,
+                            "days_late": days_late,
+                            "year_month": "2008-01",
+                        },
+                    )
+                )
+
+        computed = [self.client.get(url).content for url in urls]
+
+        store_mortgage_payloads.run()
+        self.assertEqual(MortgagePayload.objects.count(), len(urls))
+
+        with self.assertNumQueries(len(urls)):
+            stored = [self.client.get(url).content for url in urls]
+
+        self.assertEqual(stored, computed)
+
+    def test_stored_payload_response(self):
+        url = reverse(
+            "data_research_api_mortgage_timeseries_national",
+            kwargs={"days_late": "90"},
+        )
+        MortgagePayload.objects.create(
+            key="time-series/90/national", payload='{"stored": true}'
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json(), {"stored": True})
+
+        response = self.client.get(url, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, 406)
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class MegaMenuConfig(AppConfig):
     name = "mega_menu"
+
+    def ready(self):
+        from mega_menu.signals import register_signal_handlers
+
+        register_signal_handlers()
@@ -0,0 +1,30 @@
+from core import cache as core_cache
+
+
+CACHE_VERSION_KEY = "mega-menu-version"
+
+# Per-process cache of menu structures, keyed by language and site.
+_menu_structures = {}
+
+
+def get_cache_version():
+    return core_cache.get_cache_version(CACHE_VERSION_KEY)
+
+
+def invalidate_cache():
+    """Invalidate cached menus in all processes."""
+    core_cache.invalidate_cache_version(CACHE_VERSION_KEY)
+    _menu_structures.clear()
+
+
+def get_menu_structure(key, build):
+    """Return the cached menu structure for a key, calling build if needed."""
+    version = get_cache_version()
+
+    cached = _menu_structures.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    menu_structure = build()
+    _menu_structures[key] = (version, menu_structure)
+    return menu_structure
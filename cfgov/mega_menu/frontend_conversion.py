@@ -6,34 +6,36 @@ REGEX_REMOVE_QUERY_STRING = re.compile(r"\?.*$")
 
 
 class FrontendConverter:
+    """Convert a Menu into the format used by the frontend.
+
+    Conversion happens in two steps. get_menu_structure resolves the menu's
+    links into basic Python types, which only depend on the request's site,
+    and so can be reused across requests. select_menu_items then marks the
+    menu and link matching the current request as selected.
+    """
+
     def __init__(self, menu, request=None):
         self.menu = menu
         self.request = request
 
     def get_menu_items(self):
-        self._submenu_selected = False
-        self._link_selected = False
+        return self.select_menu_items(self.get_menu_structure())
 
+    def get_menu_structure(self):
         return [
             self._get_menu_item(submenu.value)
             for submenu in self.menu.submenus
         ]
 
     def _get_menu_item(self, submenu):
-        # Normally we want to mark menu links as selected if the current
-        # request is either on that link or one of its children; this lets us
-        # properly highlight the menu if on the child of a menu link. But we
-        # don't want to do this for overview links, which may be the parent
-        # of all links beneath them.
-        overview_link = self.make_link(
-            {
-                "page": submenu.get("overview_page"),
-                "text": submenu.get("title"),
-            },
-            selected_exact_only=True,
-        )
-
-        menu_item = {"overview": overview_link}
+        menu_item = {
+            "overview": self.make_link(
+                {
+                    "page": submenu.get("overview_page"),
+                    "text": submenu.get("title"),
+                }
+            )
+        }
 
         columns = self.get_columns(submenu)
         if columns:
@@ -47,26 +49,6 @@ class FrontendConverter:
         if other_links:
             menu_item["other_items"] = other_links
 
-        if not self._submenu_selected:
-            # If the current request either matches or is a child of this
-            # menu's links (overview, other, and columns, deliberately
-            # excluding featured), then we mark this menu as selected.
-            for link in chain(
-                [overview_link],
-                other_links,
-                *chain(column["nav_items"] for column in columns),
-            ):
-                url = link.get("url")
-                if url:
-                    url_no_query_string = REGEX_REMOVE_QUERY_STRING.sub(
-                        "", url
-                    )
-
-                    if self.request.path.startswith(url_no_query_string):
-                        menu_item["selected"] = True
-                        self._submenu_selected = True
-                        break
-
         return menu_item
 
     def get_columns(self, submenu):
@@ -94,16 +76,14 @@ class FrontendConverter:
     def make_links(self, values):
         return list(map(self.make_link, values)) if values else []
 
-    def make_link(self, value, selected_exact_only=False):
+    def make_link(self, value):
         page = value.get("page")
         text = value.get("text")
         icon = value.get("icon")
 
         if page:
-            url = page.get_url(request=self.request)
-
             link = {
-                "url": url,
+                "url": page.get_url(request=self.request),
                 "text": text or page.title,
             }
         else:
@@ -116,7 +96,85 @@ class FrontendConverter:
         if icon:
             link["icon"] = icon
 
-        if not self._link_selected:
+        return link
+
+    def select_menu_items(self, menu_structure):
+        """Return a copy of a menu structure with selected items marked.
+
+        The menu structure itself is left unmodified.
+        """
+        self._submenu_selected = False
+        self._link_selected = False
+
+        return [
+            self._select_menu_item(menu_item) for menu_item in menu_structure
+        ]
+
+    def _select_menu_item(self, menu_item):
+        menu_item = dict(menu_item)
+
+        # Normally we want to mark menu links as selected if the current
+        # request is either on that link or one of its children; this lets us
+        # properly highlight the menu if on the child of a menu link. But we
+        # don't want to do this for overview links, which may be the parent
+        # of all links beneath them.
+        overview_link = self._select_link(
+            menu_item["overview"], selected_exact_only=True
+        )
+        menu_item["overview"] = overview_link
+
+        columns = [
+            dict(
+                column,
+                nav_items=[
+                    self._select_link(link) for link in column["nav_items"]
+                ],
+            )
+            for column in menu_item.get("nav_groups", [])
+        ]
+        if columns:
+            menu_item["nav_groups"] = columns
+
+        if "featured_items" in menu_item:
+            menu_item["featured_items"] = [
+                self._select_link(link) for link in menu_item["featured_items"]
+            ]
+
+        other_links = [
+            self._select_link(link)
+            for link in menu_item.get("other_items", [])
+        ]
+        if other_links:
+            menu_item["other_items"] = other_links
+
+        if not self._submenu_selected and self.request is not None:
+            # If the current request either matches or is a child of this
+            # menu's links (overview, other, and columns, deliberately
+            # excluding featured), then we mark this menu as selected.
+            for link in chain(
+                [overview_link],
+                other_links,
+                *chain(column["nav_items"] for column in columns),
+            ):
+                url = link.get("url")
+                if url:
+                    url_no_query_string = REGEX_REMOVE_QUERY_STRING.sub(
+                        "", url
+                    )
+
+                    if self.request.path.startswith(url_no_query_string):
+                        menu_item["selected"] = True
+                        self._submenu_selected = True
+                        break
+
+        return menu_item
+
+    def _select_link(self, link, selected_exact_only=False):
+        link = dict(link)
+
+        if not self._link_selected and self.request is not None:
+            url = link.get("url")
+
             if selected_exact_only:
                 selected = url and self.request.path == url
             else:
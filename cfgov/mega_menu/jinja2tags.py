@@ -1,8 +1,12 @@
 from django.conf import settings
 
+from wagtail.core.models import Site
+
 from jinja2 import contextfunction
 from jinja2.ext import Extension
 
+from mega_menu.caching import get_menu_structure
+from mega_menu.frontend_conversion import FrontendConverter
 from mega_menu.models import Menu
 
 
@@ -27,12 +31,29 @@ def select_menu_for_context(context):
 
 
 def get_mega_menu_content(context):
-    menu = select_menu_for_context(context)
+    request = context.get("request")
+
+    def build_menu_structure():
+        menu = select_menu_for_context(context)
+
+        if not menu:
+            return None
+
+        return FrontendConverter(menu, request=request).get_menu_structure()
+
+    # Menu URLs depend on the request's site. Keying on the site rather than
+    # the host keeps the number of cached menus bounded, whatever hosts
+    # requests are made for.
+    site = Site.find_for_request(request)
+    cache_key = (context.get("language"), site.pk if site else None)
+    menu_structure = get_menu_structure(cache_key, build_menu_structure)
 
-    if not menu:
+    if menu_structure is None:
         return None
 
-    return menu.get_content_for_frontend(request=context.get("request"))
+    return FrontendConverter(None, request=request).select_menu_items(
+        menu_structure
+    )
 
 
 class MegaMenuExtension(Extension):
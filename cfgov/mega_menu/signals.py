@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.core.models import Site
+from wagtail.core.signals import (
+    page_published,
+    page_unpublished,
+    post_page_move,
+)
+
+from mega_menu.caching import invalidate_cache
+from mega_menu.models import Menu
+
+
+def invalidate_cached_menus(sender, **kwargs):
+    invalidate_cache()
+
+
+def register_signal_handlers():
+    # Menus include the URLs and titles of linked pages. Publishing or moving
+    # any page can change those, for example by changing a parent's slug.
+    post_save.connect(invalidate_cached_menus, sender=Menu)
+    post_delete.connect(invalidate_cached_menus, sender=Menu)
+    post_save.connect(invalidate_cached_menus, sender=Site)
+    post_delete.connect(invalidate_cached_menus, sender=Site)
+    page_published.connect(invalidate_cached_menus)
+    page_unpublished.connect(invalidate_cached_menus)
+    post_page_move.connect(invalidate_cached_menus)
@@ -1,7 +1,11 @@
 import json
 
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.text import slugify
 
+from wagtail.core.models import Page, Site
+
+from mega_menu.caching import _menu_structures, invalidate_cache
 from mega_menu.jinja2tags import get_mega_menu_content
 from mega_menu.models import Menu
 
@@ -58,5 +62,97 @@ class MegaMenuTests(TestCase):
 
     def test_renders_in_single_database_query(self):
         request = RequestFactory().get("/")
+
+        # Pages being served have already looked up their site.
+        Site.find_for_request(request)
+
         with self.assertNumQueries(1):
             get_mega_menu_content({"request": request})
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+)
+class MegaMenuCachingTests(TestCase):
+    def setUp(self):
+        invalidate_cache()
+
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.page = Page(title="Auto Loans", slug=slugify("Auto Loans"))
+        root_page.add_child(instance=self.page)
+
+        self.menu = Menu.objects.create(
+            language="en",
+            submenus=json.dumps(
+                [
+                    {
+                        "type": "submenu",
+                        "value": {
+                            "title": "English",
+                            "other_links": [{"page": self.page.pk}],
+                        },
+                    },
+                ]
+            ),
+        )
+
+    def get_content(self, path="/", **extra):
+        request = RequestFactory().get(path, **extra)
+
+        # Pages being served have already looked up their site.
+        Site.find_for_request(request)
+
+        return get_mega_menu_content({"request": request})
+
+    def test_menu_is_only_built_once(self):
+        self.get_content()
+
+        with self.assertNumQueries(0):
+            self.get_content()
+
+    @override_settings(ALLOWED_HOSTS=["*"])
+    def test_menu_is_cached_per_site_not_per_host(self):
+        self.get_content()
+        self.get_content(HTTP_HOST="other.example.com")
+        self.get_content(HTTP_HOST="another.example.com")
+
+        self.assertEqual(len(_menu_structures), 1)
+
+    def test_selection_is_per_request(self):
+        self.assertNotIn("selected", json.dumps(self.get_content("/")))
+
+        content = self.get_content("/auto-loans/")
+        self.assertTrue(content[0]["selected"])
+        self.assertTrue(content[0]["other_items"][0]["selected"])
+
+        self.assertNotIn("selected", json.dumps(self.get_content("/")))
+
+    def test_saving_menu_invalidates_cache(self):
+        self.get_content()
+        self.menu.submenus = json.dumps(
+            [{"type": "submenu", "value": {"title": "Changed"}}]
+        )
+        self.menu.save()
+
+        self.assertIn("Changed", json.dumps(self.get_content()))
+
+    def test_publishing_page_invalidates_cache(self):
+        self.get_content()
+        self.page.title = "Car Loans"
+        self.page.save_revision().publish()
+
+        self.assertIn("Car Loans", json.dumps(self.get_content()))
+
+    def test_moving_page_invalidates_cache(self):
+        self.get_content()
+        parent = Page(title="Parent", slug="parent")
+        Site.objects.get(is_default_site=True).root_page.add_child(
+            instance=parent
+        )
+        self.page.move(parent, pos="last-child")
+
+        self.assertIn("/parent/auto-loans/", json.dumps(self.get_content()))
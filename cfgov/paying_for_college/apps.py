@@ -5,3 +5,8 @@ from django.apps import AppConfig
 
 class PayingForCollegeConfig(AppConfig):
     name = "paying_for_college"
+
+    def ready(self):
+        from paying_for_college.signals import register_signal_handlers
+
+        register_signal_handlers()
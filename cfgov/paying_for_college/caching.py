@@ -0,0 +1,33 @@
+from urllib.parse import quote
+
+from django.core.cache import cache
+
+from core import cache as core_cache
+
+
+CACHE_VERSION_KEY = "paying-for-college-version"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_cache_version():
+    return core_cache.get_cache_version(CACHE_VERSION_KEY)
+
+
+def invalidate_cache():
+    """Invalidate all cached API payloads by starting a new cache version."""
+    core_cache.invalidate_cache_version(CACHE_VERSION_KEY)
+
+
+def get_cache_key(name, identifier):
+    return "paying-for-college-{}-{}-{}".format(
+        get_cache_version(), name, quote(identifier)
+    )
+
+
+def get_cached_payload(name, identifier):
+    """Return a cached API payload, or None if there isn't one."""
+    return cache.get(get_cache_key(name, identifier))
+
+
+def set_cached_payload(name, identifier, payload):
+    cache.set(get_cache_key(name, identifier), payload, CACHE_TIMEOUT)
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+
+from paying_for_college.caching import invalidate_cache
+from paying_for_college.models import Alias, Nickname, Program, School
+
+
+def invalidate_cached_payloads(sender, **kwargs):
+    invalidate_cache()
+
+
+def register_signal_handlers():
+    # School payloads include their aliases, nicknames and programs.
+    for model in (School, Program, Alias, Nickname):
+        post_save.connect(invalidate_cached_payloads, sender=model)
+        post_delete.connect(invalidate_cached_payloads, sender=model)
@@ -5,10 +5,17 @@ from decimal import Decimal
 from unittest import mock
 
 import django
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 
 from model_bakery import baker
 
+from paying_for_college.caching import (
+    CACHE_VERSION_KEY,
+    get_cache_version,
+    invalidate_cache,
+)
 from paying_for_college.models import (
     ConstantCap,
     ConstantRate,
@@ -306,6 +313,107 @@ class APITests(django.test.TestCase):
         self.assertIn(b"Error", resp5.content)
 
 
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+)
+class APICacheTests(django.test.TestCase):
+    fixtures = [
+        "test_fixture.json",
+        "test_constants.json",
+        "test_program.json",
+    ]
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    def test_cached_payloads_need_no_queries(self):
+        urls = [
+            reverse(
+                "paying_for_college:disclosures:school-json", args=["155317"]
+            ),
+            reverse(
+                "paying_for_college:disclosures:program-json",
+                args=["408039_981"],
+            ),
+        ]
+        responses = [self.client.get(url).content for url in urls]
+
+        with self.assertNumQueries(0):
+            cached_responses = [self.client.get(url).content for url in urls]
+
+        self.assertEqual(cached_responses, responses)
+
+    def test_cached_stats_only_look_up_school_and_program(self):
+        url = reverse(
+            "paying_for_college:disclosures:national-stats-json",
+            args=["408039_981"],
+        )
+        response = self.client.get(url).content
+
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).content, response)
+
+    @mock.patch("paying_for_college.views.set_cached_payload")
+    def test_stats_without_school_are_not_cached(self, set_cached_payload):
+        url = reverse(
+            "paying_for_college:disclosures:national-stats-json",
+            args=["000000_981"],
+        )
+        self.assertIn(b"nationalSalary", self.client.get(url).content)
+        set_cached_payload.assert_not_called()
+
+    def test_stats_are_cached_by_school_and_program_found(self):
+        self.client.get(
+            reverse(
+                "paying_for_college:disclosures:national-stats-json",
+                args=["408039_981"],
+            )
+        )
+        with mock.patch(
+            "paying_for_college.views.set_cached_payload"
+        ) as set_cached_payload:
+            self.client.get(
+                reverse(
+                    "paying_for_college:disclosures:national-stats-json",
+                    args=["0408039_981"],
+                )
+            )
+        set_cached_payload.assert_not_called()
+
+    def test_invalidating_starts_a_new_version(self):
+        version = get_cache_version()
+        invalidate_cache()
+        self.assertIsNone(cache.get(CACHE_VERSION_KEY))
+        self.assertNotEqual(get_cache_version(), version)
+
+    def test_saving_school_invalidates_payloads(self):
+        url = reverse(
+            "paying_for_college:disclosures:school-json", args=["155317"]
+        )
+        self.client.get(url)
+
+        school = School.objects.get(pk=155317)
+        school.city = "Lawrenceville"
+        school.save()
+
+        self.assertIn(b"Lawrenceville", self.client.get(url).content)
+
+    def test_errors_are_not_cached(self):
+        url = reverse(
+            "paying_for_college:disclosures:program-json", args=["408039_000"]
+        )
+        self.assertEqual(self.client.get(url).status_code, 400)
+        program = Program.objects.get(program_code="981")
+        program.pk = None
+        program.program_code = "000"
+        program.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
 class VerifyViewTest(django.test.TestCase):
     fixtures = ["test_fixture.json"]
     post_data = {
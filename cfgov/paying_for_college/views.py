@@ -13,6 +13,7 @@ from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.views.generic import TemplateView, View
 
+from paying_for_college.caching import get_cached_payload, set_cached_payload
 from paying_for_college.disclosures.scripts import nat_stats
 from paying_for_college.models import (
     ConstantCap,
@@ -197,8 +198,11 @@ class SchoolRepresentation(View):
         return get_object_or_404(School, pk=school_id)
 
     def get(self, request, school_id, **kwargs):
-        school = self.get_school(school_id)
-        return HttpResponse(school.as_json(), content_type="application/json")
+        payload = get_cached_payload("school", school_id)
+        if payload is None:
+            payload = self.get_school(school_id).as_json()
+            set_cached_payload("school", school_id, payload)
+        return HttpResponse(payload, content_type="application/json")
 
 
 class ProgramRepresentation(View):
@@ -219,18 +223,21 @@ class ProgramRepresentation(View):
         PID = ids[1]
         if not validate_pid(PID):
             return HttpResponseBadRequest("Error: Invalid program ID")
-        if not get_school(ids[0]):
-            return HttpResponseBadRequest("Error: No school found")
-        program = self.get_program(program_code)
-        if not program:
-            p_error = "Error: No program found"
-            return HttpResponseBadRequest(p_error)
-        return HttpResponse(program.as_json(), content_type="application/json")
+        payload = get_cached_payload("program", program_code)
+        if payload is None:
+            if not get_school(ids[0]):
+                return HttpResponseBadRequest("Error: No school found")
+            program = self.get_program(program_code)
+            if not program:
+                p_error = "Error: No program found"
+                return HttpResponseBadRequest(p_error)
+            payload = program.as_json()
+            set_cached_payload("program", program_code, payload)
+        return HttpResponse(payload, content_type="application/json")
 
 
 class StatsRepresentation(View):
-    def get_stats(self, school, programID):
-        program = get_program(school, programID)
+    def get_stats(self, school, program):
         national_stats = nat_stats.get_prepped_stats(
             program_length=get_program_length(program, school)
         )
@@ -243,7 +250,25 @@ class StatsRepresentation(View):
             program_id = id_pair.split("_")[1]
         except Exception:
             program_id = None
-        stats = self.get_stats(school, program_id)
+        program = get_program(school, program_id)
+
+        # Stats without a school are not cached, so that arbitrary IDs can't
+        # fill the cache. Otherwise they depend only on the school and
+        # program that were found, whatever the requested ID looked like.
+        if school is None:
+            return HttpResponse(
+                self.get_stats(school, program),
+                content_type="application/json",
+            )
+
+        cache_id = str(school.pk)
+        if program is not None:
+            cache_id += "_" + program.program_code
+
+        stats = get_cached_payload("stats", cache_id)
+        if stats is None:
+            stats = self.get_stats(school, program)
+            set_cached_payload("stats", cache_id, stats)
         return HttpResponse(stats, content_type="application/json")
 
 
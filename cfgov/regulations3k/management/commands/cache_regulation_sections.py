@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from regulations3k.models import RegulationPage, Section
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the sections of each regulation's current effective version "
+        "so that section pages are served from the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all-versions",
+            action="store_true",
+            help="Also render previous and future non-draft versions",
+        )
+
+    def handle(self, *args, **options):
+        rendered = 0
+        pages = RegulationPage.objects.live().filter(regulation__isnull=False)
+
+        for page in pages.select_related("regulation"):
+            versions = []
+            current_version = page.regulation.effective_version
+            if current_version is not None:
+                versions.append((current_version, None))
+
+            if options["all_versions"]:
+                versions.extend(
+                    (version, str(version.effective_date))
+                    for version in page.regulation.versions.filter(draft=False)
+                )
+
+            for version, date_str in versions:
+                sections = Section.objects.filter(subpart__version=version)
+                for section in sections:
+                    page.render_section(section, version, date_str=date_str)
+                    rendered += 1
+
+        self.stdout.write(f"Rendered {rendered} regulation sections")
@@ -1,10 +1,13 @@
 import logging
 
-from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 from regulations3k.documents import SectionParagraphDocument
-from regulations3k.models import Part, Section
+from regulations3k.models import Part, Section, SectionParagraph
+from search.elasticsearch_helpers import (
+    rebuild_index_with_alias,
+    update_documents_with_retries,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -12,51 +15,86 @@ logger = logging.getLogger(__name__)
 
 def _run_elasticsearch_rebuild():
     """Rebuild the Elasticsearch index after prepping section paragraphs."""
-    call_command(
-        "opensearch",
-        "index",
-        "--force",
-        "rebuild",
-        SectionParagraphDocument.Index.name,
-    )
-    call_command(
-        "opensearch",
-        "document",
-        "--force",
-        "--refresh",
-        "-i",
-        SectionParagraphDocument.Index.name,
-    )
+    rebuild_index_with_alias(SectionParagraphDocument)
+
+
+def _update_elasticsearch(updated_paragraphs, deleted_paragraph_ids):
+    """Reindex only the section paragraphs that have changed."""
+    if updated_paragraphs:
+        update_documents_with_retries(
+            SectionParagraphDocument,
+            SectionParagraph.objects.filter(
+                pk__in=[graph.pk for graph in updated_paragraphs]
+            ).select_related("section__subpart__version__part"),
+            "index",
+            retries=3,
+            delay=1,
+        )
+
+    if deleted_paragraph_ids:
+        update_documents_with_retries(
+            SectionParagraphDocument,
+            [SectionParagraph(pk=pk) for pk in deleted_paragraph_ids],
+            "delete",
+            retries=3,
+            delay=1,
+        )
 
 
 class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Extract paragraphs from sections even if they haven't "
+            "changed since they were last extracted",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Rebuild the whole index instead of updating only the "
+            "paragraphs that have changed",
+        )
+
     def handle(self, *args, **options):
-        """Extract paragraphs and run `search_index` Elasticsearch command."""
+        """Extract paragraphs and update the Elasticsearch index."""
         counter = {
             "created": 0,
+            "updated": 0,
             "deleted": 0,
             "kept": 0,
             "dupes": [],
         }
+        updated_paragraphs = []
+        deleted_paragraph_ids = []
+        extracted_sections = []
         regulations = Part.objects.all()
         versions = [
             part.effective_version
             for part in regulations
             if part.effective_version
         ]
-        sections = Section.objects.filter(subpart__version__in=versions)
+        sections = Section.objects.filter(
+            subpart__version__in=versions
+        ).select_related("subpart__version__part")
         for section in sections:
-            section_count = section.extract_graphs()
-            for key in ["created", "deleted", "kept"]:
+            section_count = section.extract_graphs(force=options["force"])
+            for key in ["created", "updated", "deleted", "kept"]:
                 counter[key] += section_count.get(key, 0)
             counter["dupes"] += section_count["dupes"]
+            updated_paragraphs += section_count["updated_paragraphs"]
+            deleted_paragraph_ids += section_count["deleted_paragraph_ids"]
+            if section_count["paragraphs_hash"]:
+                section.paragraphs_hash = section_count["paragraphs_hash"]
+                extracted_sections.append(section)
         dupes = sorted(set(counter["dupes"]))
         logger.info(
             "Section paragraphs have been extracted for {} regulations.\n"
-            "{} were created, {} were unchanged, {} were deleted, and "
-            "{} dupes were found".format(
+            "{} were created, {} were updated, {} were unchanged, "
+            "{} were deleted, and {} dupes were found".format(
                 regulations.count(),
                 counter["created"],
+                counter["updated"],
                 counter["kept"],
                 counter["deleted"],
                 len(dupes),
@@ -66,4 +104,23 @@ class Command(BaseCommand):
             logger.info(
                 "These paragraph IDs were dupes: \n{}".format("\n".join(dupes))
             )
-        _run_elasticsearch_rebuild()
+
+        if options["rebuild"] or not SectionParagraphDocument._index.exists():
+            _run_elasticsearch_rebuild()
+        else:
+            try:
+                _update_elasticsearch(
+                    updated_paragraphs, deleted_paragraph_ids
+                )
+            except Exception:
+                logger.exception(
+                    "Updating section paragraphs failed, rebuilding the index"
+                )
+                _run_elasticsearch_rebuild()
+
+        # Only record which sections have been extracted once their
+        # paragraphs are indexed, so that if indexing fails they are
+        # extracted and sent again next time.
+        Section.objects.bulk_update(
+            extracted_sections, ["paragraphs_hash"], batch_size=500
+        )
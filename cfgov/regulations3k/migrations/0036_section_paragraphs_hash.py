@@ -0,0 +1,18 @@
+# Generated by Django 3.2.17 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("regulations3k", "0035_heading_block_h5s"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="section",
+            name="paragraphs_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import re
 from datetime import date
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.html import strip_tags
@@ -15,6 +17,8 @@ from wagtail.contrib.frontend_cache.utils import PurgeBatch
 
 import regdown
 
+from core.cache import get_cache_version, invalidate_cache_version
+
 
 # Labels always require at least 1 alphanumeric character, then any number of
 # alphanumeric characters and hyphens.
@@ -26,6 +30,11 @@ validate_label = RegexValidator(
     "invalid",
 )
 
+# Data derived from the sections of an effective version, like their rendered
+# HTML, is cached under keys that include this version, so deleting it
+# invalidates everything cached for that effective version.
+SECTIONS_CACHE_VERSION_KEY = "regulation-sections-version-{}"
+
 
 def sortable_label(label, separator="-"):
     """Create a sortable tuple out of a label.
@@ -51,6 +60,40 @@ def sortable_label(label, separator="-"):
     return tuple(segments)
 
 
+def split_labeled_paragraphs(text):
+    """Split Regdown into a list of (label, text) labeled paragraphs.
+
+    Each paragraph's text includes its label and all lines up to the next
+    label. Any text before the first label is left out.
+    """
+    paragraphs = []
+    for line in text.splitlines(True):
+        match = regdown.LabeledParagraphProcessor.RE.search(line)
+        if match:
+            paragraphs.append((match.group("label"), [line]))
+        elif paragraphs:
+            paragraphs[-1][1].append(line)
+
+    return [(label, "".join(lines)) for label, lines in paragraphs]
+
+
+def get_sections_cache_version(effective_version_id):
+    return get_cache_version(
+        SECTIONS_CACHE_VERSION_KEY.format(effective_version_id)
+    )
+
+
+def invalidate_sections_cache(effective_version_id):
+    """Invalidate everything cached for the sections of an effective version.
+
+    Sections can include paragraphs from other sections of the same version,
+    so a change to any one of them invalidates all of them.
+    """
+    invalidate_cache_version(
+        SECTIONS_CACHE_VERSION_KEY.format(effective_version_id)
+    )
+
+
 class Part(models.Model):
     cfr_title_number = models.CharField(max_length=255)
     chapter = models.CharField(max_length=255)
@@ -206,13 +249,24 @@ class Subpart(models.Model):
 
     @property
     def section_range(self):
-        if self.subpart_type != Subpart.BODY or not self.sections.exists():
+        if self.subpart_type != Subpart.BODY:
             return ""
 
-        sections = self.sections.all()
-        return "{}–{}".format(
-            sections[0].numeric_label, sections.reverse()[0].numeric_label
-        )
+        # Use sections prefetched by get_section_outline, if there are any.
+        if "sections" in getattr(self, "_prefetched_objects_cache", {}):
+            sections = list(self.sections.all())
+            if not sections:
+                return ""
+
+            first, last = sections[0], sections[-1]
+        else:
+            if not self.sections.exists():
+                return ""
+
+            sections = self.sections.all()
+            first, last = sections[0], sections.reverse()[0]
+
+        return "{}–{}".format(first.numeric_label, last.numeric_label)
 
     class Meta:
         ordering = ["subpart_type", "label"]
@@ -232,6 +286,11 @@ class Section(models.Model):
         Subpart, on_delete=models.CASCADE, related_name="sections"
     )
     sortable_label = models.CharField(max_length=255)
+    # A hash of what the section's paragraphs were last extracted and
+    # indexed from; see get_paragraphs_hash.
+    paragraphs_hash = models.CharField(
+        max_length=64, blank=True, editable=False
+    )
 
     panels = [
         FieldPanel("label"),
@@ -253,49 +312,122 @@ class Section(models.Model):
     class Meta:
         ordering = ["sortable_label"]
 
-    def extract_graphs(self):
-        """Break out and store a section's paragraphs for indexing."""
+    def get_paragraphs_hash(self):
+        """Hash everything that the section's indexed paragraphs include.
+
+        That is the section's contents, and also the section and regulation
+        fields that are copied into each paragraph's search document.
+        """
+        version = self.subpart.version
+        values = [
+            self.contents,
+            self.label,
+            self.title,
+            self.sortable_label,
+            str(version.effective_date),
+            version.part.part_number,
+            version.part.short_name,
+        ]
+        return hashlib.sha256("\0".join(values).encode()).hexdigest()
+
+    def extract_graphs(self, force=False):
+        """Break out and store a section's paragraphs for indexing.
+
+        Paragraphs are only extracted if get_paragraphs_hash has changed
+        since paragraphs_hash was last recorded, unless force is True. All
+        of the paragraphs of an extracted section are returned as
+        "updated_paragraphs", and the IDs of deleted paragraphs as
+        "deleted_paragraph_ids", so that only those can be reindexed.
+
+        The new hash is returned as "paragraphs_hash" but isn't saved, so
+        that callers can record it once the paragraphs have been indexed.
+        """
         part = self.subpart.version.part
         section_tag = "{}-{}".format(part.part_number, self.label)
-        extractor = regdown.extract_labeled_paragraph
-        paragraph_ids = re.findall(r"[^{]*{(?P<label>[\w\-]+)}", self.contents)
-        created = 0
-        deleted = 0
-        kept = 0
-        exclude_from_deletion = []
-        known_ids = []
-        dupes = []
-        for pid in paragraph_ids:
-            raw_graph = extractor(pid, self.contents, exact=True)
-            markup_graph = regdown.regdown(raw_graph)
-            index_graph = strip_tags(markup_graph).strip()
-            full_id = "{}-{}".format(section_tag, pid)
-            graph, cr = SectionParagraph.objects.get_or_create(
-                paragraph=index_graph, paragraph_id=pid, section=self
-            )
-            if cr:
-                created += 1
+        counts = {
+            "section": section_tag,
+            "created": 0,
+            "updated": 0,
+            "deleted": 0,
+            "kept": 0,
+            "dupes": [],
+            "updated_paragraphs": [],
+            "deleted_paragraph_ids": [],
+            "paragraphs_hash": None,
+        }
+
+        paragraphs_hash = self.get_paragraphs_hash()
+        existing = list(self.paragraphs.order_by("pk"))
+        if not force and existing and paragraphs_hash == self.paragraphs_hash:
+            counts["kept"] = len(existing)
+            return counts
+
+        # A paragraph's text is that of the first paragraph with its label,
+        # including any that immediately repeat it, like
+        # regdown.extract_labeled_paragraph with exact=True.
+        raw_graphs = {}
+        run_label = None
+        for label, text in split_labeled_paragraphs(self.contents):
+            if label == run_label:
+                raw_graphs[label] += text
+            elif label in raw_graphs:
+                counts["dupes"].append("{}-{}".format(section_tag, label))
+                run_label = None
             else:
-                if full_id in known_ids:
-                    dupes.append(full_id)
-                else:
-                    known_ids.append(full_id)
-                    kept += 1
-            exclude_from_deletion.append(graph.pk)
+                raw_graphs[label] = text
+                run_label = label
+
+        existing_by_id = {}
+        for graph in existing:
+            existing_by_id.setdefault(graph.paragraph_id, graph)
+
+        to_create = []
+        to_update = []
+        to_keep = []
+        for pid, raw_graph in raw_graphs.items():
+            index_graph = strip_tags(regdown.regdown(raw_graph)).strip()
+            graph = existing_by_id.get(pid)
+            if graph is None:
+                to_create.append(
+                    SectionParagraph(
+                        paragraph=index_graph, paragraph_id=pid, section=self
+                    )
+                )
+                continue
+
+            if graph.paragraph != index_graph:
+                graph.paragraph = index_graph
+                to_update.append(graph)
+            else:
+                to_keep.append(graph)
+
+        SectionParagraph.objects.bulk_update(to_update, ["paragraph"])
+        created = SectionParagraph.objects.bulk_create(to_create)
+        keep_pks = [graph.pk for graph in to_keep + to_update + created]
+
+        # Paragraphs of this section in other versions of the regulation are
+        # deleted too, so that only one version is indexed.
         to_delete = SectionParagraph.objects.filter(
             section__subpart__version__part=part, section__label=self.label
-        ).exclude(pk__in=exclude_from_deletion)
-        deleted += to_delete.count()
-        for graph in to_delete:
-            graph.delete()
-        dupes = sorted(set(dupes))
-        return {
-            "section": section_tag,
-            "created": created,
-            "deleted": deleted,
-            "kept": kept,
-            "dupes": dupes,
-        }
+        ).exclude(pk__in=keep_pks)
+        deleted_ids = list(to_delete.values_list("pk", flat=True))
+        SectionParagraph.objects.filter(pk__in=deleted_ids).delete()
+
+        counts.update(
+            {
+                "created": len(created),
+                "updated": len(to_update),
+                "deleted": len(deleted_ids),
+                "kept": len(to_keep),
+                "dupes": sorted(set(counts["dupes"])),
+                # Fields copied from the section or regulation may have
+                # changed, so every paragraph of the section is reindexed.
+                "updated_paragraphs": to_keep + to_update + created,
+                "deleted_paragraph_ids": deleted_ids,
+                "paragraphs_hash": paragraphs_hash,
+            }
+        )
+        return counts
 
     def validate_unique(self, *args, **kwargs):
         super().validate_unique(*args, **kwargs)
@@ -336,6 +468,50 @@ class Section(models.Model):
             return self.title
 
 
+def get_section_outline(effective_version):
+    """Return the sections of an effective version without their contents.
+
+    This is enough to list and link to sections, as in the navigation of a
+    RegulationPage. Each section's subpart, version, and part are loaded
+    with it, and subparts have their sections prefetched, so none of these
+    require further queries. Outlines are cached until any section or
+    subpart of the effective version changes.
+    """
+    cache_key = "regulation-section-outline-{}-{}".format(
+        get_sections_cache_version(effective_version.pk),
+        effective_version.pk,
+    )
+    sections = cache.get(cache_key)
+
+    if sections is None:
+        subparts = (
+            Subpart.objects.filter(version=effective_version)
+            .select_related("version__part")
+            .prefetch_related(
+                models.Prefetch(
+                    "sections", queryset=Section.objects.defer("contents")
+                )
+            )
+        )
+        sections_by_pk = {
+            section.pk: section
+            for subpart in subparts
+            for section in subpart.sections.all()
+        }
+
+        # Keep the sections in the order that the database sorts them in.
+        sections = [
+            sections_by_pk[pk]
+            for pk in Section.objects.filter(
+                subpart__version=effective_version
+            ).values_list("pk", flat=True)
+            if pk in sections_by_pk
+        ]
+        cache.set(cache_key, sections)
+
+    return sections
+
+
 class SectionParagraph(models.Model):
     """Provide storage for section paragraphs."""
 
@@ -351,9 +527,17 @@ class SectionParagraph(models.Model):
         )
 
 
+@receiver(post_save, sender=Part)
+def part_saved(sender, instance, **kwargs):
+    for version_id in instance.versions.values_list("pk", flat=True):
+        invalidate_sections_cache(version_id)
+
+
 @receiver(post_save, sender=EffectiveVersion)
 def effective_version_saved(sender, instance, **kwargs):
     """Invalidate the cache if the effective_version is not a draft"""
+    invalidate_sections_cache(instance.pk)
+
     if not instance.draft:
         batch = PurgeBatch()
         for page in instance.part.page.all():
@@ -362,8 +546,16 @@ def effective_version_saved(sender, instance, **kwargs):
         batch.purge()
 
 
+@receiver(post_save, sender=Subpart)
+@receiver(post_delete, sender=Subpart)
+def subpart_changed(sender, instance, **kwargs):
+    invalidate_sections_cache(instance.version_id)
+
+
 @receiver(post_save, sender=Section)
 def section_saved(sender, instance, **kwargs):
+    invalidate_sections_cache(instance.subpart.version_id)
+
     if not instance.subpart.version.draft:
         batch = PurgeBatch()
         for page in instance.subpart.version.part.page.all():
@@ -372,3 +564,8 @@ def section_saved(sender, instance, **kwargs):
             )
             batch.add_urls(urls)
         batch.purge()
+
+
+@receiver(post_delete, sender=Section)
+def section_deleted(sender, instance, **kwargs):
+    invalidate_sections_cache(instance.subpart.version_id)
@@ -6,8 +6,9 @@ from datetime import date
 from functools import partial
 from urllib.parse import urljoin
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.core.paginator import InvalidPage, Paginator
+from django.core.paginator import InvalidPage
 from django.db import models
 from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import redirect
@@ -26,6 +27,7 @@ from wagtailsharing.models import ShareableRoutablePageMixin
 
 import requests
 from jinja2 import Markup
+from opensearch_dsl import A
 from regdown import regdown
 
 from ask_cfpb.models.pages import SecondaryNavigationJSMixin
@@ -33,7 +35,12 @@ from regulations3k.blocks import RegulationsListingFullWidthText
 from regulations3k.documents import SectionParagraphDocument
 from regulations3k.forms import SearchForm
 from regulations3k.models import Part, Section, label_re_str
+from regulations3k.models.django import (
+    get_section_outline,
+    get_sections_cache_version,
+)
 from regulations3k.resolver import get_contents_resolver, get_url_resolver
+from search.elasticsearch_helpers import SearchPaginator
 from v1.atomic_elements import molecules, organisms
 from v1.models import CFGOVPage
 
@@ -55,6 +62,11 @@ class RegulationsSearchPage(RoutablePageMixin, CFGOVPage):
         ]
     )
 
+    # The per-regulation result counts come from a terms aggregation, and
+    # any regulation left out of its buckets is shown with no results.
+    # Request a bucket for every regulation part, not just the default 10.
+    max_parts = 1000
+
     def get_template(self, request):
         template = "regulations3k/search-regulations.html"
         if "partial" in request.GET:
@@ -91,29 +103,55 @@ class RegulationsSearchPage(RoutablePageMixin, CFGOVPage):
         search = SectionParagraphDocument.search().query(
             "match", text={"query": search_query, "operator": "AND"}
         )
+
+        # Count the matches in each regulation with a single aggregation.
+        # Selected regulations are applied as a post filter, which limits
+        # the hits but not the aggregation, so the counts always cover all
+        # regulations.
+        search.aggs.bucket(
+            "parts", A("terms", field="part", size=self.max_parts)
+        )
+        if regs:
+            search = search.post_filter("terms", part=regs)
+        if order == "regulation":
+            search = search.sort("part", "section_order")
         search = search.highlight(
             "text", pre_tags="<strong>", post_tags="</strong>"
         )
-        total_results = search.count()
+
+        # Only the page of results being shown is requested and highlighted,
+        # along with the total count and the aggregation.
+        num_results = validate_num_results(request)
+        paginator = SearchPaginator(
+            search,
+            num_results,
+            results_factory=lambda search: search.execute(),
+        )
+        page_number = validate_page_number(request, paginator)
+        response = paginator.page(page_number).object_list
+
+        part_counts = {
+            bucket.key: bucket.doc_count
+            for bucket in response.aggregations.parts.buckets
+        }
         all_regs = [
             {
                 "short_name": reg.short_name,
                 "id": reg.part_number,
-                "num_results": search.filter(
-                    "term", part=reg.part_number
-                ).count(),
+                "num_results": part_counts.get(reg.part_number, 0),
                 "selected": reg.part_number in regs,
             }
             for reg in all_regs
         ]
-        payload.update({"all_regs": all_regs, "total_count": total_results})
-        if regs:
-            search = search.filter("terms", part=regs)
-        if order == "regulation":
-            search = search.sort("part", "section_order")
-        search = search[0:total_results]
-        response = search.execute()
-        for hit in response[0:total_results]:
+        payload.update(
+            {
+                "all_regs": all_regs,
+                "total_count": sum(part_counts.values()),
+                "current_count": paginator.count,
+            }
+        )
+        parent_url = self.get_parent().specific.url
+        for hit in response:
             try:
                 snippet = Markup("".join(hit.meta.highlight.text[0]))
             except TypeError as e:
@@ -130,7 +168,7 @@ class RegulationsSearchPage(RoutablePageMixin, CFGOVPage):
                 "label": hit.title,
                 "snippet": snippet,
                 "url": "{}{}/{}/#{}".format(
-                    self.get_parent().specific.url,
+                    parent_url,
                     hit.part,
                     hit.section_label.lower(),
                     hit.paragraph_id,
@@ -138,13 +176,8 @@ class RegulationsSearchPage(RoutablePageMixin, CFGOVPage):
             }
             payload["results"].append(hit_payload)
 
-        payload.update({"current_count": search.count()})
         self.results = payload
         context = self.get_context(request)
-        num_results = validate_num_results(request)
-        paginator = Paginator(payload["results"], num_results)
-        page_number = validate_page_number(request, paginator)
-        paginated_page = paginator.page(page_number)
         context.update(
             {
                 "current_count": payload["current_count"],
@@ -153,7 +186,7 @@ class RegulationsSearchPage(RoutablePageMixin, CFGOVPage):
                 "current_page": page_number,
                 "num_results": num_results,
                 "order": order,
-                "results": paginated_page,
+                "results": payload["results"],
                 "show_filters": any(
                     reg["selected"] is True for reg in payload["all_regs"]
                 ),
@@ -391,8 +424,8 @@ class RegulationPage(
             )
             yield version_url
             yield versions_url
-            for section in sections.all():
-                yield urljoin(version_url, section.label) + "/"
+            for label in sections.values_list("label", flat=True):
+                yield urljoin(version_url, label) + "/"
 
     def render_interp(self, context, raw_contents, **kwargs):
         template = get_template("regulations3k/inline_interps.html")
@@ -411,6 +444,37 @@ class RegulationPage(
 
         return template.render(context)
 
+    def render_section(self, section, effective_version, date_str=None):
+        """Render a section's contents to HTML.
+
+        Rendering resolves references to, and includes interpretations from,
+        other sections of the effective version, so the result is cached
+        until any section of that version is saved or deleted.
+        """
+        cache_key = "regulation-section-html-{}-{}-{}-{}".format(
+            get_sections_cache_version(effective_version.pk),
+            self.pk,
+            section.pk,
+            date_str or "current",
+        )
+
+        # Links in the HTML point to this page, so it can't be reused if the
+        # page has moved since it was rendered.
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == self.url:
+            return cached[1]
+
+        content = regdown(
+            section.contents,
+            url_resolver=get_url_resolver(self, date_str=date_str),
+            contents_resolver=get_contents_resolver(effective_version),
+            render_block_reference=partial(
+                self.render_interp, {"regulation": self.regulation}
+            ),
+        )
+        cache.set(cache_key, (self.url, content))
+        return content
+
     @route(r"^(?:(?P<date_str>[0-9]{4}-[0-9]{2}-[0-9]{2})/)?$", name="index")
     def index_route(self, request, date_str=None):
         request.is_preview = getattr(request, "is_preview", False)
@@ -418,10 +482,7 @@ class RegulationPage(
         effective_version = self.get_effective_version(
             request, date_str=date_str
         )
-        section_query = self.get_section_query(
-            effective_version=effective_version
-        )
-        sections = list(section_query.all())
+        sections = get_section_outline(effective_version)
 
         context = self.get_context(request)
         context.update(
@@ -446,15 +507,16 @@ class RegulationPage(
         name="versions",
     )
     def versions_page(self, request, section_label=None):
-        section_query = self.get_section_query(request=request)
-        sections = list(section_query.all())
+        sections = get_section_outline(self.get_effective_version(request))
         context = self.get_context(request, sections=sections)
 
         versions = [
             {
                 "effective_date": v.effective_date,
                 "date_str": str(v.effective_date),
-                "sections": self.get_section_query(effective_version=v).all(),
+                "sections": self.get_section_query(effective_version=v).defer(
+                    "contents"
+                ),
                 "draft": v.draft,
             }
             for v in self.get_versions_query(request).order_by(
@@ -514,17 +576,14 @@ class RegulationPage(
                 self.url + self.reverse_subpage("index", kwargs=kwargs)
             )
 
-        sections = list(section_query.all())
+        sections = get_section_outline(effective_version)
         current_index = sections.index(section)
         context = self.get_context(
             request, section, sections=sections, **kwargs
         )
 
-        content = regdown(
-            section.contents,
-            url_resolver=get_url_resolver(self, date_str=date_str),
-            contents_resolver=get_contents_resolver(effective_version),
-            render_block_reference=partial(self.render_interp, context),
+        content = self.render_section(
+            section, effective_version, date_str=date_str
         )
 
         next_section = get_next_section(sections, current_index)
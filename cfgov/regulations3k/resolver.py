@@ -1,31 +1,59 @@
 import re
+from collections import OrderedDict
+from threading import Lock
 
 from django.conf import settings
 
-from regdown import extract_labeled_paragraph
-
 from regulations3k.models import Section
+from regulations3k.models.django import (
+    get_sections_cache_version,
+    split_labeled_paragraphs,
+)
 
 
 DEFAULT_REGULATIONS_REFERENCE_MAPPING = [
     (r"(?P<section>[\w]+)-(?P<paragraph>[\w-]*)", "{section}", "{paragraph}"),
 ]
 
+# The number of effective versions whose paragraph indexes are kept in memory.
+PARAGRAPH_INDEX_CACHE_SIZE = 10
+
+# The reference mapping setting and its compiled regular expressions.
+_reference_mapping = (None, [])
+
+# Paragraph indexes by effective version ID, most recently used last.
+_paragraph_indexes = OrderedDict()
+_paragraph_indexes_lock = Lock()
+
+
+def get_reference_mapping():
+    """Return the reference mapping setting with compiled regexes."""
+    global _reference_mapping
 
-def resolve_reference(reference):
-    """Given a reference, return destination section and paragraph labels
-    This function uses the REGULATIONS_REFERENCE_MAPPING setting to resolve
-    references into their destination section and paragraph labels. It does
-    not containing that reference"""
     reference_mapping = getattr(
         settings,
         "REGULATIONS_REFERENCE_MAPPING",
         DEFAULT_REGULATIONS_REFERENCE_MAPPING,
     )
+    if _reference_mapping[0] is not reference_mapping:
+        _reference_mapping = (
+            reference_mapping,
+            [
+                (re.compile(reference_map[0]),) + tuple(reference_map[1:])
+                for reference_map in reference_mapping
+            ],
+        )
+
+    return _reference_mapping[1]
 
-    for reference_map in reference_mapping:
-        reference_re = re.compile(reference_map[0])
-        match = reference_re.match(reference)
+
+def resolve_reference(reference):
+    """Given a reference, return destination section and paragraph labels
+    This function uses the REGULATIONS_REFERENCE_MAPPING setting to resolve
+    references into their destination section and paragraph labels. It does
+    not containing that reference"""
+    for reference_map in get_reference_mapping():
+        match = reference_map[0].match(reference)
         if match:
             dest_section_label = reference_map[1].format(**match.groupdict())
             dest_paragraph_label = reference_map[2].format(**match.groupdict())
@@ -34,23 +62,84 @@ def resolve_reference(reference):
     return (None, None)
 
 
+class ParagraphIndex:
+    """The raw Regdown paragraphs of each section of an effective version.
+
+    Paragraphs are looked up the same way as extract_labeled_paragraph with
+    exact=False: by a label prefix, including the text of all consecutive
+    paragraphs whose labels begin with it. Lookups are remembered, so each
+    reference is only resolved once.
+    """
+
+    def __init__(self, sections):
+        self.sections = {
+            label: split_labeled_paragraphs(contents)
+            for label, contents in sections
+        }
+        self.resolved = {}
+
+    def get(self, section_label, paragraph_label):
+        key = (section_label, paragraph_label)
+        try:
+            return self.resolved[key]
+        except KeyError:
+            pass
+
+        paragraphs = self.sections.get(section_label, [])
+        contents = []
+        for label, text in paragraphs:
+            if label.startswith(paragraph_label):
+                contents.append(text)
+            elif contents:
+                break
+
+        self.resolved[key] = "".join(contents)
+        return self.resolved[key]
+
+
+def get_paragraph_index(effective_version):
+    """Return the paragraph index for an effective version.
+
+    Indexes are built with a single query and kept in memory until any
+    section of the effective version is saved or deleted.
+    """
+    cache_version = get_sections_cache_version(effective_version.pk)
+
+    with _paragraph_indexes_lock:
+        cached = _paragraph_indexes.get(effective_version.pk)
+        if cached is not None and cached[0] == cache_version:
+            _paragraph_indexes.move_to_end(effective_version.pk)
+            return cached[1]
+
+    index = ParagraphIndex(
+        Section.objects.filter(subpart__version=effective_version).values_list(
+            "label", "contents"
+        )
+    )
+
+    with _paragraph_indexes_lock:
+        _paragraph_indexes[effective_version.pk] = (cache_version, index)
+        _paragraph_indexes.move_to_end(effective_version.pk)
+        while len(_paragraph_indexes) > PARAGRAPH_INDEX_CACHE_SIZE:
+            _paragraph_indexes.popitem(last=False)
+
+    return index
+
+
 def get_contents_resolver(effective_version):
     """Return a Regdown contents_resolver function for the RegulationPage
     This constructs a contents_resolver that will resolve references and
     return their contents for all sections that are part of the current
     EffectiveVersion served by the given page."""
-    section_query = Section.objects.filter(subpart__version=effective_version)
+    index = None
 
     def contents_resolver(reference):
+        nonlocal index
+        if index is None:
+            index = get_paragraph_index(effective_version)
+
         dest_section_label, dest_paragraph_label = resolve_reference(reference)
-        try:
-            dest_section = section_query.get(label=dest_section_label)
-        except Section.DoesNotExist:
-            return ""
-        dest_paragraph = extract_labeled_paragraph(
-            dest_paragraph_label, dest_section.contents, exact=False
-        )
-        return dest_paragraph
+        return index.get(dest_section_label, dest_paragraph_label)
 
     return contents_resolver
 
@@ -1,9 +1,11 @@
 import datetime
 import unittest
+from io import StringIO
 from unittest import mock
 
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.core.paginator import Paginator
 from django.http import Http404, HttpRequest, QueryDict
 from django.test import RequestFactory
@@ -23,6 +25,7 @@ from regulations3k.models.django import (
     SectionParagraph,
     Subpart,
     effective_version_saved,
+    get_section_outline,
     section_saved,
     sortable_label,
     validate_label,
@@ -372,6 +375,134 @@ class RegModelTests(DjangoTestCase):
         self.assertIn("Official interpretation of A title", result)
         self.assertIn("some contents", result)
 
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-regulation-section-html",
+            },
+        }
+    )
+    def test_render_section_is_cached_until_section_saved(self):
+        html = self.reg_page.render_section(
+            self.section_num4, self.effective_version
+        )
+        self.assertIn("Regdown paragraph a.", html)
+
+        with mock.patch("regulations3k.models.pages.regdown") as regdown:
+            self.assertEqual(
+                self.reg_page.render_section(
+                    self.section_num4, self.effective_version
+                ),
+                html,
+            )
+            regdown.assert_not_called()
+
+        # Sections include interpretations from other sections, so saving
+        # any section of the version invalidates all of them.
+        self.section_interps.contents = "changed interp content."
+        self.section_interps.save()
+
+        with mock.patch(
+            "regulations3k.models.pages.regdown", return_value="rendered"
+        ) as regdown:
+            self.assertEqual(
+                self.reg_page.render_section(
+                    self.section_num4, self.effective_version
+                ),
+                "rendered",
+            )
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-regulation-section-html-dates",
+            },
+        }
+    )
+    def test_render_section_cached_per_date_str(self):
+        self.reg_page.render_section(self.section_num4, self.effective_version)
+        with mock.patch(
+            "regulations3k.models.pages.regdown", return_value="rendered"
+        ):
+            self.assertEqual(
+                self.reg_page.render_section(
+                    self.section_num4,
+                    self.effective_version,
+                    date_str="2014-01-18",
+                ),
+                "rendered",
+            )
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-cache-regulation-sections",
+            },
+        }
+    )
+    def test_cache_regulation_sections_command(self):
+        stdout = StringIO()
+        call_command("cache_regulation_sections", stdout=stdout)
+        self.assertIn("Rendered 5 regulation sections", stdout.getvalue())
+
+        with mock.patch("regulations3k.models.pages.regdown") as regdown:
+            response = self.client.get("/reg-landing/1002/4/")
+            self.assertEqual(response.status_code, 200)
+            regdown.assert_not_called()
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-regulation-section-outline",
+            },
+        }
+    )
+    def test_get_section_outline(self):
+        sections = get_section_outline(self.effective_version)
+        self.assertEqual(
+            sections,
+            list(
+                Section.objects.filter(subpart__version=self.effective_version)
+            ),
+        )
+        self.assertIn("contents", sections[0].get_deferred_fields())
+
+        with self.assertNumQueries(0):
+            sections = get_section_outline(self.effective_version)
+            request = self.get_request("/reg-landing/1002/4/")
+            nav_items, _ = get_secondary_nav_items(
+                request, self.reg_page, sections=sections
+            )
+            for subpart in nav_items:
+                subpart.section_range
+            for section in sections:
+                section.numeric_label
+
+        self.assertEqual(
+            sections[0].subpart.section_range,
+            "\xa7\xa01002.4\u2013\xa7\xa01002.15",
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-regulation-section-outline-invalidation",
+            },
+        }
+    )
+    def test_get_section_outline_invalidated_when_subpart_saved(self):
+        get_section_outline(self.effective_version)
+        self.subpart.title = "Subpart A - Changed"
+        self.subpart.save()
+
+        sections = get_section_outline(self.effective_version)
+        self.assertEqual(sections[0].subpart.title, "Subpart A - Changed")
+
     def test_section_ranges(self):
         self.assertEqual(self.subpart_orphan.section_range, "")
         self.assertEqual(self.subpart_appendices.section_range, "")
@@ -403,8 +534,7 @@ class RegModelTests(DjangoTestCase):
             self.section_beta.title_content, "Appendix B to Part 1002-Errata"
         )
 
-    @mock.patch.object(SectionParagraphDocument, "search")
-    def test_routable_search_page_calls_elasticsearch(self, mock_search):
+    def mock_search_response(self, mock_search, highlight=True):
         mock_hit = mock.Mock()
         mock_hit.text = (
             "i. Mortgage escrow accounts for collecting taxes",
@@ -417,64 +547,101 @@ class RegModelTests(DjangoTestCase):
         mock_hit.section_label = "Interp-2"
         mock_hit.short_name = "Regulation DD"
         mock_hit.paragraph_id = "2-a-Interp-2-i"
-        mock_hit.meta.highlight.text = ["<strong>Mortgage</strong> highlight"]
-        mock_search().query().highlight().filter().sort().__getitem__().execute.return_value = [  # noqa:
-            mock_hit
-        ]
-        mock_count = mock.Mock(return_value=1)
-        mock_search().query().highlight().count = mock_count
-        mock_search().query().highlight().filter().sort().__getitem__().count = (
-            mock_count
+        if highlight:
+            mock_hit.meta.highlight.text = [
+                "<strong>Mortgage</strong> highlight"
+            ]
+
+        mock_bucket = mock.Mock(key="1030", doc_count=1)
+        mock_response = mock.MagicMock()
+        mock_response.__iter__.return_value = [mock_hit]
+        mock_response.aggregations.parts.buckets = [mock_bucket]
+        mock_response.hits.total.value = 1
+
+        search = mock_search.return_value.query.return_value
+        search.post_filter().sort().highlight().__getitem__().extra().execute.return_value = (  # noqa: B950
+            mock_response
         )
-        response = self.client.get(
+        return search
+
+    def get_search_results(self, data=None):
+        return self.client.get(
             self.reg_search_page.url
             + self.reg_search_page.reverse_subpage("regulation_results_page"),
-            {
+            data
+            or {
                 "q": "mortgage",
                 "regs": "1030",
                 "order": "regulation",
                 "results": "50",
             },
         )
-        self.assertEqual(mock_search.call_count, 4)
+
+    @mock.patch.object(SectionParagraphDocument, "search")
+    def test_routable_search_page_calls_elasticsearch(self, mock_search):
+        self.mock_search_response(mock_search)
+        response = self.get_search_results()
+        self.assertEqual(mock_search.call_count, 1)
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context_data["page"].results["all_regs"],
+            [
+                {
+                    "short_name": "Regulation B",
+                    "id": "1002",
+                    "num_results": 0,
+                    "selected": False,
+                },
+                {
+                    "short_name": "Regulation DD",
+                    "id": "1030",
+                    "num_results": 1,
+                    "selected": True,
+                },
+            ],
+        )
 
     @mock.patch.object(SectionParagraphDocument, "search")
     def test_routable_search_page_handles_null_highlights(
         self, mock_search
     ):  # noqa: B950
-        mock_hit = mock.Mock()
-        mock_hit.text = (
-            "i. Mortgage escrow accounts for collecting",
-            " taxes and property insurance premiums.",
-        )
-        mock_hit.title = "Comment for 1030.2 - Definitions"
-        mock_hit.part = "1030"
-        mock_hit.date = datetime.datetime(2011, 12, 30, 0, 0)
-        mock_hit.section_order = "interp-0002"
-        mock_hit.section_label = "Interp-2"
-        mock_hit.short_name = "Regulation DD"
-        mock_hit.paragraph_id = "2-a-Interp-2-i"
-        mock_search().query().highlight().filter().sort().__getitem__().execute.return_value = [  # noqa: B950
-            mock_hit
-        ]
-        mock_count = mock.Mock(return_value=1)
-        mock_search().query().highlight().count = mock_count
-        mock_search().query().highlight().filter().sort().__getitem__().count = (
-            mock_count
-        )
-        response = self.client.get(
-            self.reg_search_page.url
-            + self.reg_search_page.reverse_subpage("regulation_results_page"),
+        self.mock_search_response(mock_search, highlight=False)
+        response = self.get_search_results()
+        self.assertEqual(mock_search.call_count, 1)
+        self.assertEqual(response.status_code, 200)
+
+    @mock.patch.object(SectionParagraphDocument, "search")
+    def test_search_requests_do_not_grow_with_number_of_regulations(
+        self, mock_search
+    ):
+        search = self.mock_search_response(mock_search)
+        search.reset_mock()
+        self.get_search_results()
+        requests_with_two_parts = search.method_calls
+
+        for part_number in range(2000, 2050):
+            baker.make(Part, part_number=str(part_number))
+
+        search.reset_mock()
+        self.get_search_results()
+        self.assertEqual(search.method_calls, requests_with_two_parts)
+        search.count.assert_not_called()
+        search.filter.assert_not_called()
+
+    @mock.patch.object(SectionParagraphDocument, "search")
+    def test_search_requests_only_one_page_of_results(self, mock_search):
+        search = self.mock_search_response(mock_search)
+        search = search.post_filter().sort().highlight()
+        self.get_search_results(
             {
                 "q": "mortgage",
                 "regs": "1030",
                 "order": "regulation",
                 "results": "50",
-            },
+                "page": "1",
+            }
         )
-        self.assertEqual(mock_search.call_count, 4)
-        self.assertEqual(response.status_code, 200)
+        search.__getitem__.assert_called_with(slice(0, 50))
 
     @mock.patch.object(SectionParagraphDocument, "search")
     def test_search_page_refuses_single_character_search_elasticsearch(
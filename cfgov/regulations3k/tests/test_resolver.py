@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import datetime
+import re
 
 from django.test import TestCase, override_settings
 
@@ -15,7 +16,10 @@ from regulations3k.models import (
     Subpart,
 )
 from regulations3k.resolver import (
+    ParagraphIndex,
     get_contents_resolver,
+    get_paragraph_index,
+    get_reference_mapping,
     get_url_resolver,
     resolve_reference,
 )
@@ -127,6 +131,61 @@ class ReferenceResolutionTestCase(TestCase):
             "Securities credit.</p>",
         )
 
+    def test_get_reference_mapping_compiles_once(self):
+        reference_mapping = get_reference_mapping()
+        self.assertIsInstance(reference_mapping[0][0], re.Pattern)
+        self.assertIs(get_reference_mapping(), reference_mapping)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-paragraph-index",
+            },
+        }
+    )
+    def test_contents_resolver_queries_once(self):
+        contents_resolver = get_contents_resolver(self.effective_version)
+        with self.assertNumQueries(1):
+            self.assertIn(
+                "Interpreting adverse action", contents_resolver("2-c-Interp")
+            )
+            self.assertEqual(contents_resolver("3-b-Interp"), "")
+
+        with self.assertNumQueries(0):
+            get_contents_resolver(self.effective_version)("2-c-Interp")
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-paragraph-index-invalidation",
+            },
+        }
+    )
+    def test_paragraph_index_invalidated_when_section_saved(self):
+        index = get_paragraph_index(self.effective_version)
+        self.assertIs(get_paragraph_index(self.effective_version), index)
+
+        self.section_interp2.contents = "{c-Interp}\nChanged\n"
+        self.section_interp2.save()
+
+        self.assertEqual(
+            get_paragraph_index(self.effective_version).get(
+                "Interp-2", "c-Interp"
+            ),
+            "{c-Interp}\nChanged\n",
+        )
+
+    def test_paragraph_index_matches_label_prefixes(self):
+        index = ParagraphIndex(
+            [("2", "Intro\n{a}\nA\n{a-1}\nA 1\n{b}\nB\n{a-2}\nA 2\n")]
+        )
+        self.assertEqual(index.get("2", "a"), "{a}\nA\n{a-1}\nA 1\n")
+        self.assertEqual(index.get("2", "a-2"), "{a-2}\nA 2\n")
+        self.assertEqual(index.get("2", "c"), "")
+        self.assertEqual(index.get("3", "a"), "")
+
     def test_get_url_resolver(self):
         url_resolver = get_url_resolver(self.reg_page)
         result = url_resolver("2-c-Interp")
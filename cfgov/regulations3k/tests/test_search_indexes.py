@@ -3,6 +3,7 @@ from unittest import mock
 from django.core.management import call_command
 from django.test import TestCase
 
+from regulations3k.documents import SectionParagraphDocument
 from regulations3k.management.commands import update_regulation_index
 from regulations3k.models import Section, SectionParagraph
 
@@ -24,18 +25,163 @@ class RegulationIndexTestCase(TestCase):
     def test_index_management_command(self, mock_elasticsearch):
         SectionParagraph.objects.all().delete()
         self.assertEqual(SectionParagraph.objects.count(), 0)
-        call_command("update_regulation_index")
+        call_command("update_regulation_index", "--rebuild")
         self.assertEqual(SectionParagraph.objects.count(), 113)
         self.assertEqual(mock_elasticsearch.call_count, 1)
 
+    @mock.patch.object(SectionParagraphDocument._index, "exists")
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._run_elasticsearch_rebuild"
+    )
+    def test_index_management_command_without_index(
+        self, mock_rebuild, mock_exists
+    ):
+        mock_exists.return_value = False
+        call_command("update_regulation_index")
+        self.assertEqual(mock_rebuild.call_count, 1)
+
+    @mock.patch.object(SectionParagraphDocument._index, "exists")
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._update_elasticsearch"
+    )
+    def test_index_management_command_updates_changes(
+        self, mock_update, mock_exists
+    ):
+        mock_exists.return_value = True
+        call_command("update_regulation_index")
+        updated_paragraphs, deleted_ids = mock_update.call_args[0]
+        self.assertEqual(len(updated_paragraphs), 113)
+        self.assertEqual(deleted_ids, [])
+
+        # Sections that haven't changed are skipped.
+        call_command("update_regulation_index")
+        mock_update.assert_called_with([], [])
+
+        section = Section.objects.order_by("pk").first()
+        graph = section.paragraphs.order_by("pk").first()
+        section.contents = section.contents.replace(
+            "{%s}" % graph.paragraph_id, "{changed}"
+        )
+        section.save()
+
+        call_command("update_regulation_index")
+        updated_paragraphs, deleted_ids = mock_update.call_args[0]
+        self.assertEqual(len(updated_paragraphs), 13)
+        self.assertIn(
+            "changed", [graph.paragraph_id for graph in updated_paragraphs]
+        )
+        self.assertEqual(deleted_ids, [graph.pk])
+
+    @mock.patch.object(SectionParagraphDocument._index, "exists")
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._update_elasticsearch"
+    )
+    def test_index_management_command_reindexes_changed_titles(
+        self, mock_update, mock_exists
+    ):
+        mock_exists.return_value = True
+        call_command("update_regulation_index")
+
+        section = Section.objects.order_by("pk").first()
+        section.title = "A new title"
+        section.save()
+
+        call_command("update_regulation_index")
+        updated_paragraphs, deleted_ids = mock_update.call_args[0]
+        self.assertEqual(
+            sorted(graph.pk for graph in updated_paragraphs),
+            sorted(section.paragraphs.values_list("pk", flat=True)),
+        )
+
+    @mock.patch.object(SectionParagraphDocument._index, "exists")
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._run_elasticsearch_rebuild"
+    )
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._update_elasticsearch"
+    )
+    def test_index_management_command_rebuilds_if_update_fails(
+        self, mock_update, mock_rebuild, mock_exists
+    ):
+        mock_exists.return_value = True
+        mock_update.side_effect = ConnectionError
+
+        with self.assertLogs(update_regulation_index.logger, "ERROR"):
+            call_command("update_regulation_index")
+
+        mock_rebuild.assert_called_once()
+        self.assertFalse(Section.objects.filter(paragraphs_hash="").exists())
+
+    @mock.patch.object(SectionParagraphDocument._index, "exists")
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index._run_elasticsearch_rebuild"
+    )
+    def test_index_management_command_failure_leaves_sections_unindexed(
+        self, mock_rebuild, mock_exists
+    ):
+        mock_exists.return_value = False
+        mock_rebuild.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            call_command("update_regulation_index")
+
+        self.assertFalse(Section.objects.exclude(paragraphs_hash="").exists())
+
+    @mock.patch(
+        "regulations3k.management.commands"
+        ".update_regulation_index.update_documents_with_retries"
+    )
+    def test_update_elasticsearch(self, mock_update):
+        graphs = list(SectionParagraph.objects.all()[:2])
+        update_regulation_index._update_elasticsearch(graphs, [123])
+
+        self.assertEqual(mock_update.call_count, 2)
+        indexed = mock_update.call_args_list[0][0]
+        self.assertEqual(indexed[0], SectionParagraphDocument)
+        self.assertEqual(
+            sorted(graph.pk for graph in indexed[1]),
+            sorted(graph.pk for graph in graphs),
+        )
+        self.assertEqual(indexed[2], "index")
+        deleted = mock_update.call_args_list[1][0]
+        self.assertEqual([graph.pk for graph in deleted[1]], [123])
+        self.assertEqual(deleted[2], "delete")
+
+    def test_extract_paragraphs_skips_unchanged_sections(self):
+        section = Section.objects.order_by("pk").first()
+        section.paragraphs_hash = section.get_paragraphs_hash()
+        counts = section.extract_graphs()
+        self.assertEqual(counts["kept"], 13)
+        self.assertEqual(counts["updated_paragraphs"], [])
+        self.assertIsNone(counts["paragraphs_hash"])
+
+        counts = section.extract_graphs(force=True)
+        self.assertEqual(counts["kept"], 13)
+        self.assertEqual(counts["created"], 0)
+        self.assertEqual(len(counts["updated_paragraphs"]), 13)
+        self.assertEqual(counts["paragraphs_hash"], section.paragraphs_hash)
+
+    def test_paragraphs_hash_covers_indexed_section_fields(self):
+        section = Section.objects.order_by("pk").first()
+        paragraphs_hash = section.get_paragraphs_hash()
+
+        section.sortable_label = "changed"
+        self.assertNotEqual(section.get_paragraphs_hash(), paragraphs_hash)
+
+        section = Section.objects.order_by("pk").first()
+        section.subpart.version.part.short_name = "changed"
+        self.assertNotEqual(section.get_paragraphs_hash(), paragraphs_hash)
+
     @mock.patch(
         "regulations3k.management.commands"
-        ".update_regulation_index.call_command"
+        ".update_regulation_index.rebuild_index_with_alias"
     )
-    def test_run_elasticsearch_rebuild(self, mock_call):
+    def test_run_elasticsearch_rebuild(self, mock_rebuild):
         update_regulation_index._run_elasticsearch_rebuild()
-        # django-opensearch-dsl splits the command to create indices and index
-        # documents into 2 separate commands. For this reason, we expect
-        # call_command to be invoked twice. This was done in a single command
-        # with django-elasticsearch-dsl.
-        self.assertEqual(mock_call.call_count, 2)
+        mock_rebuild.assert_called_once_with(SectionParagraphDocument)
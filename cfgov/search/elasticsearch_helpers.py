@@ -1,12 +1,21 @@
+import logging
 import os
 import re
 import socket
 import sys
+import time
+from collections import defaultdict
+from itertools import islice
 from unittest import SkipTest
 from unittest.mock import patch
 
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.management import call_command
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import Model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 
 from wagtail.core.models import Page
 from wagtail.core.signals import (
@@ -16,10 +25,18 @@ from wagtail.core.signals import (
     pre_page_move,
 )
 
+from django_opensearch_dsl.apps import DODConfig
+from django_opensearch_dsl.registries import registry
 from django_opensearch_dsl.signals import BaseSignalProcessor
 from opensearch_dsl import analyzer, token_filter, tokenizer
+from opensearchpy.exceptions import (
+    ConnectionError as OpenSearchConnectionError,
+)
+
+from search.models import IndexQueueItem, Synonym
+
 
-from search.models import Synonym
+logger = logging.getLogger(__name__)
 
 
 def strip_html(markup):
@@ -96,6 +113,84 @@ def environment_specific_index(base_name):
         return f"{env}-{base_name}".lower()
 
 
+class SearchPaginator(Paginator):
+    """Paginator that retrieves one page of search results at a time.
+
+    Django's Paginator expects a complete list of objects, which for search
+    results means fetching every hit just to display a few of them. This
+    paginator instead slices the search so that only the hits for the
+    requested page are retrieved, and gets the total hit count back from
+    the same request.
+
+    By default each page contains the hits themselves. Pass results_factory
+    to convert the executed search for a page into something else, for
+    example a Django queryset. Pass execute to control how the search for a
+    page is sent, for example to combine it with other searches.
+
+    OpenSearch can't page past index.max_result_window hits, so num_pages
+    only counts the pages within that window, and pages beyond it are
+    treated as empty rather than requested.
+    """
+
+    max_result_window = 10000
+
+    def __init__(
+        self, search, per_page, results_factory=None, execute=None, **kwargs
+    ):
+        super().__init__(search, per_page, **kwargs)
+        self.results_factory = results_factory
+        self.execute = execute or (lambda search: search.execute())
+        self._page_results = {}
+
+    def _fetch_page_results(self, number):
+        bottom = (number - 1) * self.per_page
+        search = self.object_list[bottom : bottom + self.per_page].extra(
+            track_total_hits=True
+        )
+        response = self.execute(search)
+
+        # Paginator.count is a cached property; seeding it here with the
+        # total from this response avoids a separate count request.
+        self.count = response.hits.total.value
+
+        if self.results_factory is not None:
+            results = self.results_factory(search)
+        else:
+            results = list(response)
+
+        self._page_results[number] = results
+
+    @cached_property
+    def num_pages(self):
+        last_reachable = max(1, self.max_result_window // self.per_page)
+        return min(Paginator.num_pages.func(self), last_reachable)
+
+    def _in_result_window(self, number):
+        return 0 < number * self.per_page <= self.max_result_window
+
+    def page(self, number):
+        try:
+            requested = int(number)
+        except (TypeError, ValueError):
+            requested = None
+
+        # Fetch the requested page before validating the page number, so
+        # that validation can use the total count that comes back with it.
+        if requested is not None and self._in_result_window(requested):
+            if requested not in self._page_results:
+                self._fetch_page_results(requested)
+
+        number = self.validate_number(number)
+
+        if not self._in_result_window(number):
+            raise EmptyPage(_("That page contains no results"))
+
+        if number not in self._page_results:
+            self._fetch_page_results(number)
+
+        return self._get_page(self._page_results[number], number, self)
+
+
 class ElasticsearchTestsMixin:
     """Test case mixin providing useful Elasticsearch functionality.
 
@@ -151,31 +246,13 @@ class ElasticsearchTestsMixin:
 
     @staticmethod
     def rebuild_elasticsearch_index(*indices, stdout=sys.stdout):
-        """Rebuild an Elasticsearch index, waiting for its completion.
+        """Rebuild Elasticsearch indexes, waiting for their completion.
 
-        This method is an alias for the built-in search_index Django management
-        command provided by django-opensearch-dsl.
+        This method is an alias for the rebuild_search_index Django management
+        command, which rebuilds all indexes if none are given.
 
         """
-        call_command(
-            "opensearch",
-            "index",
-            "rebuild",
-            *indices,
-            force=True,
-            stdout=stdout,
-        )
-        if indices:
-            indices = ("-i", *indices)
-        call_command(
-            "opensearch",
-            "document",
-            "index",
-            "--refresh",
-            *indices,
-            force=True,
-            stdout=stdout,
-        )
+        call_command("rebuild_search_index", *indices, stdout=stdout)
 
 
 class WagtailSignalProcessor(BaseSignalProcessor):
@@ -214,3 +291,316 @@ class WagtailSignalProcessor(BaseSignalProcessor):
         page_unpublished.disconnect(self.handle_delete)
         pre_page_move.disconnect(self.handle_delete)
         post_page_move.disconnect(self.handle_save)
+
+
+class QueuedWagtailSignalProcessor(WagtailSignalProcessor):
+    """Signal processor that queues Wagtail changes for indexing.
+
+    Instead of updating Elasticsearch while a page is being published,
+    unpublished, or moved, this signal processor records the page in the
+    search index queue. The process_search_index_queue management command
+    then sends queued changes to Elasticsearch in bulk.
+
+    Changes to models that aren't Wagtail pages are still indexed
+    immediately.
+    """
+
+    def queue(self, instance, action):
+        if DODConfig.autosync_enabled():
+            IndexQueueItem.objects.create(
+                page_id=instance.pk,
+                content_type_id=instance.content_type_id,
+                action=action,
+            )
+
+    def handle_delete(self, sender, instance, **kwargs):
+        if isinstance(instance, Page):
+            self.queue(instance, IndexQueueItem.DELETE)
+        else:
+            super().handle_delete(sender, instance, **kwargs)
+
+    def handle_save(self, sender, instance, **kwargs):
+        if isinstance(instance, Page):
+            self.queue(instance, IndexQueueItem.INDEX)
+        else:
+            super().handle_save(sender, instance, **kwargs)
+
+
+def update_documents_with_retries(document, objects, action, retries, delay):
+    """Update a document's index in bulk, retrying on failure.
+
+    Failed attempts are retried after an exponentially increasing delay.
+    The exception from the final attempt is raised.
+    """
+    kwargs = {}
+
+    # Match BaseSignalProcessor.handle_delete, which doesn't fail when
+    # deleting something that was never indexed.
+    if action == IndexQueueItem.DELETE:
+        kwargs["raise_on_error"] = False
+
+    for attempt in range(retries + 1):
+        try:
+            return document().update(objects, action, **kwargs)
+        except Exception:
+            if attempt == retries:
+                raise
+
+            logger.warning(
+                "Updating %s failed, retrying",
+                document.__name__,
+                exc_info=True,
+            )
+            time.sleep(delay * 2**attempt)
+
+
+def get_queued_instance(item, pages):
+    """Return the instance and action to send for a queue item.
+
+    Pages that still exist are indexed or deleted as queued. Pages that no
+    longer exist can't be loaded, so their documents are deleted by ID using
+    an unsaved instance of the page's specific type.
+    """
+    page = pages.get(item.page_id)
+    if page is not None:
+        return page, item.action
+
+    model = item.content_type.model_class()
+    if model is None:
+        return None, item.action
+
+    return model(pk=item.page_id), IndexQueueItem.DELETE
+
+
+def get_queued_updates(instance, action):
+    """Return the documents and objects to update for a queued page.
+
+    This mirrors what BaseSignalProcessor does for a single page: deletions
+    only affect the page's own documents, and indexing also updates related
+    documents.
+    """
+    updates = []
+
+    # The registry only offers per-instance updates, so use its mapping of
+    # models to documents directly in order to update in bulk.
+    for document in registry._models.get(instance.__class__, ()):
+        if not document.django.ignore_signals:
+            updates.append((document, [instance]))
+
+    if action == IndexQueueItem.INDEX:
+        for document in registry._get_related_doc(instance):
+            try:
+                related = document().get_instances_from_related(instance)
+            except ObjectDoesNotExist:
+                related = None
+
+            if related is None:
+                continue
+            elif isinstance(related, Model):
+                updates.append((document, [related]))
+            else:
+                updates.append((document, list(related)))
+
+    return updates
+
+
+def process_index_queue(batch_size=500, retries=3, retry_delay=1):
+    """Send a batch of queued page changes to Elasticsearch.
+
+    Multiple changes to the same page are coalesced so that only the most
+    recent one is sent, and pages are sent with one bulk request per document
+    type and action.
+
+    If a bulk request fails, its pages are sent one at a time so that a page
+    that can't be indexed doesn't hold up the rest of the queue. Changes that
+    still fail are logged and removed from the queue. If Elasticsearch can't
+    be reached, the exception is raised and the batch stays queued to be
+    retried.
+
+    Returns the number of queue items processed.
+    """
+    items = list(
+        IndexQueueItem.objects.select_related("content_type")[:batch_size]
+    )
+    if not items:
+        return 0
+
+    # Items are ordered by creation, so later actions replace earlier ones.
+    latest = {item.page_id: item for item in items}
+    pages = {
+        page.pk: page for page in Page.objects.filter(pk__in=latest).specific()
+    }
+
+    updates = defaultdict(list)
+    for page_id, item in latest.items():
+        instance, action = get_queued_instance(item, pages)
+        if instance is None:
+            logger.warning(
+                "Dropping queued %s of page %s of unknown type",
+                action,
+                page_id,
+            )
+            continue
+
+        try:
+            page_updates = get_queued_updates(instance, action)
+        except Exception:
+            logger.exception("Dropping queued %s of page %s", action, page_id)
+            continue
+
+        for document, objects in page_updates:
+            updates[(document, action)].append((page_id, objects))
+
+    for (document, action), page_updates in updates.items():
+        objects = [
+            obj for _, page_objects in page_updates for obj in page_objects
+        ]
+
+        try:
+            update_documents_with_retries(
+                document, objects, action, retries, retry_delay
+            )
+        except OpenSearchConnectionError:
+            raise
+        except Exception:
+            logger.warning(
+                "Updating %s in bulk failed, sending pages separately",
+                document.__name__,
+                exc_info=True,
+            )
+        else:
+            continue
+
+        for page_id, page_objects in page_updates:
+            try:
+                update_documents_with_retries(
+                    document, page_objects, action, 0, retry_delay
+                )
+            except OpenSearchConnectionError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Dropping queued %s of page %s from %s",
+                    action,
+                    page_id,
+                    document.__name__,
+                )
+
+    IndexQueueItem.objects.filter(pk__in=[item.pk for item in items]).delete()
+    return len(items)
+
+
+def get_index_generations(connection, alias):
+    """Return the names of an alias's physical indices, oldest first.
+
+    Physical indices are named after the alias, followed by a hyphen and the
+    time they were created in nanoseconds.
+    """
+    generation_re = re.compile(re.escape(alias) + r"-(\d+)")
+    generations = [
+        name
+        for name in connection.indices.get(index=f"{alias}-*")
+        if generation_re.fullmatch(name)
+    ]
+    return sorted(generations, key=lambda name: int(name.rsplit("-", 1)[1]))
+
+
+def rebuild_index_with_alias(
+    document, parallel=True, thread_count=4, keep=1, stdout=None
+):
+    """Rebuild a document's index without interrupting searches.
+
+    The document's index name is used as an alias for a physical index.
+    Documents are indexed into a new physical index, and the alias is only
+    moved to it, in a single atomic request, once it contains as many
+    documents as were sent. Until then, searches and updates use the
+    previous index. If the index name is still used by a physical index
+    created without an alias, that index is deleted in the same request.
+
+    The newest `keep` previous physical indices are kept, so that the alias
+    can be moved back to one of them; any older ones are deleted.
+
+    Changes made to the previous index while the new one is being built
+    are not copied to it.
+
+    Returns the name of the new physical index.
+    """
+    connection = document._get_connection()
+    alias = document._index._name
+    index_name = f"{alias}-{time.time_ns()}"
+
+    index = document._index.clone(name=index_name)
+    index.settings(refresh_interval="-1")
+    index.create()
+
+    doc = document()
+    sent = 0
+
+    def get_actions():
+        nonlocal sent
+        for obj in doc.get_indexing_queryset():
+            if doc.should_index_object(obj):
+                sent += 1
+                yield {
+                    "_op_type": "index",
+                    "_index": index_name,
+                    "_id": doc.generate_id(obj),
+                    "_source": doc.prepare(obj),
+                }
+
+    try:
+        if parallel:
+            # parallel_bulk reads its actions from a worker thread. Querying
+            # the database there would use a connection of that thread, which
+            # can't see uncommitted data and is never closed. Instead, each
+            # batch of actions is prepared here, and only sending it to
+            # Elasticsearch happens in parallel.
+            actions = get_actions()
+            batch_size = doc.django.queryset_pagination * thread_count
+            while True:
+                batch = list(islice(actions, batch_size))
+                if not batch:
+                    break
+
+                doc.parallel_bulk(batch, thread_count=thread_count)
+        else:
+            doc.bulk(get_actions())
+
+        connection.indices.put_settings(
+            index=index_name, body={"index": {"refresh_interval": None}}
+        )
+        connection.indices.refresh(index=index_name)
+
+        indexed = connection.count(index=index_name)["count"]
+        if indexed != sent:
+            raise RuntimeError(
+                f"{index_name} contains {indexed} documents, "
+                f"but {sent} were sent"
+            )
+    except Exception:
+        connection.indices.delete(index=index_name, ignore_unavailable=True)
+        raise
+
+    actions = [{"add": {"index": index_name, "alias": alias}}]
+    if connection.indices.exists_alias(name=alias):
+        actions = [
+            {"remove": {"index": name, "alias": alias}}
+            for name in connection.indices.get_alias(name=alias)
+        ] + actions
+    elif connection.indices.exists(index=alias):
+        actions.append({"remove_index": {"index": alias}})
+
+    connection.indices.update_aliases(body={"actions": actions})
+
+    old_generations = [
+        name
+        for name in get_index_generations(connection, alias)
+        if name != index_name
+    ]
+    for name in old_generations[: max(len(old_generations) - keep, 0)]:
+        connection.indices.delete(index=name)
+
+    if stdout:
+        stdout.write(f"Indexed {sent} documents into {index_name} ({alias})\n")
+
+    return index_name
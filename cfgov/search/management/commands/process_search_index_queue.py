@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from search.elasticsearch_helpers import process_index_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued Wagtail page changes to Elasticsearch in bulk. "
+        "Run with --loop to keep processing the queue as it fills."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum number of queued changes to send at once",
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=3,
+            help="Number of times to retry a failed bulk request",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep processing the queue instead of exiting when empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between checks of an empty queue",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                processed = process_index_queue(
+                    batch_size=options["batch_size"],
+                    retries=options["retries"],
+                )
+            except Exception as e:
+                if not options["loop"]:
+                    raise
+
+                # Leave the queue as it is, to be retried on the next pass.
+                self.stderr.write(f"Failed to process search queue: {e}")
+                processed = 0
+            else:
+                if processed:
+                    self.stdout.write(f"Processed {processed} queued changes")
+
+            # Keep going while there may be more queued changes.
+            if processed == options["batch_size"]:
+                continue
+
+            if not options["loop"]:
+                break
+
+            time.sleep(options["interval"])
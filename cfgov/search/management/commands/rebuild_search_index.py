@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_opensearch_dsl.registries import registry
+
+from search.elasticsearch_helpers import rebuild_index_with_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild search indexes into new physical indexes and then switch "
+        "their aliases to them, so that searches keep working throughout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "indices",
+            nargs="*",
+            help="Names of the indexes to rebuild; defaults to all of them",
+        )
+        parser.add_argument(
+            "--no-parallel",
+            action="store_false",
+            dest="parallel",
+            help="Send documents from a single thread",
+        )
+        parser.add_argument(
+            "--thread-count",
+            type=int,
+            default=4,
+            help="Number of threads to send documents from",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=1,
+            help="Number of previous physical indexes to keep",
+        )
+
+    def handle(self, *args, **options):
+        documents = [
+            document
+            for index_documents in registry._indices.values()
+            for document in index_documents
+        ]
+        if options["indices"]:
+            unknown = set(options["indices"]) - {
+                document._index._name for document in documents
+            }
+            if unknown:
+                raise CommandError(
+                    "Unknown indexes: {}".format(", ".join(sorted(unknown)))
+                )
+
+            documents = [
+                document
+                for document in documents
+                if document._index._name in options["indices"]
+            ]
+
+        for document in documents:
+            rebuild_index_with_alias(
+                document,
+                parallel=options["parallel"],
+                thread_count=options["thread_count"],
+                keep=options["keep"],
+                stdout=self.stdout,
+            )
@@ -1,3 +1,4 @@
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
 
@@ -9,3 +10,30 @@ class Synonym(models.Model):
         max_length=500,
         help_text="A comma-separated list of words that are synonyms",
     )
+
+
+class IndexQueueItem(models.Model):
+    """A Wagtail page whose search documents are waiting to be updated.
+
+    Items are created by QueuedWagtailSignalProcessor and sent to
+    Elasticsearch by the process_search_index_queue management command.
+    """
+
+    INDEX = "index"
+    DELETE = "delete"
+    ACTION_CHOICES = [
+        (INDEX, "Index"),
+        (DELETE, "Delete"),
+    ]
+
+    page_id = models.IntegerField()
+    # The page's specific type, so that a deleted page's documents can still
+    # be found and removed.
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["pk"]
@@ -0,0 +1,42 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+@mock.patch(
+    "search.management.commands.process_search_index_queue"
+    ".process_index_queue"
+)
+class ProcessSearchIndexQueueTests(SimpleTestCase):
+    def test_processes_until_queue_is_drained(self, process_index_queue):
+        process_index_queue.side_effect = [2, 2, 1]
+
+        stdout = StringIO()
+        call_command("process_search_index_queue", batch_size=2, stdout=stdout)
+
+        self.assertEqual(process_index_queue.call_count, 3)
+        self.assertEqual(stdout.getvalue().count("Processed"), 3)
+
+    def test_errors_are_raised_without_loop(self, process_index_queue):
+        process_index_queue.side_effect = ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            call_command("process_search_index_queue", stdout=StringIO())
+
+    @mock.patch("time.sleep", side_effect=[None, KeyboardInterrupt])
+    def test_loop_keeps_going_after_errors(self, sleep, process_index_queue):
+        process_index_queue.side_effect = [ConnectionError, 1]
+
+        stderr = StringIO()
+        with self.assertRaises(KeyboardInterrupt):
+            call_command(
+                "process_search_index_queue",
+                loop=True,
+                stdout=StringIO(),
+                stderr=stderr,
+            )
+
+        self.assertEqual(process_index_queue.call_count, 2)
+        self.assertIn("Failed to process search queue", stderr.getvalue())
@@ -0,0 +1,51 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+
+first_document = mock.Mock(_index=mock.Mock(_name="first"))
+second_document = mock.Mock(_index=mock.Mock(_name="second"))
+
+
+@mock.patch(
+    "search.management.commands.rebuild_search_index.registry",
+    _indices={
+        first_document._index: {first_document},
+        second_document._index: {second_document},
+    },
+)
+@mock.patch(
+    "search.management.commands.rebuild_search_index.rebuild_index_with_alias"
+)
+class RebuildSearchIndexTests(SimpleTestCase):
+    def test_rebuilds_all_indexes(self, rebuild, registry):
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(
+            {call.args[0] for call in rebuild.call_args_list},
+            {first_document, second_document},
+        )
+
+    def test_rebuilds_given_indexes(self, rebuild, registry):
+        stdout = StringIO()
+        call_command(
+            "rebuild_search_index",
+            "second",
+            "--no-parallel",
+            "--keep=0",
+            stdout=stdout,
+        )
+        rebuild.assert_called_once_with(
+            second_document,
+            parallel=False,
+            thread_count=4,
+            keep=0,
+            stdout=mock.ANY,
+        )
+
+    def test_unknown_index(self, rebuild, registry):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_search_index", "third", stdout=StringIO())
+
+        rebuild.assert_not_called()
@@ -1,6 +1,26 @@
-from django.test import TestCase, override_settings
+import threading
+from types import SimpleNamespace
+from unittest import mock
 
-from search.elasticsearch_helpers import environment_specific_index
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from wagtail.core.models import Page
+
+from django_opensearch_dsl import Document
+from opensearchpy.exceptions import (
+    ConnectionError as OpenSearchConnectionError,
+)
+
+from search.elasticsearch_helpers import (
+    QueuedWagtailSignalProcessor,
+    SearchPaginator,
+    environment_specific_index,
+    process_index_queue,
+    rebuild_index_with_alias,
+)
+from search.models import IndexQueueItem
 
 
 class TestEnvironmentSpecificIndex(TestCase):
@@ -34,3 +54,435 @@ class TestEnvironmentSpecificIndex(TestCase):
     def test_environment_specific_index_lowercases_index(self):
         name = environment_specific_index("index")
         self.assertEqual(name, "test-index")
+
+
+class FakeSearch:
+    """Minimal stand-in for an opensearch_dsl Search with 23 hits."""
+
+    total = 23
+
+    def __init__(self, start=None, stop=None):
+        self.start = start
+        self.stop = stop
+        self.executed = []
+
+    def __getitem__(self, key):
+        window = FakeSearch(key.start, key.stop)
+        window.executed = self.executed
+        window.total = self.total
+        return window
+
+    def extra(self, **kwargs):
+        self.extra_kwargs = kwargs
+        return self
+
+    def execute(self):
+        self.executed.append((self.start, self.stop))
+        response = mock.MagicMock()
+        response.hits.total.value = self.total
+        response.__iter__.return_value = iter(
+            range(self.start, min(self.stop, self.total))
+        )
+        return response
+
+
+class SearchPaginatorTests(SimpleTestCase):
+    def setUp(self):
+        self.search = FakeSearch()
+        self.paginator = SearchPaginator(self.search, 10)
+
+    def test_page_fetches_only_requested_window(self):
+        page = self.paginator.page(2)
+        self.assertEqual(list(page), list(range(10, 20)))
+        self.assertEqual(self.search.executed, [(10, 20)])
+
+    def test_count_comes_from_page_request(self):
+        self.paginator.page(1)
+        self.assertEqual(self.paginator.count, 23)
+        self.assertEqual(self.paginator.num_pages, 3)
+        self.assertEqual(len(self.search.executed), 1)
+
+    def test_page_is_only_fetched_once(self):
+        self.paginator.page(3)
+        self.paginator.page("3")
+        self.assertEqual(self.search.executed, [(20, 30)])
+
+    def test_results_factory(self):
+        paginator = SearchPaginator(
+            self.search, 10, results_factory=lambda search: [search.start]
+        )
+        self.assertEqual(list(paginator.page(3)), [20])
+
+    def test_page_out_of_range_raises_empty_page(self):
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(4)
+
+    def test_page_not_an_integer(self):
+        with self.assertRaises(PageNotAnInteger):
+            self.paginator.page("foo")
+
+    def test_page_beyond_result_window_is_not_requested(self):
+        self.paginator.max_result_window = 20
+        self.paginator.count = 23
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(3)
+        self.assertEqual(self.search.executed, [])
+
+    def test_num_pages_capped_at_result_window(self):
+        self.search.total = 25000
+        self.assertEqual(self.paginator.page(1).paginator.num_pages, 1000)
+
+    def test_last_reachable_page_beyond_result_window(self):
+        self.search.total = self.paginator.count = 25000
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(1500)
+        page = self.paginator.page(self.paginator.num_pages)
+        self.assertEqual(page.number, 1000)
+        self.assertFalse(page.has_next())
+        self.assertEqual(self.search.executed, [(9990, 10000)])
+
+
+@override_settings(OPENSEARCH_DSL_AUTOSYNC=True)
+class QueuedWagtailSignalProcessorTests(TestCase):
+    def setUp(self):
+        # Instantiating a signal processor connects it to Wagtail signals.
+        self.processor = QueuedWagtailSignalProcessor(connections=None)
+        self.addCleanup(self.processor.teardown)
+        self.page = Page.get_first_root_node()
+
+    def get_queue(self):
+        return list(IndexQueueItem.objects.values_list("page_id", "action"))
+
+    def test_queued_page_records_content_type(self):
+        self.processor.handle_save(Page, self.page)
+        self.assertEqual(
+            IndexQueueItem.objects.get().content_type_id,
+            self.page.content_type_id,
+        )
+
+    def test_handle_save_queues_page(self):
+        self.processor.handle_save(Page, self.page)
+        self.assertEqual(self.get_queue(), [(self.page.pk, "index")])
+
+    def test_handle_delete_queues_page(self):
+        self.processor.handle_delete(Page, self.page)
+        self.assertEqual(self.get_queue(), [(self.page.pk, "delete")])
+
+    @override_settings(OPENSEARCH_DSL_AUTOSYNC=False)
+    def test_nothing_queued_if_autosync_disabled(self):
+        self.processor.handle_save(Page, self.page)
+        self.assertEqual(self.get_queue(), [])
+
+
+class FakeDocument:
+    django = SimpleNamespace(ignore_signals=False)
+    update = mock.Mock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class ProcessIndexQueueTests(TestCase):
+    def setUp(self):
+        root = Page.get_first_root_node()
+        self.pages = [
+            root.add_child(instance=Page(title=f"Page {i}", slug=f"page-{i}"))
+            for i in range(3)
+        ]
+
+        FakeDocument.update = mock.Mock()
+
+        registry = mock.Mock(_models={Page: {FakeDocument}})
+        registry._get_related_doc.return_value = []
+        patched = mock.patch("search.elasticsearch_helpers.registry", registry)
+        patched.start()
+        self.addCleanup(patched.stop)
+
+    def queue(self, page, action):
+        IndexQueueItem.objects.create(
+            page_id=page.pk,
+            content_type_id=page.content_type_id,
+            action=action,
+        )
+
+    def test_empty_queue(self):
+        self.assertEqual(process_index_queue(), 0)
+        FakeDocument.update.assert_not_called()
+
+    def test_changes_are_coalesced_and_sent_in_bulk(self):
+        self.queue(self.pages[0], "delete")
+        self.queue(self.pages[0], "index")
+        self.queue(self.pages[1], "index")
+        self.queue(self.pages[2], "index")
+        self.queue(self.pages[2], "delete")
+
+        self.assertEqual(process_index_queue(), 5)
+        self.assertEqual(IndexQueueItem.objects.count(), 0)
+
+        self.assertEqual(FakeDocument.update.call_count, 2)
+        FakeDocument.update.assert_any_call(
+            [self.pages[0], self.pages[1]], "index"
+        )
+        FakeDocument.update.assert_any_call(
+            [self.pages[2]], "delete", raise_on_error=False
+        )
+
+    def test_batch_size(self):
+        for page in self.pages:
+            self.queue(page, "index")
+
+        self.assertEqual(process_index_queue(batch_size=2), 2)
+        self.assertEqual(IndexQueueItem.objects.count(), 1)
+
+    def test_failed_updates_are_retried(self):
+        FakeDocument.update.side_effect = [ConnectionError, None]
+        self.queue(self.pages[0], "index")
+
+        self.assertEqual(process_index_queue(retry_delay=0), 1)
+        self.assertEqual(FakeDocument.update.call_count, 2)
+        self.assertEqual(IndexQueueItem.objects.count(), 0)
+
+    def test_unreachable_elasticsearch_leaves_batch_queued(self):
+        FakeDocument.update.side_effect = OpenSearchConnectionError
+        self.queue(self.pages[0], "index")
+
+        with self.assertRaises(OpenSearchConnectionError):
+            process_index_queue(retries=1, retry_delay=0)
+
+        self.assertEqual(FakeDocument.update.call_count, 2)
+        self.assertEqual(IndexQueueItem.objects.count(), 1)
+
+    def test_failing_page_is_dropped_without_blocking_others(self):
+        def update(objects, action, **kwargs):
+            if self.pages[1] in objects:
+                raise ValueError
+
+        FakeDocument.update.side_effect = update
+        self.queue(self.pages[0], "index")
+        self.queue(self.pages[1], "index")
+
+        with self.assertLogs("search.elasticsearch_helpers", "ERROR"):
+            self.assertEqual(process_index_queue(retries=0), 2)
+
+        FakeDocument.update.assert_any_call([self.pages[0]], "index")
+        self.assertEqual(IndexQueueItem.objects.count(), 0)
+
+    def test_deleted_page_is_deleted_by_id(self):
+        page_id = self.pages[0].pk
+        self.queue(self.pages[0], "delete")
+        self.pages[0].delete()
+
+        self.assertEqual(process_index_queue(), 1)
+
+        objects, action = FakeDocument.update.call_args.args
+        self.assertEqual(action, "delete")
+        self.assertEqual([obj.pk for obj in objects], [page_id])
+        self.assertIsInstance(objects[0], Page)
+
+    def test_page_deleted_after_indexing_was_queued_is_deleted(self):
+        page_id = self.pages[0].pk
+        self.queue(self.pages[0], "index")
+        self.pages[0].delete()
+
+        process_index_queue()
+
+        objects, action = FakeDocument.update.call_args.args
+        self.assertEqual(action, "delete")
+        self.assertEqual([obj.pk for obj in objects], [page_id])
+
+    def test_missing_related_instances_are_ignored(self):
+        related_document = mock.Mock()
+        related_document().get_instances_from_related.side_effect = (
+            ObjectDoesNotExist
+        )
+        with mock.patch(
+            "search.elasticsearch_helpers.registry._get_related_doc",
+            return_value=[related_document],
+        ):
+            self.queue(self.pages[0], "index")
+            self.assertEqual(process_index_queue(), 1)
+
+        FakeDocument.update.assert_called_once_with([self.pages[0]], "index")
+        related_document().update.assert_not_called()
+
+
+class FakeRebuildDocument:
+    django = SimpleNamespace(queryset_pagination=1)
+    objects = [SimpleNamespace(pk=1), SimpleNamespace(pk=2)]
+
+    def get_indexing_queryset(self):
+        return self.objects
+
+    def should_index_object(self, obj):
+        return True
+
+    def generate_id(self, obj):
+        return obj.pk
+
+    def prepare(self, obj):
+        return {"id": obj.pk}
+
+    def bulk(self, actions):
+        self.__class__.actions.extend(actions)
+
+    def parallel_bulk(self, actions, thread_count):
+        self.__class__.batches.append(actions)
+        self.bulk(actions)
+
+
+@mock.patch("search.elasticsearch_helpers.time.time_ns", return_value=300)
+class RebuildIndexWithAliasTests(SimpleTestCase):
+    def setUp(self):
+        self.connection = mock.Mock()
+        self.connection.count.return_value = {"count": 2}
+        self.connection.indices.get.return_value = {
+            "index-100": {},
+            "index-200": {},
+            "index-300": {},
+            "index-other": {},
+        }
+        self.connection.indices.exists_alias.return_value = True
+        self.connection.indices.get_alias.return_value = {"index-200": {}}
+
+        FakeRebuildDocument._get_connection = mock.Mock(
+            return_value=self.connection
+        )
+        FakeRebuildDocument._index = mock.Mock(_name="index")
+        FakeRebuildDocument.actions = []
+        FakeRebuildDocument.batches = []
+
+    def test_rebuild_swaps_alias_and_removes_old_generations(self, time_ns):
+        self.assertEqual(
+            rebuild_index_with_alias(FakeRebuildDocument), "index-300"
+        )
+
+        FakeRebuildDocument._index.clone.assert_called_once_with(
+            name="index-300"
+        )
+        FakeRebuildDocument._index.clone().create.assert_called_once_with()
+        self.assertEqual(
+            FakeRebuildDocument.actions,
+            [
+                {
+                    "_op_type": "index",
+                    "_index": "index-300",
+                    "_id": pk,
+                    "_source": {"id": pk},
+                }
+                for pk in (1, 2)
+            ],
+        )
+        self.connection.indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"remove": {"index": "index-200", "alias": "index"}},
+                    {"add": {"index": "index-300", "alias": "index"}},
+                ]
+            }
+        )
+
+        # The newest previous generation is kept.
+        self.connection.indices.delete.assert_called_once_with(
+            index="index-100"
+        )
+
+    def test_parallel_rebuild_sends_prepared_batches(self, time_ns):
+        rebuild_index_with_alias(FakeRebuildDocument, thread_count=1)
+
+        self.assertEqual(
+            [
+                [action["_id"] for action in batch]
+                for batch in (FakeRebuildDocument.batches)
+            ],
+            [[1], [2]],
+        )
+
+    def test_rebuild_replaces_index_without_alias(self, time_ns):
+        self.connection.indices.exists_alias.return_value = False
+        self.connection.indices.exists.return_value = True
+
+        rebuild_index_with_alias(FakeRebuildDocument, parallel=False, keep=0)
+
+        self.connection.indices.update_aliases.assert_called_once_with(
+            body={
+                "actions": [
+                    {"add": {"index": "index-300", "alias": "index"}},
+                    {"remove_index": {"index": "index"}},
+                ]
+            }
+        )
+        self.assertEqual(
+            self.connection.indices.delete.call_args_list,
+            [mock.call(index="index-100"), mock.call(index="index-200")],
+        )
+
+    def test_rebuild_fails_if_counts_differ(self, time_ns):
+        self.connection.count.return_value = {"count": 1}
+
+        with self.assertRaises(RuntimeError):
+            rebuild_index_with_alias(FakeRebuildDocument)
+
+        self.connection.indices.update_aliases.assert_not_called()
+        self.connection.indices.delete.assert_called_once_with(
+            index="index-300", ignore_unavailable=True
+        )
+
+
+class PageRebuildDocument(Document):
+    django = SimpleNamespace(model=Page, queryset_pagination=2)
+
+    class Index:
+        name = "pages"
+
+    def prepare(self, instance):
+        return {"title": instance.title}
+
+
+class RebuildIndexWithAliasQuerysetTests(TestCase):
+    def setUp(self):
+        root = Page.get_first_root_node()
+        self.pages = [
+            root.add_child(instance=Page(title=f"Page {i}", slug=f"page-{i}"))
+            for i in range(3)
+        ]
+
+        self.connection = mock.MagicMock()
+        self.connection.count.return_value = {"count": Page.objects.count()}
+        self.connection.indices.get.return_value = {}
+        self.connection.indices.exists_alias.return_value = False
+        self.connection.indices.exists.return_value = False
+
+        patched = mock.patch.object(
+            PageRebuildDocument,
+            "_get_connection",
+            return_value=self.connection,
+        )
+        patched.start()
+        self.addCleanup(patched.stop)
+
+        patched = mock.patch.object(type(PageRebuildDocument._index), "create")
+        patched.start()
+        self.addCleanup(patched.stop)
+
+    def test_pages_created_in_transaction_are_indexed_in_parallel(self):
+        sent = []
+
+        def parallel_bulk(client, actions, **kwargs):
+            # Like opensearch-py, read the actions from another thread.
+            thread = threading.Thread(target=lambda: sent.extend(actions))
+            thread.start()
+            thread.join()
+            return iter(())
+
+        with mock.patch(
+            "django_opensearch_dsl.documents.parallel_bulk", parallel_bulk
+        ):
+            rebuild_index_with_alias(PageRebuildDocument, thread_count=2)
+
+        self.assertEqual(
+            sorted(action["_id"] for action in sent),
+            sorted(Page.objects.values_list("pk", flat=True)),
+        )
+        self.assertIn(
+            {"title": "Page 2"}, [action["_source"] for action in sent]
+        )
@@ -3,6 +3,7 @@ from collections import OrderedDict
 
 from django.core.paginator import InvalidPage, Paginator
 from django.db import models
+from django.utils.functional import cached_property
 
 from wagtail.admin.edit_handlers import (
     ObjectList,
@@ -13,6 +14,8 @@ from wagtail.core.fields import StreamField
 
 from opensearch_dsl import Q
 
+from core.cache import get_cache_version, invalidate_cache_version
+from search.elasticsearch_helpers import SearchPaginator
 from teachers_digital_platform.documents import ActivityPageDocument
 from teachers_digital_platform.models.django import (
     ActivityAgeRange,
@@ -56,6 +59,7 @@ for facet in FACET_LIST:
         {"{}_terms".format(facet): {"terms": {"field": facet}}}
     )
 ALWAYS_EXPANDED = {"topic", "school_subject"}
+ACTIVITY_SETUP_CACHE_VERSION_KEY = "tdp-activity-setup-version"
 SEARCH_FIELDS = [
     "text",
     "related_text",
@@ -69,6 +73,11 @@ SEARCH_FIELDS = [
 ]
 
 
+# Per-process copy of the activity setup, along with the cache version it was
+# loaded at.
+_activity_setup = None
+
+
 class ActivityIndexPage(CFGOVPage):
     """A model for the Activity Search page."""
 
@@ -117,7 +126,9 @@ class ActivityIndexPage(CFGOVPage):
 
     def dsl_search(self, request, *args, **kwargs):
         """Search using Elasticsearch 7 and django-elasticsearch-dsl."""
-        all_facets = copy.copy(self.activity_setups.facet_setup)
+        # The activity setups are shared between requests, so they must not
+        # be modified here.
+        all_facets = self.activity_setups.facet_setup
         selected_facets = {}
         card_setup = self.activity_setups.ordered_cards
         total_activities = len(card_setup)
@@ -125,6 +136,7 @@ class ActivityIndexPage(CFGOVPage):
         facet_called = any(
             [request.GET.get(facet, "") for facet in FACET_LIST]
         )
+        results_per_page = validate_results_per_page(request)
         # If there's no query or facet request, we can return cached setups:
         if not search_query and not facet_called:
             payload = {
@@ -137,7 +149,6 @@ class ActivityIndexPage(CFGOVPage):
                 "expanded_facets": ALWAYS_EXPANDED,
             }
             self.results = payload
-            results_per_page = validate_results_per_page(request)
             paginator = Paginator(payload["results"], results_per_page)
             current_page = validate_page_number(request, paginator)
             paginated_page = paginator.page(current_page)
@@ -174,16 +185,30 @@ class ActivityIndexPage(CFGOVPage):
             dsl_search = dsl_search.query(
                 "bool", should=[Q("match", **{facet: pk}) for pk in pks]
             )
-        facet_search = dsl_search.update_from_dict(FACET_DICT)
-        total_results = dsl_search.count()
-        dsl_search = dsl_search[:total_results]
-        response = dsl_search.execute()
-        results = [card_setup[str(hit.id)] for hit in response[:total_results]]
-        facet_response = facet_search.execute()
+
+        # Only the page of results being shown is requested, along with the
+        # total count and the facet aggregations. Results are displayed using
+        # the activity setups, so only the IDs of the hits are needed.
+        dsl_search = dsl_search.source(["id"]).update_from_dict(FACET_DICT)
+        paginator = SearchPaginator(
+            dsl_search,
+            results_per_page,
+            results_factory=lambda search: search.execute(),
+        )
+        current_page = validate_page_number(request, paginator)
+        paginated_page = paginator.page(current_page)
+        response = paginated_page.object_list
+        total_results = paginator.count
+
+        results = [
+            card_setup[str(hit.id)]
+            for hit in response
+            if str(hit.id) in card_setup
+        ]
+        paginated_page.object_list = results
+
         facet_counts = {
-            facet: getattr(
-                facet_response.aggregations, f"{facet}_terms"
-            ).buckets
+            facet: getattr(response.aggregations, f"{facet}_terms").buckets
             for facet in FACET_LIST
         }
         all_facets = parse_dsl_facets(
@@ -210,10 +235,6 @@ class ActivityIndexPage(CFGOVPage):
             }
         )
         self.results = payload
-        results_per_page = validate_results_per_page(request)
-        paginator = Paginator(payload["results"], results_per_page)
-        current_page = validate_page_number(request, paginator)
-        paginated_page = paginator.page(current_page)
         context_update = {
             "facets": all_facets,
             "activities": paginated_page,
@@ -227,7 +248,7 @@ class ActivityIndexPage(CFGOVPage):
 
     def get_context(self, request, *args, **kwargs):
         if not self.activity_setups:
-            self.activity_setups = get_activity_setup()
+            self.activity_setups = get_cached_activity_setup()
         context_update = self.dsl_search(request, *args, **kwargs)
         context = super().get_context(request)
         context.update(context_update)
@@ -238,45 +259,54 @@ class ActivityIndexPage(CFGOVPage):
 
 
 def parse_dsl_facets(all_facets, facet_counts, selected_facets):
+    """Return the facets to display for a search.
+
+    Facets are only included if the search returned results for them or if
+    they are selected. all_facets isn't modified, so that it can be shared
+    between requests.
+    """
+    parsed_facets = {}
     for facet, facet_config in FACET_MAP:
-        returned_facet_ids = [hit["key"] for hit in facet_counts[facet]]
+        returned_facet_ids = {hit["key"] for hit in facet_counts[facet]}
         is_nested = facet_config[1]
-        selections = selected_facets.get(facet, "")
+        selections = selected_facets.get(facet, [])
         if is_nested:
-            for pi, parent in enumerate(all_facets[facet]):
-                if parent["id"] in selections:
-                    parent["selected"] = True
-                    parent["child_selected"] = True
-                    for _, child in enumerate(parent["children"]):
-                        child["selected"] = True
-                else:
-                    for _, child in enumerate(parent["children"]):
-                        if selections and child["id"] in selections:
-                            child["selected"] = True
-                            parent["child_selected"] = True
-                all_facets[facet][pi].update(parent)
-            for pi, parent in enumerate(all_facets[facet]):
-                for child in parent["children"]:
-                    if child["id"] not in returned_facet_ids:
-                        parent["children"].remove(child)
-                all_facets[facet][pi].update(parent)
+            parents = []
             for parent in all_facets[facet]:
-                if not parent["children"]:
-                    all_facets[facet].remove(parent)
+                parent_selected = parent["id"] in selections
+                child_selected = parent_selected or any(
+                    child["id"] in selections for child in parent["children"]
+                )
+                children = [
+                    dict(
+                        child,
+                        selected=parent_selected or child["id"] in selections,
+                    )
+                    for child in parent["children"]
+                    if child["id"] in returned_facet_ids
+                ]
+                if children:
+                    parents.append(
+                        dict(
+                            parent,
+                            selected=parent_selected or parent["selected"],
+                            child_selected=child_selected,
+                            children=children,
+                        )
+                    )
+            parsed_facets[facet] = parents
         else:
-            for i, flat_facet in enumerate(all_facets[facet]):
-                flat_id = flat_facet["id"]
-                if selections and flat_id in selections:
-                    flat_facet["selected"] = True
-                    all_facets[facet][i].update(flat_facet)
-            for flat_facet in all_facets[facet]:
-                flat_id = flat_facet["id"]
-                if (
-                    flat_id not in returned_facet_ids
-                    and flat_id not in selections
-                ):
-                    all_facets[facet].remove(flat_facet)
-    return all_facets
+            parsed_facets[facet] = [
+                dict(
+                    flat_facet,
+                    selected=flat_facet["selected"]
+                    or flat_facet["id"] in selections,
+                )
+                for flat_facet in all_facets[facet]
+                if flat_facet["id"] in returned_facet_ids
+                or flat_facet["id"] in selections
+            ]
+    return parsed_facets
 
 
 def default_nested_facets(class_object):
@@ -316,6 +346,116 @@ def default_flat_facets(class_object):
     ]
 
 
+# The information needed for displaying each result of a query
+CARD_FACET_FIELDS = (
+    "school_subject",
+    "grade_level",
+    "age_range",
+    "student_characteristics",
+    "activity_type",
+    "teaching_strategy",
+    "blooms_taxonomy_level",
+    "jump_start_coalition",
+    "council_for_economic_education",
+)
+
+
+def get_card_order():
+    return (
+        ActivityPage.objects.filter(live=True)
+        .order_by("-date", "title")
+        .values_list("pk", flat=True)
+    )
+
+
+def get_card_queryset():
+    """Return live activities with everything needed for their cards."""
+    return (
+        ActivityPage.objects.filter(live=True)
+        .select_related("activity_duration")
+        .prefetch_related("building_block", "topic", *CARD_FACET_FIELDS)
+    )
+
+
+def get_topic_tree():
+    """Return all activity topics by ID, in tree order."""
+    return {
+        topic.pk: topic
+        for topic in ActivityTopic.objects.order_by("tree_id", "lft")
+    }
+
+
+def get_topics_text(topic_ids, topics):
+    """Return a hierarchical list of topics as text.
+
+    This is equivalent to ActivityPage.get_topics_list, using topics from
+    get_topic_tree instead of querying for them.
+    """
+
+    def get_root(topic):
+        while topic.parent_id is not None:
+            topic = topics[topic.parent_id]
+        return topic
+
+    topic_ids = set(topic_ids)
+    roots_with_descendants = {
+        get_root(topics[pk]).pk for pk in topic_ids if topics[pk].parent_id
+    }
+    roots = {get_root(topics[pk]).pk for pk in topic_ids}
+
+    topic_list = []
+    for root in topics.values():
+        if root.pk not in roots:
+            continue
+
+        if root.pk not in roots_with_descendants:
+            topic_list.append(root.title)
+            continue
+
+        children_list = [
+            child.title
+            for child in topics.values()
+            if child.parent_id == root.pk and child.pk in topic_ids
+        ]
+        if children_list:
+            topic_list.append(
+                root.title + " (" + ", ".join(children_list) + ")"
+            )
+
+    if topic_list:
+        return ", ".join(topic_list)
+
+
+def build_card(activity, topics):
+    """Build the card for an activity from get_card_queryset."""
+    activity_types = activity.activity_type.all()
+    card = {
+        "url": activity.url,
+        "title": activity.title,
+        "date": activity.date.strftime("%b %d, %Y"),
+        "date_attr": activity.date.strftime("%Y-%m-%d"),
+        "ideal_for": ", ".join(
+            [gl.title for gl in activity.grade_level.all()]
+        ),
+        "summary": activity.summary,
+        "topic": get_topics_text(
+            [topic.pk for topic in activity.topic.all()], topics
+        ),
+        "activity_duration": activity.activity_duration.title,
+        "available_in_spanish": any(
+            activity_type.title == "Available in Spanish"
+            for activity_type in activity_types
+        ),
+        "building_block": [
+            {"title": blk.title, "svg_icon": blk.svg_icon}
+            for blk in activity.building_block.all()
+        ],
+    }
+    for field in CARD_FACET_FIELDS:
+        card[field] = [obj.title for obj in getattr(activity, field).all()]
+    return card
+
+
 class ActivitySetUp(models.Model):
     """A database cache of form setups for TDP activities."""
 
@@ -337,50 +477,37 @@ class ActivitySetUp(models.Model):
         self.facet_setup = _facet_setup
 
     def update_cards(self):
-        _card_setup = {}
-        # The information needed for displaying each result of a query
-        facet_fields = (
-            "school_subject",
-            "grade_level",
-            "age_range",
-            "student_characteristics",
-            "activity_type",
-            "teaching_strategy",
-            "blooms_taxonomy_level",
-            "jump_start_coalition",
-            "council_for_economic_education",
-        )
-        base_query = ActivityPage.objects.filter(live=True).order_by(
-            "-date", "title"
-        )
-        self.card_order = [a.pk for a in base_query]
-        for activity in base_query:
-            payload = {
-                "url": activity.url,
-                "title": activity.title,
-                "date": activity.date.strftime("%b %d, %Y"),
-                "date_attr": activity.date.strftime("%Y-%m-%d"),
-                "ideal_for": ", ".join(
-                    [gl.title for gl in activity.grade_level.all()]
-                ),
-                "summary": activity.summary,
-                "topic": activity.get_topics_list(),
-                "activity_duration": activity.activity_duration.title,
-                "available_in_spanish": activity.activity_type.filter(
-                    title="Available in Spanish"
-                ).exists(),
-                "building_block": [
-                    {"title": blk.title, "svg_icon": blk.svg_icon}
-                    for blk in activity.building_block.all()
-                ],
-            }
-            for field in facet_fields:
-                facet_queryset = getattr(activity, field).all()
-                payload.update({field: [obj.title for obj in facet_queryset]})
-            _card_setup.update({str(activity.pk): payload})
-        self.card_setup = _card_setup
+        topics = get_topic_tree()
+        activities = get_card_queryset().order_by("-date", "title")
+        self.card_order = [activity.pk for activity in activities]
+        self.card_setup = {
+            str(activity.pk): build_card(activity, topics)
+            for activity in activities
+        }
+        self.__dict__.pop("ordered_cards", None)
+
+    def update_card(self, activity):
+        """Update the card for one activity, e.g. when it is published.
+
+        The card is removed if the activity isn't live. Facets are always
+        rebuilt, because they only include topics that have activities.
+        """
+        activity_pk = str(activity.pk)
+        activity = get_card_queryset().filter(pk=activity.pk).first()
 
-    @property
+        if activity:
+            self.card_setup[activity_pk] = build_card(
+                activity, get_topic_tree()
+            )
+        else:
+            self.card_setup.pop(activity_pk, None)
+
+        self.card_order = list(get_card_order())
+        self.__dict__.pop("ordered_cards", None)
+        self.update_facets()
+        self.save()
+
+    @cached_property
     def ordered_cards(self):
         return OrderedDict(
             {str(pk): self.card_setup[str(pk)] for pk in self.card_order}
@@ -392,6 +519,32 @@ class ActivitySetUp(models.Model):
         self.save()
 
 
+def get_activity_setup_cache_version():
+    return get_cache_version(ACTIVITY_SETUP_CACHE_VERSION_KEY)
+
+
+def invalidate_activity_setup_cache():
+    """Reload the activity setup in all processes, e.g. after a refresh."""
+    global _activity_setup
+
+    invalidate_cache_version(ACTIVITY_SETUP_CACHE_VERSION_KEY)
+    _activity_setup = None
+
+
+def get_cached_activity_setup():
+    """Return the activity setup, cached in memory in each process.
+
+    The returned setup is shared between requests and must not be modified.
+    """
+    global _activity_setup
+
+    version = get_activity_setup_cache_version()
+    if _activity_setup is None or _activity_setup[0] != version:
+        _activity_setup = (version, get_activity_setup())
+
+    return _activity_setup[1]
+
+
 def get_activity_setup(refresh=False):
     if not ActivitySetUp.objects.exists():
         ActivitySetUp().update_setups()
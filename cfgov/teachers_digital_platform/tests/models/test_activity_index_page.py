@@ -1,8 +1,11 @@
+import copy
 from collections import OrderedDict
 from unittest import mock
 
+from django.db import connection
 from django.http import HttpRequest
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from wagtail.core.blocks import StreamValue
 from wagtail.core.models import Site
@@ -32,10 +35,13 @@ from teachers_digital_platform.models import (
 )
 from teachers_digital_platform.models.activity_index_page import (
     Paginator,
+    get_cached_activity_setup,
+    invalidate_activity_setup_cache,
     parse_dsl_facets,
     validate_page_number,
 )
 from v1.models import HomePage
+from v1.signals import refresh_tdp_activity_cache
 
 
 class ActivityIndexPageTests(WagtailPageTests):
@@ -159,6 +165,57 @@ class ActivitySetUpTests(TestCase):
         new_setup_obj = get_activity_setup(refresh=True)
         self.assertNotEqual(setup_obj.card_setup, new_setup_obj.card_setup)
 
+    def test_card_topics_match_get_topics_list(self):
+        setup = get_activity_setup(refresh=True)
+        self.assertEqual(
+            setup.card_setup[str(self.activity_page.pk)]["topic"],
+            self.activity_page.get_topics_list(),
+        )
+
+    def test_update_cards_queries_do_not_grow_with_activities(self):
+        setup = get_activity_setup()
+        with CaptureQueriesContext(connection) as one_activity:
+            setup.update_cards()
+
+        activity_page = ActivityPage(
+            title="Another Test Activity Page",
+            slug="another-test-activity-page",
+            date="2020-02-22",
+            live=True,
+            summary="Students compare savings options",
+            big_idea="<p>Saving money is essential.</p>",
+            objectives="<ul><li>Compare savings options</li></ul>",
+            essential_questions="<ul><li>Where can I save?</li></ul>",
+            what_students_will_do="<ul><li>Compare options</li></ul>",
+            activity_file_id=1,
+            activity_duration_id=1,
+        )
+        self.search_page.add_child(instance=activity_page)
+        activity_page.topic = [1]
+        activity_page.grade_level = [1, 2]
+
+        with CaptureQueriesContext(connection) as two_activities:
+            setup.update_cards()
+
+        self.assertEqual(len(setup.card_setup), 2)
+        self.assertEqual(len(two_activities), len(one_activity))
+
+    def test_update_card(self):
+        setup = get_activity_setup()
+        self.activity_page.summary = "Changed summary"
+        self.activity_page.save()
+
+        setup.update_card(self.activity_page)
+        setup = ActivitySetUp.objects.first()
+        card = setup.ordered_cards[str(self.activity_page.pk)]
+        self.assertEqual(card["summary"], "Changed summary")
+
+        self.activity_page.live = False
+        self.activity_page.save()
+        setup.update_card(self.activity_page)
+        self.assertEqual(setup.card_order, [])
+        self.assertEqual(setup.ordered_cards, OrderedDict())
+
     def test_dsl_facet_parsing(self):
         all_facets = self.activity_page.activity_setups.facet_setup
         original_topic_count = len(all_facets["topic"])
@@ -203,35 +260,45 @@ class ActivitySetUpTests(TestCase):
             self.activity_page.title, response.content.decode("utf8")
         )
 
+    def mock_search(self, mock_search, buckets=None):
+        """Set up a search that returns the activity page as its only hit."""
+        response = mock.MagicMock()
+        response.hits.total.value = 1
+        hit = mock.Mock(id=self.activity_page.pk)
+        response.__iter__.side_effect = lambda: iter([hit])
+        for facet in FACET_LIST:
+            getattr(response.aggregations, f"{facet}_terms").buckets = (
+                buckets or {}
+            ).get(facet, [])
+
+        search = mock.MagicMock()
+        for method in ("query", "sort", "source", "update_from_dict", "extra"):
+            getattr(search, method).return_value = search
+        search.__getitem__.return_value = search
+        search.execute.return_value = response
+        mock_search.return_value = search
+        return search
+
     @mock.patch.object(ActivityPageDocument, "search")
     def test_search_page_renders_with_query_parameter(self, mock_search):
-        mock_hit = mock.Mock()
-        mock_hit.id = self.activity_page.pk
-        mock_search().query().count.return_value = 1
-        mock_search().query().__getitem__().execute.return_value = [mock_hit]
+        search = self.mock_search(mock_search)
         response = self.client.get(f"{self.search_page.url}?q=test-query")
         self.assertEqual(response.status_code, 200)
         self.assertIn("test-query", response.content.decode("utf8"))
+        self.assertIn(
+            self.activity_page.title, response.content.decode("utf8")
+        )
+
+        # Results, the total count, and facets come from a single request
+        # for only the page of results being shown.
+        search.execute.assert_called_once_with()
+        search.__getitem__.assert_called_once_with(slice(0, 5))
 
     @mock.patch.object(ActivityPageDocument, "search")
     def test_search_page_renders_with_facet_parameters(self, mock_search):
-        mock_hit = mock.Mock()
-        mock_hit.id = self.activity_page.pk
-        mock_search().query().count.return_value = 1
-        mock_search().query().__getitem__().execute.return_value = [mock_hit]
-        mock_facet_response = mock.Mock()
-        mock_facet_response.aggregations = mock.Mock()
-        mock_facet_response.aggregations.buckets = mock.Mock(
-            return_value=iter(
-                {"topic": [{"key": "1"}, {"key": "2"}, {"key": "3"}]}
-            )
-        )
-        mock_search().sort().query().count.return_value = 1
-        mock_search().sort().query().__getitem__().execute.return_value = [
-            mock_hit
-        ]
-        mock_search().sort().query().update_from_dict().__getitem__().execute.return_value = (  # noqa: B950
-            mock_facet_response
+        self.mock_search(
+            mock_search,
+            buckets={"topic": [{"key": "1"}, {"key": "2"}, {"key": "3"}]},
         )
         response = self.client.get(
             f"{self.search_page.url}?topic=1&topic=2&topic=3"
@@ -239,6 +306,39 @@ class ActivitySetUpTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("topic=1", response.content.decode("utf8"))
 
+    @mock.patch.object(ActivityPageDocument, "search")
+    def test_facet_search_does_not_modify_activity_setup(self, mock_search):
+        self.mock_search(mock_search, buckets={"topic": [{"key": "2"}]})
+        self.search_page.activity_setups = get_activity_setup()
+        facet_setup = copy.deepcopy(
+            self.search_page.activity_setups.facet_setup
+        )
+
+        request = RequestFactory().get("/", {"topic": ["1", "2"]})
+        context = self.search_page.dsl_search(request)
+
+        self.assertEqual(
+            self.search_page.activity_setups.facet_setup, facet_setup
+        )
+        self.assertNotEqual(context["facets"], facet_setup)
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        }
+    )
+    def test_cached_activity_setup(self):
+        invalidate_activity_setup_cache()
+        setup = get_cached_activity_setup()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_cached_activity_setup(), setup)
+
+        refresh_tdp_activity_cache()
+        self.assertIsNot(get_cached_activity_setup(), setup)
+
     def test_taxonomy_model_str(self):
         taxonomy_instance = ActivityBuildingBlock.objects.first()
         self.assertEqual(str(taxonomy_instance), taxonomy_instance.title)
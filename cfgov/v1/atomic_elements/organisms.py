@@ -1,5 +1,4 @@
 import itertools
-from collections import Counter
 from urllib.parse import urlencode
 
 from django.apps import apps
@@ -866,17 +865,23 @@ class FilterableList(BaseExpandable):
         js = ["filterable-list.js"]
 
     @staticmethod
-    def get_filterable_topics(filterable_page_ids, value):
-        """Given a set of page IDs, return the list of filterable topics"""
-        tags = Tag.objects.filter(
-            v1_cfgovtaggedpages_items__content_object__id__in=filterable_page_ids  # noqa: B950
-        ).values_list("slug", "name")
+    def get_filterable_topics(topic_slugs, value):
+        """Given tag slugs ordered by frequency, return the filterable topics
+
+        Topic slugs typically come from the facets of a filterable search.
+        """
+        tags = Tag.objects.filter(slug__in=topic_slugs).values_list(
+            "slug", "name"
+        )
 
         sort_order = value.get("topic_filtering", "sort_by_frequency")
         if sort_order == "sort_alphabetically":
-            return tags.distinct().order_by("name")
+            return list(tags.order_by("name"))
         elif sort_order == "sort_by_frequency":
-            return [tag for (tag, _) in Counter(tags).most_common()]
+            names = dict(tags)
+            return [
+                (slug, names[slug]) for slug in topic_slugs if slug in names
+            ]
         else:
             return []
 
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from html import unescape
 
 from django.core.exceptions import FieldDoesNotExist
@@ -5,10 +6,13 @@ from django.utils.html import strip_tags
 
 from django_opensearch_dsl import Document, fields
 from django_opensearch_dsl.registries import registry
-from opensearch_dsl import A
+from opensearch_dsl import A, MultiSearch
 from opensearch_dsl.query import MultiMatch
 
-from search.elasticsearch_helpers import environment_specific_index
+from search.elasticsearch_helpers import (
+    SearchPaginator,
+    environment_specific_index,
+)
 from v1.models.blog_page import BlogPage, LegacyBlogPage
 from v1.models.enforcement_action_page import EnforcementActionPage
 from v1.models.learn_page import (
@@ -114,6 +118,11 @@ class FilterablePagesDocument(Document):
 
 
 class FilterablePagesDocumentSearch:
+    # A terms aggregation only returns its 10 most common buckets by
+    # default, which would leave less common topics out of the filter
+    # options. Request enough buckets to list every topic tag in use.
+    facet_size = 1000
+
     def __init__(self, root_page, children_only=True):
         search = FilterablePagesDocument.search()
         search = search.filter("prefix", path=root_page.path)
@@ -124,6 +133,8 @@ class FilterablePagesDocumentSearch:
             search = search.filter("range", depth={"gt": root_page.depth})
 
         self.search_obj = search
+        self.facets_search = None
+        self.facets = None
 
     def filter_topics(self, topics=None):
         if topics is None:
@@ -202,6 +213,95 @@ class FilterablePagesDocumentSearch:
         self.order(order_by=order_by)
         return self.search_obj[0 : self.count()].to_queryset(keep_order=True)
 
+    def paginate(self, per_page, title="", order_by="date_published"):
+        """Return a paginator over the search results for the given title
+
+        Unlike search(), which returns every result, the paginator only
+        retrieves the pages it is asked for, along with the total result
+        count, in a single request per page.
+        """
+        self.search_title(title=title)
+        self.order(order_by=order_by)
+
+        # Only the page IDs are needed to look the pages up in the database.
+        return SearchPaginator(
+            self.search_obj.source(excludes=["*"]),
+            per_page,
+            results_factory=lambda search: search.to_queryset(keep_order=True),
+            execute=self.execute,
+        )
+
+    def request_facets(self):
+        """Plan a request for facets across the current results
+
+        Facets are computed for the results as they stand when this is
+        called, typically before any filters are applied. The request isn't
+        sent until either get_facets() or execute() is called, so that it
+        can share a single multi-search request with a page of results.
+        """
+        search = self.search_obj.extra(size=0, track_total_hits=True)
+        search.aggs.bucket(
+            "languages", A("terms", field="language", size=self.facet_size)
+        )
+        search.aggs.bucket(
+            "topics", A("terms", field="tags.slug", size=self.facet_size)
+        )
+        search.aggs.metric(
+            "first_date_published", A("min", field="date_published")
+        )
+
+        self.facets_search = search
+        self.facets = None
+
+    def get_facets(self):
+        """Return facets across the results, requesting them if necessary
+
+        Facets are returned as a dict containing the total result count,
+        the languages and topic slugs in use, ordered by frequency, and the
+        earliest publication date.
+        """
+        if self.facets is None:
+            if self.facets_search is None:
+                self.request_facets()
+
+            self.facets = self.parse_facets(self.facets_search.execute())
+
+        return self.facets
+
+    @staticmethod
+    def parse_facets(response):
+        first_date_published = response.aggregations.first_date_published
+
+        if first_date_published.value is not None:
+            first_date_published = datetime.fromtimestamp(
+                first_date_published.value / 1000, timezone.utc
+            ).date()
+        else:
+            first_date_published = None
+
+        return {
+            "total": response.hits.total.value,
+            "languages": [
+                b.key for b in response.aggregations.languages.buckets
+            ],
+            "topics": [b.key for b in response.aggregations.topics.buckets],
+            "first_date_published": first_date_published,
+        }
+
+    def execute(self, search):
+        """Execute a search, along with any facets request still pending"""
+        if self.facets is not None or self.facets_search is None:
+            return search.execute()
+
+        multi_search = MultiSearch().add(self.facets_search).add(search)
+        facets_response, response = multi_search.execute()
+        self.facets = self.parse_facets(facets_response)
+
+        # Cache the response on the search, as Search.execute() would, so
+        # that to_queryset() doesn't repeat the request.
+        search._response = response
+        return response
+
     def count(self):
         """Return the search object's current result count"""
         return self.search_obj.count()
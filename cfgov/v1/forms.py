@@ -128,9 +128,8 @@ class FilterableListForm(forms.Form):
         self.wagtail_block = kwargs.pop("wagtail_block")
         self.filterable_categories = kwargs.pop("filterable_categories")
 
-        # This cache key is used for caching the topics, page_ids,
-        # and the full set of Elasticsearch results for this form used to
-        # generate them.
+        # This cache key is used for caching the topics and the facets of
+        # the full set of Elasticsearch results used to generate them.
         # Default the cache key prefix to this form's hash if it's not
         # provided.
         self.cache_key_prefix = kwargs.pop("cache_key_prefix", hash(self))
@@ -139,45 +138,35 @@ class FilterableListForm(forms.Form):
 
         clean_categories(selected_categories=self.data.get("categories"))
 
-        self.all_filterable_results = self.get_all_filterable_results()
-        page_ids = self.get_all_page_ids()
-        self.set_topics(page_ids)
-        self.set_languages()
+        # If the facets aren't cached, plan a request for them now, before
+        # any filters are applied. They are only needed to validate topic or
+        # language filters, so if neither is used, the request is combined
+        # with the request for the page of results.
+        self.facets = cache.get(f"{self.cache_key_prefix}-facets")
+        if self.facets is None:
+            self.filterable_search.request_facets()
 
-    def get_all_filterable_results(self):
-        """Get all filterable document results from Elasticsearch
+        self._topics = None
+        self.fields["topics"].choices = self.get_topics
+        self.fields["language"].choices = self.get_languages
 
-        This set of results is used to populate the list of all page_ids,
-        below, which is in turn used for populating the topics
-        relevant to those pages.
+    def get_facets(self):
+        """Get facets across all filterable document results
 
-        This first document in this result set is also used to determine the
-        earliest post date, also below, when a to_date is given but
-        from_date is not.
+        These facets are used to populate the topics and languages relevant
+        to the filterable pages and to determine the earliest post date,
+        below, when a to_date is given but from_date is not.
         """
-        # Cache the full list of filterable results. This avoids having to
-        # generate the same list with every request. When a filterable page is
-        # is saved, the cache key for this fix prefix will be deleted.
-        all_filterable_results = cache.get(
-            f"{self.cache_key_prefix}-all_filterable_results"
-        )
-        if all_filterable_results is None:
-            all_filterable_results = self.filterable_search.get_raw_results()
-            cache.set(
-                f"{self.cache_key_prefix}-all_filterable_results",
-                all_filterable_results,
-            )
-        return all_filterable_results
-
-    def get_all_page_ids(self):
-        """Return a list of all possible filterable page ids"""
-        page_ids = cache.get(f"{self.cache_key_prefix}-page_ids")
-        if page_ids is None:
-            page_ids = [
-                result.meta.id for result in self.all_filterable_results
-            ]
-            cache.set(f"{self.cache_key_prefix}-page_ids", page_ids)
-        return page_ids
+        # Cache the facets across all filterable results. This avoids having
+        # to request the same facets with every request. When a filterable
+        # page is saved, the cache key for this prefix will be deleted.
+        if self.facets is None:
+            self.facets = self.filterable_search.get_facets()
+            cache.set(f"{self.cache_key_prefix}-facets", self.facets)
+        return self.facets
+
+    def has_unfiltered_results(self):
+        return self.get_facets()["total"] > 0
 
     def get_categories(self):
         categories = self.cleaned_data.get("categories")
@@ -196,27 +185,36 @@ class FilterableListForm(forms.Form):
         else:
             return "-date_published"
 
-    def get_page_set(self):
-        categories = self.get_categories()
-
-        self.filterable_search.filter(
-            topics=self.cleaned_data.get("topics"),
-            categories=categories,
-            language=self.cleaned_data.get("language"),
-            to_date=self.cleaned_data.get("to_date"),
-            from_date=self.cleaned_data.get("from_date"),
-        )
+    def get_filter_kwargs(self):
+        return {
+            "topics": self.cleaned_data.get("topics"),
+            "categories": self.get_categories(),
+            "language": self.cleaned_data.get("language"),
+            "to_date": self.cleaned_data.get("to_date"),
+            "from_date": self.cleaned_data.get("from_date"),
+        }
+
+    def get_search_kwargs(self):
+        return {
+            "title": self.cleaned_data.get("title"),
+            "order_by": self.get_order_by(),
+        }
 
-        results = self.filterable_search.search(
-            title=self.cleaned_data.get("title"), order_by=self.get_order_by()
+    def get_page_set(self):
+        self.filterable_search.filter(**self.get_filter_kwargs())
+        return self.filterable_search.search(**self.get_search_kwargs())
+
+    def get_paginator(self, per_page):
+        """Return a paginator that retrieves one page of results at a time"""
+        self.filterable_search.filter(**self.get_filter_kwargs())
+        return self.filterable_search.paginate(
+            per_page, **self.get_search_kwargs()
         )
 
-        return results
-
     def first_page_date(self):
-        if len(self.all_filterable_results) > 0:
-            first_post = self.all_filterable_results[0]
-            return first_post.date_published.date()
+        first_date_published = self.get_facets()["first_date_published"]
+        if first_date_published is not None:
+            return first_date_published
         return date(2010, 1, 1)
 
     def prepare_options(self, arr):
@@ -229,28 +227,28 @@ class FilterableListForm(forms.Form):
         # which includes a count we do not need
         return [x[0] for x in arr]
 
-    # Populate Topics' choices
-    def set_topics(self, page_ids):
-        if self.wagtail_block:
+    # Topics' choices
+    def get_topics(self):
+        if not self.wagtail_block:
+            return []
+
+        if self._topics is None:
             # Cache the topics for this filterable list form to avoid
             # repeated database lookups of the same data.
-            sentinel = object()
             topics = cache.get(f"{self.cache_key_prefix}-topics")
-            if topics is None or topics is sentinel:
+            if topics is None:
                 topics = self.wagtail_block.block.get_filterable_topics(
-                    page_ids, self.wagtail_block.value
+                    self.get_facets()["topics"], self.wagtail_block.value
                 )
                 cache.set(f"{self.cache_key_prefix}-topics", topics)
+            self._topics = topics
 
-            self.fields["topics"].choices = topics
+        return self._topics
 
-    # Populate language choices
-    def set_languages(self):
+    # Language choices
+    def get_languages(self):
         # Get the list of codes in the full set of searchable pages.
-        language_aggregation = (
-            self.all_filterable_results.aggregations.languages
-        )
-        language_codes = {b.key for b in language_aggregation.buckets}
+        language_codes = set(self.get_facets()["languages"])
 
         # Grab the language names from the reference list.
         language_options = [
@@ -260,9 +258,7 @@ class FilterableListForm(forms.Form):
         ]
 
         # Sort the list of languages by their names.
-        self.fields["language"].choices = sorted(
-            language_options, key=itemgetter(1)
-        )
+        return sorted(language_options, key=itemgetter(1))
 
     def clean(self):
         cleaned_data = super().clean()
@@ -368,35 +364,30 @@ class EnforcementActionsFilterForm(FilterableListForm):
         ),
     )
 
-    def get_page_set(self):
-        self.filterable_search.filter(
-            topics=self.cleaned_data.get("topics"),
-            categories=self.cleaned_data.get("categories"),
-            language=self.cleaned_data.get("language"),
-            to_date=self.cleaned_data.get("to_date"),
-            from_date=self.cleaned_data.get("from_date"),
-            statuses=self.cleaned_data.get("statuses"),
-            products=self.cleaned_data.get("products"),
-        )
-        results = self.filterable_search.search(
-            title=self.cleaned_data.get("title"),
-        )
-        return results
+    def get_filter_kwargs(self):
+        return {
+            "topics": self.cleaned_data.get("topics"),
+            "categories": self.cleaned_data.get("categories"),
+            "language": self.cleaned_data.get("language"),
+            "to_date": self.cleaned_data.get("to_date"),
+            "from_date": self.cleaned_data.get("from_date"),
+            "statuses": self.cleaned_data.get("statuses"),
+            "products": self.cleaned_data.get("products"),
+        }
+
+    def get_search_kwargs(self):
+        return {"title": self.cleaned_data.get("title")}
 
 
 class EventArchiveFilterForm(FilterableListForm):
-    def get_page_set(self):
-        self.filterable_search.filter(
-            topics=self.cleaned_data.get("topics"),
-            categories=self.cleaned_data.get("categories"),
-            language=self.cleaned_data.get("language"),
-            to_date=self.cleaned_data.get("to_date"),
-            from_date=self.cleaned_data.get("from_date"),
-        )
-        results = self.filterable_search.search(
-            title=self.cleaned_data.get("title"), order_by=self.get_order_by()
-        )
-        return results
+    def get_filter_kwargs(self):
+        return {
+            "topics": self.cleaned_data.get("topics"),
+            "categories": self.cleaned_data.get("categories"),
+            "language": self.cleaned_data.get("language"),
+            "to_date": self.cleaned_data.get("to_date"),
+            "from_date": self.cleaned_data.get("from_date"),
+        }
 
 
 class CFGOVImageForm(BaseImageForm):
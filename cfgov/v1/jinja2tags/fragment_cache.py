@@ -1,5 +1,6 @@
 # Based off of http://jinja.pocoo.org/docs/2.10/extensions/
 from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
 from jinja2 import nodes
 from jinja2.ext import Extension
@@ -24,11 +25,9 @@ class FragmentCacheExtension(Extension):
             args.append(parser.parse_expression())
 
         # If there is a third argument, the user provided a timeout.
-        # If not use None
+        # If not use the cache's default timeout
         if parser.stream.skip_if("comma"):
             args.append(parser.parse_expression())
-        else:
-            args.append(nodes.Const(None))
 
         # now we parse the body of the cache block up to `endcache` and
         # drop the needle (which would always be `endcache` in that case)
@@ -40,7 +39,9 @@ class FragmentCacheExtension(Extension):
             self.call_method("_cache_support", args), [], [], body
         ).set_lineno(lineno)
 
-    def _cache_support(self, key, cache_name, timeout, caller):
+    def _cache_support(
+        self, key, cache_name, timeout=DEFAULT_TIMEOUT, caller=None
+    ):
         """Helper callback."""
         fragment_cache = caches[cache_name]
         # try to load the block from the cache
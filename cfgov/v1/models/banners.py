@@ -1,3 +1,6 @@
+import logging
+import re
+
 from django.core.validators import RegexValidator
 from django.db import models
 from django.utils.safestring import mark_safe
@@ -5,9 +8,20 @@ from django.utils.safestring import mark_safe
 from wagtail.admin.edit_handlers import FieldPanel, StreamFieldPanel
 from wagtail.core.fields import StreamField
 
+from core.cache import get_cache_version, invalidate_cache_version
 from v1.atomic_elements.molecules import Notification
 
 
+logger = logging.getLogger(__name__)
+
+
+BANNERS_CACHE_VERSION_KEY = "banners-version"
+
+# Per-process list of enabled banners and their compiled URL patterns, along
+# with the cache version they were loaded at.
+_enabled_banners = None
+
+
 class Banner(models.Model):
     title = models.CharField(
         max_length=255,
@@ -36,3 +50,54 @@ class Banner(models.Model):
 
     def __str__(self):
         return self.title
+
+
+def get_banners_cache_version():
+    return get_cache_version(BANNERS_CACHE_VERSION_KEY)
+
+
+def invalidate_banners():
+    """Reload enabled banners in all processes, e.g. when a banner changes."""
+    global _enabled_banners
+
+    invalidate_cache_version(BANNERS_CACHE_VERSION_KEY)
+    _enabled_banners = None
+
+
+def load_enabled_banners():
+    """Return a list of (compiled URL pattern, banner) for enabled banners."""
+    enabled_banners = []
+
+    for banner in Banner.objects.filter(enabled=True).order_by("pk"):
+        try:
+            pattern = re.compile(banner.url_pattern)
+        except re.error:
+            logger.warning(
+                "Ignoring banner %s with invalid URL pattern %r",
+                banner.pk,
+                banner.url_pattern,
+            )
+            continue
+
+        enabled_banners.append((pattern, banner))
+
+    return enabled_banners
+
+
+def get_banners_for_path(path):
+    """Return enabled banners whose URL pattern matches a request path.
+
+    Banners are matched in memory. They are only loaded from the database
+    when a banner has been saved or deleted since they were last loaded.
+    """
+    global _enabled_banners
+
+    version = get_banners_cache_version()
+    if _enabled_banners is None or _enabled_banners[0] != version:
+        _enabled_banners = (version, load_enabled_banners())
+
+    return [
+        banner
+        for pattern, banner in _enabled_banners[1]
+        if pattern.search(path)
+    ]
@@ -1,9 +1,11 @@
 import re
+from collections import OrderedDict
 from operator import itemgetter
+from threading import Lock
 
 from django.conf import settings
 from django.db import models
-from django.db.models import F, Q, Value
+from django.db.models import Q
 from django.utils import translation
 from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
@@ -29,12 +31,46 @@ from wagtailinventory.helpers import get_page_blocks
 
 from v1 import blocks as v1_blocks
 from v1.atomic_elements import molecules, organisms
-from v1.models.banners import Banner
+from v1.models.banners import get_banners_for_path
 from v1.models.snippets import ReusableText
 from v1.util import ref
 from v1.util.util import validate_social_sharing_image
 
 
+# Per-process cache of the StreamField block media classes used by live pages,
+# keyed by page ID. Each entry records the live revision it was computed for,
+# so that it isn't used once the page has been republished.
+STREAMFIELD_MEDIA_CACHE_SIZE = 1000
+_streamfield_media_cache = OrderedDict()
+_streamfield_media_cache_lock = Lock()
+
+
+def get_cached_streamfield_media(page_id, revision_id):
+    with _streamfield_media_cache_lock:
+        entry = _streamfield_media_cache.get(page_id)
+        if entry is None or entry[0] != revision_id:
+            return None
+
+        _streamfield_media_cache.move_to_end(page_id)
+        return entry[1]
+
+
+def set_cached_streamfield_media(page_id, revision_id, media):
+    with _streamfield_media_cache_lock:
+        _streamfield_media_cache[page_id] = (revision_id, media)
+        _streamfield_media_cache.move_to_end(page_id)
+        while len(_streamfield_media_cache) > STREAMFIELD_MEDIA_CACHE_SIZE:
+            _streamfield_media_cache.popitem(last=False)
+
+
+def invalidate_streamfield_media(page_id=None):
+    with _streamfield_media_cache_lock:
+        if page_id is None:
+            _streamfield_media_cache.clear()
+        else:
+            _streamfield_media_cache.pop(page_id, None)
+
+
 class CFGOVAuthoredPages(TaggedItemBase):
     content_object = ParentalKey("CFGOVPage")
 
@@ -337,16 +373,7 @@ class CFGOVPage(Page):
 
         # Add any banners that are enabled and match the current request path
         # to a context variable.
-        context["banners"] = (
-            Banner.objects.filter(enabled=True)
-            .annotate(
-                # This annotation creates a path field in the QuerySet
-                # that we can use in the filter below to compare with
-                # the url_pattern defined on each enabled banner.
-                path=Value(request.path, output_field=models.CharField())
-            )
-            .filter(path__regex=F("url_pattern"))
-        )
+        context["banners"] = get_banners_for_path(request.path)
 
         if self.schema_json:
             context["schema_json"] = self.schema_json
@@ -361,16 +388,47 @@ class CFGOVPage(Page):
         request.LANGUAGE_CODE = translation.get_language()
         return super().serve(request, *args, **kwargs)
 
+    # Set when this page is being served live, so that the media used by its
+    # StreamField blocks can be reused across requests. See the
+    # set_streamfield_media_cache hook in v1.wagtail_hooks.
+    cache_streamfield_media = False
+
+    def get_streamfield_media_classes(self):
+        """Return the Media classes of blocks used in this page's StreamFields.
+
+        Walking the page's StreamFields is expensive, so this is done at most
+        once per instance, and at most once per live revision for pages that
+        are being served live.
+        """
+        media_classes = getattr(self, "_streamfield_media_classes", None)
+        if media_classes is not None:
+            return media_classes
+
+        if self.cache_streamfield_media:
+            media_classes = get_cached_streamfield_media(
+                self.pk, self.live_revision_id
+            )
+
+        if media_classes is None:
+            media_classes = []
+            for block_cls_name in get_page_blocks(self):
+                block_cls = import_string(block_cls_name)
+                if hasattr(block_cls, "Media"):
+                    media_classes.append(block_cls.Media)
+
+            if self.cache_streamfield_media:
+                set_cached_streamfield_media(
+                    self.pk, self.live_revision_id, media_classes
+                )
+
+        self._streamfield_media_classes = media_classes
+        return media_classes
+
     def streamfield_media(self, media_type):
         media = []
 
-        block_cls_names = get_page_blocks(self)
-        for block_cls_name in block_cls_names:
-            block_cls = import_string(block_cls_name)
-            if hasattr(block_cls, "Media") and hasattr(
-                block_cls.Media, media_type
-            ):
-                media.extend(getattr(block_cls.Media, media_type))
+        for media_cls in self.get_streamfield_media_classes():
+            media.extend(getattr(media_cls, media_type, []))
 
         return media
 
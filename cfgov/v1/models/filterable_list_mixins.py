@@ -77,17 +77,19 @@ class FilterableListMixin(ShareableRoutablePageMixin):
         context = super().get_context(request, *args, **kwargs)
 
         form_data, has_active_filters = self.get_form_data(request.GET)
-        filterable_search = self.get_filterable_search()
-        has_unfiltered_results = filterable_search.count() > 0
         form = self.get_form_class()(
             form_data,
             wagtail_block=self.get_filterable_list_wagtail_block(),
             filterable_categories=self.filterable_categories,
-            filterable_search=filterable_search,
+            filterable_search=self.get_filterable_search(),
             cache_key_prefix=self.get_cache_key_prefix(),
         )
         filter_data = self.process_form(request, form)
 
+        # The form requests facets across all unfiltered results alongside
+        # the page of results, so this doesn't require another request.
+        has_unfiltered_results = form.has_unfiltered_results()
+
         context.update(
             {
                 "filter_data": filter_data,
@@ -102,9 +104,7 @@ class FilterableListMixin(ShareableRoutablePageMixin):
     def process_form(self, request, form):
         filter_data = {}
         if form.is_valid():
-            paginator = Paginator(
-                form.get_page_set(), self.filterable_per_page_limit
-            )
+            paginator = form.get_paginator(self.filterable_per_page_limit)
             page = request.GET.get("page")
 
             # Get the page number in the request and get the page from the
@@ -1,24 +1,45 @@
+import logging
 from datetime import timedelta
 from itertools import chain
 
 from django.conf import settings
 from django.core.cache import cache, caches
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from wagtail.core.signals import page_published, page_unpublished
+from wagtail.core.models import Page
+from wagtail.core.signals import (
+    page_published,
+    page_unpublished,
+    post_page_move,
+)
+from wagtail.documents import get_document_model
+
+import requests
 
+from core.middleware import (
+    get_parse_links_cache_key,
+    invalidate_all_parse_links_cache,
+)
 from teachers_digital_platform.models.activity_index_page import (
     ActivityPage,
     ActivitySetUp,
+    invalidate_activity_setup_cache,
 )
 from v1.models import AbstractFilterPage, CFGOVPage
+from v1.models.banners import Banner, invalidate_banners
+from v1.models.base import invalidate_streamfield_media
 from v1.models.caching import AkamaiBackend
 from v1.models.filterable_list_mixins import (
     CategoryFilterableMixin,
     FilterableListMixin,
 )
 from v1.util.ref import get_category_children
+from v1.util.util import invalidate_secondary_nav_cache
+
+
+logger = logging.getLogger(__name__)
 
 
 def new_phi(user, expiration_days=90, locked_days=1):
@@ -64,6 +85,71 @@ def invalidate_post_preview(sender, **kwargs):
 page_published.connect(invalidate_post_preview)
 
 
+def invalidate_page_streamfield_media(sender, **kwargs):
+    invalidate_streamfield_media(kwargs["instance"].pk)
+
+
+page_published.connect(invalidate_page_streamfield_media)
+page_unpublished.connect(invalidate_page_streamfield_media)
+
+
+def invalidate_parse_links_cache(sender, **kwargs):
+    """Invalidate the cached content of a page at its own URL."""
+    page = kwargs["instance"]
+
+    if not isinstance(page, CFGOVPage):
+        return
+
+    url_parts = page.get_url_parts()
+    if url_parts is None:
+        return
+
+    caches["parse_links"].delete(
+        get_parse_links_cache_key(page.pk, page.language, url_parts[2])
+    )
+
+
+page_published.connect(invalidate_parse_links_cache)
+page_unpublished.connect(invalidate_parse_links_cache)
+
+
+def invalidate_all_parse_links(sender, **kwargs):
+    """Invalidate the cached content of every page.
+
+    Rich text links to pages and documents are only turned into URLs when
+    content is served, so moving a page or changing a document can change
+    the content of any page that links to it.
+    """
+    invalidate_all_parse_links_cache()
+
+
+post_page_move.connect(invalidate_all_parse_links)
+post_save.connect(invalidate_all_parse_links, sender=get_document_model())
+post_delete.connect(invalidate_all_parse_links, sender=get_document_model())
+
+
+@receiver(pre_save)
+def invalidate_parse_links_on_slug_change(sender, instance, **kwargs):
+    """Invalidate the cached content of every page if a page's URL changes.
+
+    Changing a page's slug changes its URL, and those of its descendants,
+    in the same way as moving it.
+    """
+    if not isinstance(instance, Page) or instance.pk is None:
+        return
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "slug" not in update_fields:
+        return
+
+    if (
+        Page.objects.filter(pk=instance.pk)
+        .exclude(slug=instance.slug)
+        .exists()
+    ):
+        invalidate_all_parse_links_cache()
+
+
 def invalidate_filterable_list_caches(sender, **kwargs):
     """Invalidate filterable list caches when necessary
 
@@ -110,8 +196,7 @@ def invalidate_filterable_list_caches(sender, **kwargs):
         cache_key_prefix = filterable_list_page.get_cache_key_prefix()
 
         # Delete internal cache for the filterable list page
-        cache.delete(f"{cache_key_prefix}-all_filterable_results")
-        cache.delete(f"{cache_key_prefix}-page_ids")
+        cache.delete(f"{cache_key_prefix}-facets")
         cache.delete(f"{cache_key_prefix}-topics")
         cache.delete(f"{cache_key_prefix}-authors")
 
@@ -122,19 +207,60 @@ def invalidate_filterable_list_caches(sender, **kwargs):
     # page belongs to any
     if len(cache_tags_to_purge) > 0:
         cache_backend = configure_akamai_backend()
-        cache_backend.purge_by_tags(cache_tags_to_purge)
+
+        # A failed purge shouldn't prevent the page from being published;
+        # the cached filterable list pages will expire on their own.
+        try:
+            cache_backend.purge_by_tags(cache_tags_to_purge)
+        except requests.RequestException:
+            logger.exception(
+                "Failed to purge cache tags %s", ", ".join(cache_tags_to_purge)
+            )
 
 
 page_published.connect(invalidate_filterable_list_caches)
 page_unpublished.connect(invalidate_filterable_list_caches)
 
 
-def refresh_tdp_activity_cache():
-    """Refresh the activity setups when a live ActivityPage is changed."""
+def invalidate_secondary_nav(sender, **kwargs):
+    invalidate_secondary_nav_cache()
+
+
+def invalidate_secondary_nav_on_delete(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        invalidate_secondary_nav_cache()
+
+
+page_published.connect(invalidate_secondary_nav)
+page_unpublished.connect(invalidate_secondary_nav)
+post_page_move.connect(invalidate_secondary_nav)
+post_delete.connect(invalidate_secondary_nav_on_delete)
+
+
+def reload_banners(sender, **kwargs):
+    invalidate_banners()
+
+
+post_save.connect(reload_banners, sender=Banner)
+post_delete.connect(reload_banners, sender=Banner)
+
+
+def refresh_tdp_activity_cache(activity=None):
+    """Refresh the activity setups when a live ActivityPage is changed.
+
+    If the cards have already been built, only the card for the changed
+    activity is updated; otherwise all of them are built.
+    """
     activity_setup = ActivitySetUp.objects.first()
     if not activity_setup:
         activity_setup = ActivitySetUp()
-    activity_setup.update_setups()
+
+    if activity is not None and activity_setup.card_setup is not None:
+        activity_setup.update_card(activity)
+    else:
+        activity_setup.update_setups()
+
+    invalidate_activity_setup_cache()
 
 
 def configure_akamai_backend():
@@ -152,4 +278,4 @@ def configure_akamai_backend():
 @receiver(page_published, sender=ActivityPage)
 @receiver(page_unpublished, sender=ActivityPage)
 def activity_published_handler(instance, **kwargs):
-    refresh_tdp_activity_cache()
+    refresh_tdp_activity_cache(instance)
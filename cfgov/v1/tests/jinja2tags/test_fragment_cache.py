@@ -129,3 +129,16 @@ class TestFragmentCacheJinjaTag(TestCase):
         # should return 'bar', because the 'other' cache doesn't know
         # about the previous call.
         self.assertEqual(self._render_tag(value, cache_name="other"), "bar")
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "test-fragment-cache-extension-timeout",
+                "TIMEOUT": 0,
+            },
+        }
+    )
+    def test_cache_default_timeout_is_used(self):
+        self._render_tag("foo", cache_name="default")
+        self.assertEqual(self._render_tag("bar", cache_name="default"), "bar")
@@ -1,7 +1,7 @@
 import json
 from unittest import mock
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
 
 from wagtail.core import blocks
@@ -14,8 +14,13 @@ from v1.models import (
     LandingPage,
     SublandingPage,
 )
-from v1.models.banners import Banner
-from v1.tests.wagtail_pages.helpers import save_new_page
+from v1.models.banners import (
+    Banner,
+    get_banners_for_path,
+    invalidate_banners,
+)
+from v1.models.base import invalidate_streamfield_media
+from v1.tests.wagtail_pages.helpers import publish_changes, save_new_page
 
 
 class TestCFGOVPage(TestCase):
@@ -72,7 +77,52 @@ class TestCFGOVPageContext(TestCase):
         Banner.objects.create(title="Banner3", url_pattern="/", enabled=False)
         Banner.objects.create(title="Banner4", url_pattern="foo", enabled=True)
         test_context = self.page.get_context(self.request)
-        self.assertEqual(test_context["banners"].count(), 2)
+        self.assertEqual(len(test_context["banners"]), 2)
+
+    def test_get_context_banner_with_invalid_pattern_is_ignored(self):
+        Banner.objects.create(title="Banner", url_pattern="/", enabled=True)
+        Banner.objects.create(title="Banner2", url_pattern="(", enabled=True)
+        test_context = self.page.get_context(self.request)
+        self.assertEqual(
+            [banner.title for banner in test_context["banners"]], ["Banner"]
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        }
+    )
+    def test_get_context_banners_are_matched_in_memory(self):
+        invalidate_banners()
+        Banner.objects.create(title="Banner", url_pattern="^/$", enabled=True)
+        self.page.get_context(self.request)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(get_banners_for_path("/"))
+            self.assertFalse(get_banners_for_path("/foo/"))
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            },
+        }
+    )
+    def test_get_context_banners_reloaded_when_banner_saved(self):
+        invalidate_banners()
+        banner = Banner.objects.create(
+            title="Banner", url_pattern="foo", enabled=True
+        )
+        self.assertFalse(self.page.get_context(self.request)["banners"])
+
+        banner.url_pattern = "/"
+        banner.save()
+        self.assertTrue(self.page.get_context(self.request)["banners"])
+
+        banner.delete()
+        self.assertFalse(self.page.get_context(self.request)["banners"])
 
     def test_get_context_no_schema_json(self):
         test_context = self.page.get_context(self.request)
@@ -432,6 +482,76 @@ class TestCFGOVPageMediaCSSProperty(TestCase):
         self.assertEqual(page.media_css, [])
 
 
+class TestCFGOVPageStreamfieldMediaCaching(TestCase):
+    def setUp(self):
+        invalidate_streamfield_media()
+        self.page = BrowsePage(title="Browse page")
+        self.page.content = blocks.StreamValue(
+            self.page.content.stream_block,
+            [{"type": "simple_chart", "value": {}}],
+            True,
+        )
+        save_new_page(self.page).publish()
+
+    def get_live_page(self):
+        page = BrowsePage.objects.get(pk=self.page.pk)
+        page.cache_streamfield_media = True
+        return page
+
+    def test_page_blocks_walked_once_per_instance(self):
+        with mock.patch(
+            "v1.models.base.get_page_blocks", return_value=[]
+        ) as get_page_blocks:
+            page = BrowsePage.objects.get(pk=self.page.pk)
+            page.media_js
+            page.media_css
+            page.media_css
+
+        get_page_blocks.assert_called_once()
+
+    def test_page_blocks_not_cached_across_instances_by_default(self):
+        with mock.patch(
+            "v1.models.base.get_page_blocks", return_value=[]
+        ) as get_page_blocks:
+            BrowsePage.objects.get(pk=self.page.pk).media_css
+            BrowsePage.objects.get(pk=self.page.pk).media_css
+
+        self.assertEqual(get_page_blocks.call_count, 2)
+
+    def test_live_page_media_cached_across_instances(self):
+        self.assertEqual(self.get_live_page().media_css, ["simple-chart.css"])
+
+        with mock.patch("v1.models.base.get_page_blocks") as get_page_blocks:
+            self.assertEqual(
+                self.get_live_page().media_css, ["simple-chart.css"]
+            )
+
+        get_page_blocks.assert_not_called()
+
+    def test_publishing_invalidates_cached_media(self):
+        self.assertEqual(self.get_live_page().media_css, ["simple-chart.css"])
+
+        page = BrowsePage.objects.get(pk=self.page.pk)
+        page.content = blocks.StreamValue(
+            page.content.stream_block,
+            [{"type": "full_width_text", "value": []}],
+            True,
+        )
+        publish_changes(page)
+
+        self.assertEqual(self.get_live_page().media_css, [])
+
+    def test_served_page_caches_media(self):
+        self.client.get(self.page.url)
+
+        with mock.patch("v1.models.base.get_page_blocks") as get_page_blocks:
+            self.assertEqual(
+                self.get_live_page().media_css, ["simple-chart.css"]
+            )
+
+        get_page_blocks.assert_not_called()
+
+
 class TestCFGOVPageCopy(TestCase):
     def setUp(self):
         self.site = Site.objects.first()
@@ -193,6 +193,33 @@ class FilterableSearchTests(ElasticsearchWagtailPageTreeTestCase):
         self.assertEqual(search.search(title="child1").count(), 2)
         self.assertEqual(search.search(title="child3").count(), 0)
 
+    def test_paginate(self):
+        search = FilterablePagesDocumentSearch(
+            self.page_tree[0], children_only=False
+        )
+        paginator = search.paginate(3, title="child")
+        page = paginator.page(2)
+        self.assertEqual(paginator.count, 4)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(len(page), 1)
+        self.assertFalse(page.has_next())
+
+    def test_get_facets(self):
+        search = FilterablePagesDocumentSearch(self.page_tree[0])
+        facets = search.get_facets()
+        self.assertEqual(facets["total"], 2)
+        self.assertEqual(facets["languages"], ["en"])
+        self.assertEqual(facets["topics"], [])
+        self.assertIsNotNone(facets["first_date_published"])
+
+    def test_facets_are_computed_before_filters(self):
+        search = FilterablePagesDocumentSearch(self.page_tree[0])
+        search.request_facets()
+        search.filter(language=["es"])
+        paginator = search.paginate(25)
+        self.assertEqual(paginator.page(1).paginator.count, 0)
+        self.assertEqual(search.facets["total"], 2)
+
     def test_get_raw_results(self):
         search = FilterablePagesDocumentSearch(self.page_tree[0])
         results = search.get_raw_results()
@@ -1,6 +1,7 @@
 from datetime import date, datetime
 from io import StringIO
 from time import sleep
+from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 
@@ -107,7 +108,7 @@ class TestFilterableListForm(ElasticsearchTestsMixin, TestCase):
     def test_form_language_choices(self):
         form = self.setUpFilterableForm()
         self.assertEqual(
-            form.fields["language"].choices,
+            list(form.fields["language"].choices),
             [
                 ("en", "English"),
                 ("es", "Spanish"),
@@ -126,6 +127,14 @@ class TestFilterableListForm(ElasticsearchTestsMixin, TestCase):
         self.assertEqual(len(page_set), 1)
         self.assertEqual(page_set[0].specific, self.cool_event)
 
+    def test_get_paginator(self):
+        form = self.setUpFilterableForm(data={"title": "test page"})
+        paginator = form.get_paginator(1)
+        self.assertEqual(paginator.count, 3)
+        page = paginator.page(1)
+        self.assertEqual(len(page), 1)
+        self.assertTrue(page.has_next())
+
     def test_validate_date_after_1900_can_pass(self):
         form = self.setUpFilterableForm()
         form.data = {"from_date": "1/1/1900"}
@@ -183,9 +192,26 @@ class TestFilterableListForm(ElasticsearchTestsMixin, TestCase):
     def test_first_page_date(self):
         form = self.setUpFilterableForm()
         self.assertEqual(form.first_page_date(), self.blog1.date_published)
-        form.all_filterable_results = []
+        form.facets["first_date_published"] = None
         self.assertEqual(form.first_page_date(), date(2010, 1, 1))
 
+    def test_facets(self):
+        form = self.setUpFilterableForm()
+        facets = form.get_facets()
+        self.assertEqual(facets["total"], 6)
+        self.assertTrue(form.has_unfiltered_results())
+        self.assertCountEqual(facets["languages"], ["en", "es"])
+        self.assertEqual(facets["topics"][0], "bar")
+
+    def test_facets_share_request_with_page_of_results(self):
+        form = self.setUpFilterableForm(data={"categories": []})
+        with patch("opensearch_dsl.search.Search.execute") as execute:
+            page = form.get_paginator(25).page(1)
+            execute.assert_not_called()
+
+        self.assertEqual(page.paginator.count, 6)
+        self.assertEqual(form.get_facets()["total"], 6)
+
 
 @override_settings(OPENSEARCH_DSL_AUTOSYNC=True)
 class TestEventArchiveFilterForm(ElasticsearchTestsMixin, TestCase):
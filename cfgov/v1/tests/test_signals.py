@@ -1,9 +1,18 @@
 from unittest import TestCase, mock
 
+from django.core.cache import caches
 from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
 
 from wagtail.core.models import Site
+from wagtail.documents import get_document_model
 
+import requests
+
+from core.middleware import (
+    PARSE_LINKS_CACHE_VERSION_KEY,
+    get_parse_links_cache_key,
+)
 from teachers_digital_platform.models import ActivityPage, ActivitySetUp
 from v1.models import (
     BlogPage,
@@ -13,7 +22,10 @@ from v1.models import (
     NewsroomPage,
     SublandingFilterablePage,
 )
-from v1.signals import invalidate_filterable_list_caches
+from v1.signals import (
+    invalidate_filterable_list_caches,
+    invalidate_parse_links_cache,
+)
 
 
 class FilterableListInvalidationTestCase(TestCase):
@@ -55,10 +67,7 @@ class FilterableListInvalidationTestCase(TestCase):
             self.filterable_list_page.get_cache_key_prefix(),
             self.category_filterable_list_page.get_cache_key_prefix(),
         ):
-            mock_cache.delete.assert_any_call(
-                f"{cache_key_prefix}-all_filterable_results"
-            )
-            mock_cache.delete.assert_any_call(f"{cache_key_prefix}-page_ids")
+            mock_cache.delete.assert_any_call(f"{cache_key_prefix}-facets")
             mock_cache.delete.assert_any_call(f"{cache_key_prefix}-topics")
             mock_cache.delete.assert_any_call(f"{cache_key_prefix}-authors")
 
@@ -67,6 +76,19 @@ class FilterableListInvalidationTestCase(TestCase):
             self.filterable_list_page.slug, mock_purge.mock_calls[0].args[0]
         )
 
+    @mock.patch("v1.signals.AkamaiBackend.purge_by_tags")
+    @mock.patch("v1.signals.cache")
+    def test_invalidate_filterable_list_caches_purge_failure_is_logged(
+        self, mock_cache, mock_purge
+    ):
+        mock_purge.side_effect = requests.ConnectionError
+        with self.assertLogs("v1.signals", "ERROR"):
+            invalidate_filterable_list_caches(None, instance=self.blog_page)
+
+        mock_cache.delete.assert_any_call(
+            f"{self.filterable_list_page.get_cache_key_prefix()}-facets"
+        )
+
     @mock.patch("v1.signals.AkamaiBackend.purge_by_tags")
     @mock.patch("django.core.cache.cache")
     def test_invalidate_filterable_list_caches_does_nothing(
@@ -79,6 +101,65 @@ class FilterableListInvalidationTestCase(TestCase):
         mock_purge.assert_not_called()
 
 
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+        "parse_links": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+)
+class ParseLinksCacheInvalidationTestCase(DjangoTestCase):
+    def setUp(self):
+        self.page = LearnPage(title="Page", slug="page")
+        Site.objects.first().root_page.add_child(instance=self.page)
+        self.cache_key = get_parse_links_cache_key(
+            self.page.pk, "en", "/page/"
+        )
+        caches["parse_links"].set(self.cache_key, (1, 1, "hash", "content"))
+        caches["parse_links"].set(PARSE_LINKS_CACHE_VERSION_KEY, 1)
+
+    def test_invalidate_parse_links_cache(self):
+        invalidate_parse_links_cache(None, instance=self.page)
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    def test_publishing_invalidates_parse_links_cache(self):
+        self.page.save_revision().publish()
+        self.assertIsNone(caches["parse_links"].get(self.cache_key))
+
+    def test_publishing_without_slug_change_keeps_other_pages_cached(self):
+        self.page.title = "New title"
+        self.page.save_revision().publish()
+        self.assertEqual(
+            caches["parse_links"].get(PARSE_LINKS_CACHE_VERSION_KEY), 1
+        )
+
+    def test_changing_slug_invalidates_all_parse_links_cache(self):
+        self.page.slug = "new-slug"
+        self.page.save_revision().publish()
+        self.assertIsNone(
+            caches["parse_links"].get(PARSE_LINKS_CACHE_VERSION_KEY)
+        )
+
+    def test_moving_page_invalidates_all_parse_links_cache(self):
+        parent = LearnPage(title="Parent", slug="parent")
+        Site.objects.first().root_page.add_child(instance=parent)
+        caches["parse_links"].set(PARSE_LINKS_CACHE_VERSION_KEY, 1)
+
+        self.page.move(parent, pos="last-child")
+        self.assertIsNone(
+            caches["parse_links"].get(PARSE_LINKS_CACHE_VERSION_KEY)
+        )
+
+    def test_saving_document_invalidates_all_parse_links_cache(self):
+        get_document_model().objects.create(title="Document")
+        self.assertIsNone(
+            caches["parse_links"].get(PARSE_LINKS_CACHE_VERSION_KEY)
+        )
+
+
 class RefreshActivitiesTestCase(DjangoTestCase):
     fixtures = ["tdp_minimal_data"]
 
@@ -1,7 +1,9 @@
 from datetime import date
 from unittest import mock
 
-from django.test import TestCase
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from v1.models import BrowseFilterablePage, BrowsePage, CFGOVPage, HomePage
 from v1.tests.wagtail_pages import helpers
@@ -157,6 +159,114 @@ class TestSecondaryNav(TestCase):
 
         self.assertEqual(has_children, False)
 
+    def get_query_count(self, page):
+        request = RequestFactory().get("/")
+        with CaptureQueriesContext(connection) as context:
+            util.get_secondary_nav_items(request, page)
+
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_depend_on_number_of_pages(self):
+        query_count = self.get_query_count(self.child_of_browse_page1)
+
+        for i in range(3):
+            helpers.publish_page(child=BrowsePage(title=f"Sibling {i}"))
+            helpers.save_new_page(
+                BrowsePage(title=f"Child {i}"), root=self.browse_page1
+            ).publish()
+
+        self.assertEqual(
+            self.get_query_count(self.child_of_browse_page1), query_count
+        )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+)
+class TestSecondaryNavCache(TestCase):
+    def setUp(self):
+        util.invalidate_secondary_nav_cache()
+        self.browse_page1 = BrowsePage(title="Browse page 1")
+        self.browse_page2 = BrowsePage(title="Browse page 2")
+        helpers.publish_page(child=self.browse_page1)
+        helpers.publish_page(child=self.browse_page2)
+
+    def get_nav_titles(self, page):
+        nav, _ = util.get_secondary_nav_items(RequestFactory().get("/"), page)
+        return [item["title"] for item in nav]
+
+    def test_nav_tree_is_cached(self):
+        request = RequestFactory().get("/")
+        util.get_secondary_nav_items(request, self.browse_page1)
+
+        with mock.patch.object(BrowsePage, "get_children") as get_children:
+            nav, _ = util.get_secondary_nav_items(request, self.browse_page1)
+
+        get_children.assert_not_called()
+        self.assertEqual(len(nav), 2)
+        self.assertTrue(nav[0]["active"])
+
+    def test_cached_nav_marks_current_page_active(self):
+        request = RequestFactory().get("/")
+        util.get_secondary_nav_items(request, self.browse_page1)
+
+        nav, _ = util.get_secondary_nav_items(request, self.browse_page2)
+        self.assertEqual(
+            [item["active"] for item in nav],
+            [False, True],
+        )
+
+    def test_publishing_page_invalidates_cache(self):
+        self.assertEqual(
+            self.get_nav_titles(self.browse_page1),
+            ["Browse page 1", "Browse page 2"],
+        )
+
+        helpers.publish_page(child=BrowsePage(title="Browse page 3"))
+
+        self.assertEqual(
+            self.get_nav_titles(self.browse_page1),
+            ["Browse page 1", "Browse page 2", "Browse page 3"],
+        )
+
+    def test_unpublishing_page_invalidates_cache(self):
+        self.get_nav_titles(self.browse_page1)
+        self.browse_page2.unpublish()
+
+        self.assertEqual(
+            self.get_nav_titles(self.browse_page1), ["Browse page 1"]
+        )
+
+    def test_draft_without_siblings_does_not_change_cached_nav(self):
+        self.browse_page1.secondary_nav_exclude_sibling_pages = True
+        self.browse_page1.save_revision().publish()
+
+        draft = self.browse_page1.get_latest_revision_as_page()
+        draft.title = "Draft title"
+        draft.save_revision()
+        draft = self.browse_page1.get_latest_revision_as_page()
+
+        self.assertEqual(self.get_nav_titles(draft), ["Browse page 1"])
+        self.assertEqual(
+            self.get_nav_titles(self.browse_page1), ["Browse page 1"]
+        )
+
+    def test_draft_excluding_siblings_does_not_change_cached_nav(self):
+        draft = self.browse_page1.get_latest_revision_as_page()
+        draft.secondary_nav_exclude_sibling_pages = True
+        draft.save_revision()
+        draft = self.browse_page1.get_latest_revision_as_page()
+
+        self.assertEqual(self.get_nav_titles(draft), ["Browse page 1"])
+        self.assertEqual(
+            self.get_nav_titles(self.browse_page1),
+            ["Browse page 1", "Browse page 2"],
+        )
+
 
 class TestGetPageFromPath(TestCase):
     def test_no_root_returns_correctly(self):
@@ -2,12 +2,15 @@ from time import time
 
 from django.apps import apps
 from django.contrib.auth import REDIRECT_FIELD_NAME
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.http import Http404, HttpResponseRedirect
 from django.urls import resolve
 
 from wagtail.core.models import Site
 
+from core.cache import get_cache_version, invalidate_cache_version
+
 
 # These messages are manually mirrored on the
 # Javascript side in error-messages-config.js
@@ -27,11 +30,108 @@ def get_unique_id(prefix="", suffix=""):
     return prefix + str(index) + suffix
 
 
-def instanceOfBrowseOrFilterablePages(page):
+SECONDARY_NAV_CACHE_VERSION_KEY = "secondary-nav-version"
+
+# Only the fields needed to build secondary navigation items.
+SECONDARY_NAV_PAGE_FIELDS = ("id", "title", "slug", "url_path")
+
+
+def getBrowseOrFilterablePageTypes():
     from ..models import BrowseFilterablePage, BrowsePage
 
-    pages = (BrowsePage, BrowseFilterablePage)
-    return isinstance(page, pages)
+    return (BrowsePage, BrowseFilterablePage)
+
+
+def instanceOfBrowseOrFilterablePages(page):
+    return isinstance(page, getBrowseOrFilterablePageTypes())
+
+
+def get_secondary_nav_cache_version():
+    return get_cache_version(SECONDARY_NAV_CACHE_VERSION_KEY)
+
+
+def invalidate_secondary_nav_cache():
+    """Invalidate all cached secondary navigation, e.g. when pages change."""
+    invalidate_cache_version(SECONDARY_NAV_CACHE_VERSION_KEY)
+
+
+def get_secondary_nav_tree(page, site, request=None):
+    """Return the secondary navigation tree for a top-level Browse page.
+
+    The tree is a list of (page ID, title, slug, URL, children) tuples, one
+    for each sibling of the page that should appear in the navigation. The
+    page's own children are listed in the same format, without children.
+
+    Pages are retrieved in at most two queries and only with the fields
+    needed to build the tree. Trees are cached until any page is published,
+    unpublished, moved, or deleted.
+
+    The page passed in may be an unpublished draft, for example on preview
+    and sharing requests, so the tree only includes published pages. Its
+    secondary_nav_exclude_sibling_pages setting is part of the cache key,
+    since it may also differ between the draft and the published page.
+    """
+    from ..models import CFGOVPage
+
+    exclude_siblings = page.secondary_nav_exclude_sibling_pages
+
+    cache_key = None
+    if isinstance(site, Site):
+        cache_key = "secondary-nav-{}-{}-{}-{}".format(
+            get_secondary_nav_cache_version(),
+            page.pk,
+            site.pk,
+            int(exclude_siblings),
+        )
+
+        tree = cache.get(cache_key)
+        if tree is not None:
+            return tree
+
+    browse_types = getBrowseOrFilterablePageTypes()
+
+    if exclude_siblings:
+        pages = CFGOVPage.objects.live().filter(pk=page.pk)
+    else:
+        pages = (
+            CFGOVPage.objects.live()
+            .sibling_of(page, inclusive=True)
+            .type(*browse_types)
+        )
+    pages = pages.only(*SECONDARY_NAV_PAGE_FIELDS)
+
+    tree = []
+    for sibling in pages:
+        children = []
+
+        if sibling.pk == page.pk:
+            children = [
+                (
+                    child.pk,
+                    child.title,
+                    child.slug,
+                    child.relative_url(site, request=request),
+                )
+                for child in page.get_children()
+                .live()
+                .type(*browse_types)
+                .only(*SECONDARY_NAV_PAGE_FIELDS)
+            ]
+
+        tree.append(
+            (
+                sibling.pk,
+                sibling.title,
+                sibling.slug,
+                sibling.relative_url(site, request=request),
+                children,
+            )
+        )
+
+    if cache_key is not None:
+        cache.set(cache_key, tree)
+
+    return tree
 
 
 # For use by Browse type pages to get the secondary navigation items
@@ -42,9 +142,12 @@ def get_secondary_nav_items(request, current_page):
     # BrowseFilterablePage, then use that as the top-level page for the
     # purposes of the navigation sidebar. Otherwise, treat the current page
     # as top-level.
-    parent = current_page.get_parent().specific
-    if instanceOfBrowseOrFilterablePages(parent):
-        page = parent
+    parent = current_page.get_parent()
+    parent_class = parent.specific_class
+    if parent_class and issubclass(
+        parent_class, getBrowseOrFilterablePageTypes()
+    ):
+        page = parent.specific
     else:
         page = current_page
 
@@ -57,59 +160,39 @@ def get_secondary_nav_items(request, current_page):
     # children
     has_children = False
 
-    if page.secondary_nav_exclude_sibling_pages:
-        pages = [page]
-    else:
-        pages = filter(
-            lambda p: instanceOfBrowseOrFilterablePages(p.specific),
-            page.get_appropriate_siblings(),
-        )
-
     site = Site.find_for_request(request)
 
     nav_items = []
-    for sibling in pages:
-        if page.id == sibling.id:
-            sibling = page
-        else:
-            sibling = sibling
-
-        item_selected = current_page.pk == sibling.pk
+    for pk, title, slug, url, children in get_secondary_nav_tree(
+        page, site, request=request
+    ):
+        item_selected = current_page.pk == pk
 
         item = {
-            "title": sibling.title,
-            "slug": sibling.slug,
-            "url": sibling.relative_url(site),
+            "title": title,
+            "slug": slug,
+            "url": url,
             "children": [],
             "active": item_selected,
             "expanded": item_selected,
         }
 
-        if page.id == sibling.id:
-            visible_children = list(
-                filter(
-                    lambda c: (
-                        instanceOfBrowseOrFilterablePages(c) and (c.live)
-                    ),
-                    sibling.get_children().specific(),
+        if children:
+            has_children = True
+            for child_pk, child_title, child_slug, child_url in children:
+                child_selected = current_page.pk == child_pk
+
+                if child_selected:
+                    item["expanded"] = True
+
+                item["children"].append(
+                    {
+                        "title": child_title,
+                        "slug": child_slug,
+                        "url": child_url,
+                        "active": child_selected,
+                    }
                 )
-            )
-            if len(visible_children):
-                has_children = True
-                for child in visible_children:
-                    child_selected = current_page.pk == child.pk
-
-                    if child_selected:
-                        item["expanded"] = True
-
-                    item["children"].append(
-                        {
-                            "title": child.title,
-                            "slug": child.slug,
-                            "url": child.relative_url(site),
-                            "active": child_selected,
-                        }
-                    )
 
         nav_items.append(item)
 
@@ -18,8 +18,10 @@ from wagtail.contrib.modeladmin.options import (
 from wagtail.core import hooks
 
 from ask_cfpb.models.snippets import GlossaryTerm
+from core.middleware import get_parse_links_cache_key
 from v1.admin_views import manage_cdn
 from v1.models.banners import Banner
+from v1.models.base import CFGOVPage
 from v1.models.portal_topics import PortalCategory, PortalTopic
 from v1.models.resources import Resource
 from v1.models.snippets import (
@@ -188,6 +190,24 @@ def serve_latest_draft_page(page, request, args, kwargs):
         return response
 
 
+@hooks.register("before_serve_page")
+def set_parse_links_cache(page, request, args, kwargs):
+    # Allow core.middleware.ParseLinksMiddleware to cache this page's content.
+    if isinstance(page, CFGOVPage):
+        request.parse_links_cache = (
+            get_parse_links_cache_key(page.pk, page.language, request.path),
+            page.live_revision_id,
+        )
+
+
+@hooks.register("before_serve_page")
+def set_streamfield_media_cache(page, request, args, kwargs):
+    # Reuse this page's StreamField media across requests for its live
+    # revision. Previews don't trigger this hook.
+    if isinstance(page, CFGOVPage):
+        page.cache_streamfield_media = True
+
+
 @hooks.register("register_reports_menu_item")
 def register_page_metadata_report_menu_item():
     return MenuItem(
@@ -49,8 +49,7 @@ fi
 # Check if we need to rebuild index
 if [ ! -z $REBUILD_INDEX ]; then
   echo "Rebuilding Search Indexes..."
-  django-admin opensearch index --force rebuild
-  django-admin opensearch document --force --refresh index
+  django-admin rebuild_search_index
 fi
 
 # Do first-time build of the front-end if necessary
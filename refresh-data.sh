@@ -70,8 +70,7 @@ refresh_data() {
 
 update_index() {
     echo 'Updating search indexes'
-    ./cfgov/manage.py opensearch index --force rebuild
-    ./cfgov/manage.py opensearch document --force --refresh --parallel index
+    ./cfgov/manage.py rebuild_search_index
 }
 
 get_data() {